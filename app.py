@@ -1,43 +1,288 @@
 # app.py
+import time
 
-from flask import Flask, jsonify, request
-from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_jwt_identity
-from models import db, Tarea, Usuario
+# Momento en que empieza la importación (para el reporte de tiempos de inicio)
+INICIO_IMPORTACION = time.perf_counter()
+
+from flask import Blueprint, Flask, Response, abort, current_app, jsonify, request, stream_with_context
+from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from models import db, Tarea, Usuario, ContadorTareas, VersionEsquema
+from busqueda import SQL_CREAR_INDICE, SQL_TRIGGERS, crear_indice_busqueda, existe_indice_busqueda, construir_consulta_fts, filtro_busqueda, subconsulta_relevancia
+from cache_respuestas import crear_cache
+from contrasenas import PoolHash, ServicioSaturado, hash_desactualizado
+from disponibilidad import FiltroUsuarios
+from tokens_verificados import CacheTokens, JWTManagerConCache
+from perfil_sqlite import aplicar_perfil_sqlite
+from lectura_escritura import BIND_LECTURA, MetricasPool, configurar_engines
+from proveedor_json import crear_proveedor_json
+from compresion import comprimir_respuesta
+from metricas import TIPO_PROMETHEUS, MetricasPeticiones, texto_prometheus
+from frontend_estatico import CACHE_INMUTABLE, CACHE_REVALIDAR, PREFIJO_RECURSOS, FrontendEstatico, responder_archivo
+from sqlalchemy.exc import DBAPIError, IntegrityError
 import os
-from datetime import timedelta
+import io
+import csv
+import json
+import base64
+import hashlib
+import hmac
+import threading
+from datetime import datetime, timedelta
+from functools import lru_cache
 from dotenv import load_dotenv
+from sqlalchemy.schema import CreateColumn, CreateIndex, CreateTable
+from werkzeug.local import LocalProxy
 from flask_cors import CORS
 
 
-# Configuración de la aplicación
-app = Flask(__name__)
-
-# Habilitar CORS para todos los endpoints
-CORS(app, origins=["*"])
+# Extensiones y rutas: se asocian a cada aplicación en create_app
+jwt = JWTManagerConCache(lambda: servicio('cache_tokens'))
+api = Blueprint('api', __name__)
+frontend = Blueprint('frontend', __name__)
 
-# Cargar variables de entorno desde archivo .env
-load_dotenv()
+# Servicios propios de cada aplicación (y por lo tanto de cada worker).
+# No se crean en create_app sino la primera vez que se usan, así un worker
+# que no atiende logins no crea el pool de hashing, etc.
+FABRICAS_SERVICIOS = {
+    'cache_respuestas': lambda app: crear_cache(app.config, app.instance_path),
+    'pool_hash': lambda app: PoolHash(
+        app.config['HASH_HILOS'],
+        app.config['HASH_COLA_MAXIMA'],
+        app.config['HASH_REINTENTAR_EN']
+    ),
+    'filtro_usuarios': lambda app: FiltroUsuarios(
+        app.config['FILTRO_USUARIOS_CAPACIDAD'],
+        app.config['FILTRO_USUARIOS_ERROR'],
+        app.config['FILTRO_USUARIOS_REFRESCO']
+    ),
+    'cache_tokens': lambda app: CacheTokens(app.config['TOKENS_CACHE_MAXIMO']),
+    'frontend_estatico': lambda app: FrontendEstatico(app.config['FRONTEND_CARPETA'])
+}
+bloqueo_servicios = threading.Lock()
 
+def servicio(nombre):
+    """
+    Devuelve el servicio 'nombre' de la aplicación actual, creándolo si
+    todavía no existe
+    """
+    app = current_app._get_current_object()
+    instancia = app.extensions.get(nombre)
+    if instancia is None:
+        with bloqueo_servicios:
+            instancia = app.extensions.get(nombre)
+            if instancia is None:
+                instancia = FABRICAS_SERVICIOS[nombre](app)
+                app.extensions[nombre] = instancia
+    return instancia
 
-# Configurar variables desde entorno
-app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'clave_por_defecto')
-app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///tareas.db')
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.config['JWT_SECRET_KEY'] = os.environ.get('JWT_SECRET_KEY', 'jwt_clave_por_defecto')
+# Las rutas usan los servicios como variables globales; cada acceso se
+# resuelve con la aplicación de la petición en curso
+cache_respuestas = LocalProxy(lambda: servicio('cache_respuestas'))
+pool_hash = LocalProxy(lambda: servicio('pool_hash'))
+filtro_usuarios = LocalProxy(lambda: servicio('filtro_usuarios'))
+frontend_estatico = LocalProxy(lambda: servicio('frontend_estatico'))
 
-# Configuración de la base de datos
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///tareas.db'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+def configurar(app):
+    """
+    Carga en app.config la configuración leída de las variables de entorno
+    """
+    # Configurar variables desde entorno
+    app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'clave_por_defecto')
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///tareas.db')
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['JWT_SECRET_KEY'] = os.environ.get('JWT_SECRET_KEY', 'jwt_clave_por_defecto')
+    
+    # Configuración de la base de datos
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///tareas.db'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    
+    # Configuración de JWT
+    # SECRET_KEY: clave secreta para firmar los tokens (en producción debe ser muy segura)
+    app.config['JWT_SECRET_KEY'] = 'tu-clave-secreta-super-segura'
+    # JWT_ACCESS_TOKEN_EXPIRES: tiempo de expiración del token (7 días)
+    app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(days=7)
+    
+    # Configuración de búsqueda
+    # BUSQUEDA_FTS: usar el índice de texto completo FTS5 para el parámetro 'busqueda'
+    # (se ignora si la base de datos no tiene FTS5)
+    app.config['BUSQUEDA_FTS'] = os.environ.get('BUSQUEDA_FTS', '1') != '0'
+    
+    # Configuración de operaciones en lote
+    # LOTE_MAXIMO: cantidad máxima de tareas por petición a /tareas/lote
+    app.config['LOTE_MAXIMO'] = int(os.environ.get('LOTE_MAXIMO', 500))
+    
+    # Configuración de las respuestas JSON
+    # JSON_PROVEEDOR: 'auto' (orjson si está instalado), 'orjson' o 'flask'
+    app.config['JSON_PROVEEDOR'] = os.environ.get('JSON_PROVEEDOR', 'auto')
+    
+    # Compresión de respuestas (gzip o deflate, según Accept-Encoding)
+    # COMPRESION: '0' para enviar siempre sin comprimir
+    app.config['COMPRESION'] = os.environ.get('COMPRESION', '1') != '0'
+    # COMPRESION_MINIMO: bytes a partir de los cuales se comprime una respuesta
+    app.config['COMPRESION_MINIMO'] = int(os.environ.get('COMPRESION_MINIMO', 1024))
+    # COMPRESION_NIVEL: de 1 (más rápido) a 9 (más chico)
+    app.config['COMPRESION_NIVEL'] = int(os.environ.get('COMPRESION_NIVEL', 6))
+    
+    # Métricas en formato Prometheus (GET /metricas)
+    # METRICAS: '0' para no medir las peticiones ni publicar /metricas
+    app.config['METRICAS'] = os.environ.get('METRICAS', '1') != '0'
+    # METRICAS_TOKEN: /metricas solo se publica con un token y exige
+    # 'Authorization: Bearer <token>' (sin token responde 404)
+    app.config['METRICAS_TOKEN'] = os.environ.get('METRICAS_TOKEN')
+    
+    # Frontend servido por la propia API (en / y /assets/)
+    # FRONTEND: '1' para servir la carpeta del frontend con nombres con hash
+    app.config['FRONTEND'] = os.environ.get('FRONTEND', '0') == '1'
+    # FRONTEND_CARPETA: carpeta con index.html (por defecto frontend/ junto a app.py)
+    app.config['FRONTEND_CARPETA'] = os.environ.get(
+        'FRONTEND_CARPETA', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'frontend')
+    )
+    
+    # Configuración de exportación
+    # EXPORTACION_TAMANO_BLOQUE: filas que se leen de la base de datos y se
+    # envían al cliente en cada bloque de GET /tareas/exportar
+    app.config['EXPORTACION_TAMANO_BLOQUE'] = int(os.environ.get('EXPORTACION_TAMANO_BLOQUE', 1000))
+    
+    # Configuración de la cache de respuestas de GET /tareas
+    # CACHE_TIPO: 'memoria' (en cada proceso), 'sqlite' (archivo compartido
+    # entre workers) o 'ninguno'
+    app.config['CACHE_TIPO'] = os.environ.get('CACHE_TIPO', 'memoria')
+    # CACHE_MAXIMO_ENTRADAS: respuestas guardadas como máximo (se descartan las menos usadas)
+    app.config['CACHE_MAXIMO_ENTRADAS'] = int(os.environ.get('CACHE_MAXIMO_ENTRADAS', 1000))
+    # CACHE_TTL: segundos que se conserva cada respuesta
+    app.config['CACHE_TTL'] = int(os.environ.get('CACHE_TTL', 60))
+    # CACHE_RUTA: archivo de la cache 'sqlite' (por defecto en la carpeta instance)
+    app.config['CACHE_RUTA'] = os.environ.get('CACHE_RUTA')
+    
+    # Configuración del hash de contraseñas
+    # HASH_METODO: método de werkzeug ('scrypt', 'pbkdf2:sha256:600000', ...).
+    # Si cambia, los hashes guardados se recalculan en el siguiente login
+    app.config['HASH_METODO'] = os.environ.get('HASH_METODO', 'scrypt')
+    # HASH_HILOS: hashes que se calculan a la vez en cada proceso
+    app.config['HASH_HILOS'] = int(os.environ.get('HASH_HILOS', 2))
+    # HASH_COLA_MAXIMA: hashes que pueden esperar turno; más allá se responde 503
+    app.config['HASH_COLA_MAXIMA'] = int(os.environ.get('HASH_COLA_MAXIMA', 16))
+    # HASH_REINTENTAR_EN: segundos sugeridos en el header Retry-After del 503
+    app.config['HASH_REINTENTAR_EN'] = int(os.environ.get('HASH_REINTENTAR_EN', 1))
+    
+    # Configuración del filtro de usernames y emails registrados
+    # FILTRO_USUARIOS_CAPACIDAD: usuarios previstos (al superarse el filtro se agranda)
+    app.config['FILTRO_USUARIOS_CAPACIDAD'] = int(os.environ.get('FILTRO_USUARIOS_CAPACIDAD', 100000))
+    # FILTRO_USUARIOS_ERROR: probabilidad de falso positivo (confirmado luego en la base de datos)
+    app.config['FILTRO_USUARIOS_ERROR'] = float(os.environ.get('FILTRO_USUARIOS_ERROR', 0.01))
+    # FILTRO_USUARIOS_REFRESCO: segundos entre lecturas de usuarios registrados por otros workers
+    app.config['FILTRO_USUARIOS_REFRESCO'] = int(os.environ.get('FILTRO_USUARIOS_REFRESCO', 5))
+    
+    # Cache de tokens JWT ya verificados (evita repetir la firma en cada petición)
+    # TOKENS_CACHE: '0' para verificar la firma del token en todas las peticiones
+    app.config['TOKENS_CACHE'] = os.environ.get('TOKENS_CACHE', '1') != '0'
+    # TOKENS_CACHE_MAXIMO: tokens guardados como máximo por proceso (se descartan los menos usados)
+    app.config['TOKENS_CACHE_MAXIMO'] = int(os.environ.get('TOKENS_CACHE_MAXIMO', 10000))
+    
+    # Perfil de SQLite, aplicado en cada conexión de la base de datos
+    # SQLITE_PERFIL: '0' para no aplicar los PRAGMA (journal_mode queda guardado en el
+    # archivo: una base que ya está en WAL sigue en WAL)
+    app.config['SQLITE_PERFIL'] = os.environ.get('SQLITE_PERFIL', '1') != '0'
+    # SQLITE_SYNCHRONOUS: OFF, NORMAL o FULL (con WAL, NORMAL no pierde datos si cae el proceso)
+    app.config['SQLITE_SYNCHRONOUS'] = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')
+    # SQLITE_BUSY_TIMEOUT: milisegundos que se espera un lock antes de fallar
+    app.config['SQLITE_BUSY_TIMEOUT'] = int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000))
+    # SQLITE_CACHE_KB: cache de páginas de cada conexión, en KiB
+    app.config['SQLITE_CACHE_KB'] = int(os.environ.get('SQLITE_CACHE_KB', 20000))
+    # SQLITE_MMAP_BYTES: parte del archivo que se lee con memoria mapeada (0 para no usarla)
+    app.config['SQLITE_MMAP_BYTES'] = int(os.environ.get('SQLITE_MMAP_BYTES', 268435456))
+    # SQLITE_TEMP_STORE: DEFAULT, FILE o MEMORY (tablas temporales y ordenamientos)
+    app.config['SQLITE_TEMP_STORE'] = os.environ.get('SQLITE_TEMP_STORE', 'MEMORY')
+    
+    # Separación de lecturas y escrituras
+    # BD_LECTURA: '1' para que las peticiones GET lean con un engine propio
+    app.config['BD_LECTURA'] = os.environ.get('BD_LECTURA', '1') != '0'
+    # BD_LECTURA_URL: base de datos de lectura (por ejemplo una réplica); por
+    # defecto, con SQLite, el mismo archivo abierto en modo solo lectura
+    app.config['BD_LECTURA_URL'] = os.environ.get('BD_LECTURA_URL')
+    # BD_LECTURA_POOL: conexiones de lectura por proceso
+    app.config['BD_LECTURA_POOL'] = int(os.environ.get('BD_LECTURA_POOL', 8))
+    # BD_ESCRITURA_POOL: conexiones de escritura por proceso (SQLite escribe de a una)
+    app.config['BD_ESCRITURA_POOL'] = int(os.environ.get('BD_ESCRITURA_POOL', 2))
+    
+    # Servidor ASGI (asgi.py): lecturas de tareas con un engine asíncrono
+    # BD_ASINCRONA_URL: base de datos de esas lecturas; por defecto la del
+    # engine de lectura (o la principal) con el driver asíncrono aiosqlite
+    app.config['BD_ASINCRONA_URL'] = os.environ.get('BD_ASINCRONA_URL')
+    # BD_ASINCRONA_POOL: conexiones del engine asíncrono por proceso
+    app.config['BD_ASINCRONA_POOL'] = int(os.environ.get('BD_ASINCRONA_POOL', 8))
+    
+    # Configuración del inicio
+    # VERIFICAR_ESQUEMA: revisar tablas, columnas e índices en cada inicio aunque
+    # la versión del esquema guardada en la base de datos coincida
+    app.config['VERIFICAR_ESQUEMA'] = os.environ.get('VERIFICAR_ESQUEMA', '0') == '1'
 
-# Configuración de JWT
-# SECRET_KEY: clave secreta para firmar los tokens (en producción debe ser muy segura)
-app.config['JWT_SECRET_KEY'] = 'tu-clave-secreta-super-segura'
-# JWT_ACCESS_TOKEN_EXPIRES: tiempo de expiración del token (7 días)
-app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(days=7)
+def create_app(config=None):
+    """
+    Crea y configura una instancia de la aplicación
+    
+    No toca el esquema de la base de datos: eso lo hace
+    preparar_base_de_datos una sola vez antes de iniciar los workers.
+    Cada worker llama a create_app después del fork, así tiene su propio
+    engine (y pool de conexiones), su cache y su pool de hashing. Ni el
+    engine ni los servicios se conectan o crean hasta que se usan.
+    
+    Parámetros:
+    - config: diccionario con valores que reemplazan a los de las
+      variables de entorno (opcional, útil para pruebas)
+    
+    Retorna:
+    - aplicación Flask lista para atender peticiones
+    """
+    inicio = time.perf_counter()
+    app = Flask(__name__)
+    
+    # Habilitar CORS para todos los endpoints
+    CORS(app, origins=["*"])
+    
+    # Cargar variables de entorno desde archivo .env
+    load_dotenv()
+    configurar(app)
+    if config:
+        app.config.update(config)
+    app.json = crear_proveedor_json(app)
+    
+    # Inicializar extensiones
+    configurar_engines(app.config)
+    db.init_app(app)
+    jwt.init_app(app)
+    with app.app_context():
+        aplicar_perfil_sqlite(db.engine, app.config)
+        metricas_pools = {'escritura': MetricasPool(db.engine)}
+        if BIND_LECTURA in db.engines:
+            aplicar_perfil_sqlite(db.engines[BIND_LECTURA], app.config, solo_lectura=True)
+            metricas_pools['lectura'] = MetricasPool(db.engines[BIND_LECTURA])
+        if app.config['METRICAS']:
+            metricas_peticiones = MetricasPeticiones()
+            for engine in db.engines.values():
+                metricas_peticiones.observar_engine(engine)
+            app.extensions['metricas_peticiones'] = metricas_peticiones
+    app.extensions['metricas_pools'] = metricas_pools
+    app.register_blueprint(api)
+    if app.config['FRONTEND']:
+        app.register_blueprint(frontend)
+    
+    # Tiempos de inicio en milisegundos (los completa preparar_base_de_datos).
+    # Un worker creado con fork recibe el módulo ya importado: no lo paga
+    importacion = FIN_IMPORTACION - INICIO_IMPORTACION if os.getpid() == PROCESO_IMPORTACION else 0.0
+    app.extensions['tiempos_inicio'] = {
+        'importacion': importacion * 1000,
+        'configuracion': (time.perf_counter() - inicio) * 1000
+    }
+    return app
 
-# Inicializar extensiones
-db.init_app(app)
-jwt = JWTManager(app)
+def reporte_inicio(app):
+    """
+    Texto con los tiempos de inicio registrados en la aplicación
+    """
+    tiempos = app.extensions['tiempos_inicio']
+    partes = [f"{nombre} {milisegundos:.1f} ms" for nombre, milisegundos in tiempos.items()]
+    return "⏱️ Inicio: " + ", ".join(partes)
 
 def validar_tarea(datos):
     """
@@ -67,6 +312,9 @@ def validar_tarea(datos):
     if len(datos['descripcion']) < 1:
         return False, "La descripción no puede estar vacía"
     
+    if 'completada' in datos and not isinstance(datos['completada'], bool):
+        return False, "El campo 'completada' debe ser true o false"
+    
     return True, "Datos válidos"
 
 def validar_usuario(datos):
@@ -139,11 +387,571 @@ def validar_usuario(datos):
     
     return True, "Datos válidos"
 
+# ===========================================
+# FILTROS DE TAREAS
+# ===========================================
+
+def busqueda_fts_activa():
+    """
+    True si 'busqueda' usa el índice de texto completo FTS5
+    
+    El índice lo crea preparar_base_de_datos antes de iniciar los workers;
+    cada proceso comprueba una sola vez, en la primera búsqueda, que exista.
+    """
+    activa = current_app.extensions.get('busqueda_fts')
+    if activa is None:
+        activa = current_app.config['BUSQUEDA_FTS'] and existe_indice_busqueda(db.engine)
+        current_app.extensions['busqueda_fts'] = activa
+    return activa
+
+def consulta_busqueda(busqueda):
+    """
+    Consulta FTS5 para el texto de búsqueda (None si no hay búsqueda,
+    FTS5 no está disponible o el texto no tiene palabras)
+    """
+    if not busqueda or not busqueda_fts_activa():
+        return None
+    return construir_consulta_fts(busqueda)
+
+def filtrar_tareas(usuario_id, busqueda='', estado='', ids=None):
+    """
+    Query de las tareas de un usuario con los filtros de búsqueda y estado
+    
+    Parámetros:
+    - usuario_id: id del usuario dueño de las tareas
+    - busqueda: texto a buscar en título y descripción (opcional)
+    - estado: 'completada' o 'pendiente' (opcional)
+    - ids: lista de ids de tareas a las que limitarse (opcional)
+    
+    Retorna:
+    - query de SQLAlchemy sin ordenamiento ni paginación
+    """
+    query = Tarea.query.filter_by(usuario_id=usuario_id)
+    
+    # Limitar a una lista de tareas si se proporciona
+    if ids is not None:
+        query = query.filter(Tarea.id.in_(ids))
+    
+    # Aplicar filtro de búsqueda si se proporciona
+    if busqueda:
+        query = query.filter(filtro_busqueda(busqueda, consulta_busqueda(busqueda)))
+    
+    # Aplicar filtro de estado si se proporciona
+    if estado:
+        if estado.lower() == 'completada':
+            query = query.filter(Tarea.completada == True)
+        elif estado.lower() == 'pendiente':
+            query = query.filter(Tarea.completada == False)
+    
+    return query
+
+def leer_filtros_lote(datos):
+    """
+    Lee los filtros de una operación sobre varias tareas a la vez
+    
+    Acepta los mismos filtros que GET /tareas ('busqueda' y 'estado') más
+    'ids', una lista de ids (en la URL, separados por comas). Para no
+    modificar todas las tareas por accidente se exige al menos un filtro
+    o 'todas=true'.
+    
+    Parámetros:
+    - datos: request.args o el cuerpo JSON de la petición
+    
+    Retorna:
+    - tupla (filtros, error): diccionario para filtrar_tareas, o mensaje de error
+    """
+    busqueda = datos.get('busqueda') or ''
+    estado = datos.get('estado') or ''
+    ids = datos.get('ids')
+    todas = str(datos.get('todas', '')).lower() in ('true', '1')
+    
+    if not isinstance(busqueda, str) or not isinstance(estado, str):
+        return None, "Los campos 'busqueda' y 'estado' deben ser texto"
+    
+    busqueda = busqueda.strip()
+    estado = estado.strip()
+    if estado and estado.lower() not in ('completada', 'pendiente'):
+        return None, "El estado debe ser 'completada' o 'pendiente'"
+    
+    if ids is not None:
+        if isinstance(ids, str):
+            ids = [valor.strip() for valor in ids.split(',') if valor.strip()]
+        if not isinstance(ids, list) or not ids:
+            return None, "El campo 'ids' debe ser una lista de ids"
+        try:
+            ids = [int(valor) for valor in ids]
+        except (TypeError, ValueError):
+            return None, "El campo 'ids' debe ser una lista de ids"
+        if len(ids) > current_app.config['LOTE_MAXIMO']:
+            return None, f"No se pueden indicar más de {current_app.config['LOTE_MAXIMO']} ids"
+    
+    if ids is None and not busqueda and not estado and not todas:
+        return None, "Indica 'ids', 'busqueda' o 'estado' (o 'todas=true' para todas las tareas)"
+    
+    return {'busqueda': busqueda, 'estado': estado, 'ids': ids}, None
+
+# ===========================================
+# CONTADORES DE TAREAS
+# ===========================================
+
+def estado_contador(completada):
+    """
+    Cuánto aporta una tarea a los contadores según su estado
+    
+    Retorna:
+    - tupla (completadas, pendientes)
+    """
+    if completada is None:
+        return 0, 0
+    return (1, 0) if completada else (0, 1)
+
+def recalcular_contador(usuario_id):
+    """
+    Calcula desde la tabla tareas el contador de un usuario y lo guarda
+    en la sesión (sin hacer commit)
+    
+    Solo se usa cuando el contador todavía no existe: el resto del tiempo
+    los contadores se actualizan sumando diferencias.
+    """
+    db.session.flush()
+    total, completadas, pendientes = db.session.query(
+        db.func.count(Tarea.id),
+        db.func.count(db.case((Tarea.completada == True, 1))),
+        db.func.count(db.case((Tarea.completada == False, 1)))
+    ).filter(Tarea.usuario_id == usuario_id).one()
+    
+    contador = db.session.get(ContadorTareas, usuario_id)
+    if not contador:
+        contador = ContadorTareas(usuario_id=usuario_id)
+        db.session.add(contador)
+    
+    contador.total = total
+    contador.completadas = completadas
+    contador.pendientes = pendientes
+    contador.version = (contador.version or 0) + 1
+    return contador
+
+def actualizar_contadores(usuario_id, total=0, completadas=0, pendientes=0):
+    """
+    Suma diferencias al contador de tareas de un usuario (sin hacer commit)
+    
+    La suma se hace en SQL (total = total + n) para que dos peticiones
+    simultáneas no pisen el valor la una de la otra. Debe llamarse en la
+    misma transacción que modifica las tareas, y en cada escritura de
+    tareas aunque los totales no cambien: también aumenta la versión que
+    invalida los ETag.
+    """
+    filas = ContadorTareas.query.filter_by(usuario_id=int(usuario_id)).update({
+        ContadorTareas.total: ContadorTareas.total + total,
+        ContadorTareas.completadas: ContadorTareas.completadas + completadas,
+        ContadorTareas.pendientes: ContadorTareas.pendientes + pendientes,
+        ContadorTareas.version: ContadorTareas.version + 1
+    }, synchronize_session=False)
+    
+    # Si el usuario aún no tenía contador, calcularlo con la tarea ya incluida
+    if not filas:
+        recalcular_contador(int(usuario_id))
+    
+    # Las respuestas cacheadas usan la versión en la clave, así que ya no se
+    # volverían a servir; se descartan para liberar espacio enseguida
+    cache_respuestas.invalidar(int(usuario_id))
+
+def obtener_contador(usuario_id):
+    """
+    Contador de tareas de un usuario (lectura por clave primaria)
+    """
+    contador = db.session.get(ContadorTareas, usuario_id)
+    if not contador:
+        contador = recalcular_contador(usuario_id)
+        db.session.commit()
+    return contador
+
+def total_desde_contadores(usuario_id, estado=''):
+    """
+    Total de tareas de un usuario para un filtro de estado, sin contar filas
+    """
+    return total_en_contador(obtener_contador(usuario_id), estado)
+
+def total_en_contador(contador, estado=''):
+    """
+    Total de tareas de un contador ya leído para un filtro de estado
+    """
+    if estado.lower() == 'completada':
+        return contador.completadas
+    if estado.lower() == 'pendiente':
+        return contador.pendientes
+    return contador.total
+
+# ===========================================
+# ETAG / PETICIONES CONDICIONALES
+# ===========================================
+
+def etag_tareas(usuario_id, version=None):
+    """
+    ETag de una lectura de tareas del usuario
+    
+    Se calcula con la versión de las tareas del usuario (que aumenta con
+    cada escritura), la ruta y los parámetros de la URL ordenados. Solo
+    lee el contador del usuario, no la tabla tareas (y ni siquiera eso si
+    se indica 'version', ya leída por quien llama).
+    """
+    if version is None:
+        version = obtener_contador(usuario_id).version
+    parametros = '&'.join(f'{clave}={valor}' for clave, valor in sorted(request.args.items(multi=True)))
+    contenido = f'{usuario_id}:{version}:{request.path}?{parametros}'
+    return hashlib.sha1(contenido.encode('utf-8')).hexdigest()
+
+def respuesta_con_etag(respuesta, etag):
+    """
+    Agrega el ETag a la respuesta y pide al navegador que la revalide
+    
+    El ETag es débil porque la misma respuesta puede enviarse comprimida
+    o sin comprimir.
+    """
+    respuesta.set_etag(etag, weak=True)
+    respuesta.headers['Cache-Control'] = 'private, no-cache'
+    return respuesta
+
+def no_modificado(etag):
+    """
+    Respuesta 304 si el cliente ya tiene la versión actual (If-None-Match),
+    o None si hay que generar la respuesta completa
+    """
+    if request.if_none_match.contains_weak(etag):
+        return respuesta_con_etag(Response(status=304), etag)
+    return None
+
+# ===========================================
+# PAGINACIÓN POR CURSOR (KEYSET)
+# ===========================================
+
+# Columnas por las que se puede ordenar el listado de tareas
+COLUMNAS_ORDENAMIENTO = {
+    'titulo': Tarea.titulo,
+    'fecha_creacion': Tarea.fecha_creacion,
+    'estado': Tarea.completada
+}
+
+# Columnas por las que se puede ordenar el listado de usuarios
+COLUMNAS_ORDENAMIENTO_USUARIOS = {
+    'username': Usuario.username,
+    'email': Usuario.email,
+    'fecha_registro': Usuario.fecha_registro
+}
+
+def codificar_cursor(fila, ordenar_por, orden, direccion, columnas=COLUMNAS_ORDENAMIENTO):
+    """
+    Genera un cursor opaco que apunta a una fila dentro de un listado
+    
+    El cursor guarda el valor de la columna de ordenamiento y el id de la
+    fila, que juntos identifican su posición de forma única.
+    
+    Parámetros:
+    - fila: tarea o usuario que marca la posición (última o primera de la página)
+    - ordenar_por: nombre del ordenamiento (una clave de 'columnas')
+    - orden: 'asc' o 'desc'
+    - direccion: 'siguiente' o 'anterior'
+    - columnas: columnas de ordenamiento del listado (por defecto, las de tareas)
+    
+    Retorna:
+    - texto en base64 seguro para URLs
+    """
+    valor = getattr(fila, columnas[ordenar_por].key)
+    if isinstance(valor, datetime):
+        valor = valor.isoformat()
+    
+    contenido = json.dumps(
+        [ordenar_por, orden, direccion, valor, fila.id],
+        separators=(',', ':')
+    )
+    return base64.urlsafe_b64encode(contenido.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decodificar_cursor(cursor, columnas=COLUMNAS_ORDENAMIENTO):
+    """
+    Interpreta un cursor generado por codificar_cursor
+    
+    Parámetros:
+    - cursor: texto recibido en el parámetro 'cursor'
+    - columnas: columnas de ordenamiento del listado (las mismas que al codificarlo)
+    
+    Retorna:
+    - diccionario con ordenar_por, orden, direccion, valor e id
+    - None si el cursor no es válido
+    """
+    try:
+        relleno = '=' * (-len(cursor) % 4)
+        contenido = base64.urlsafe_b64decode(cursor + relleno).decode('utf-8')
+        ordenar_por, orden, direccion, valor, fila_id = json.loads(contenido)
+        
+        if ordenar_por not in columnas:
+            return None
+        if orden not in ('asc', 'desc') or direccion not in ('siguiente', 'anterior'):
+            return None
+        if not isinstance(fila_id, int):
+            return None
+        
+        # Restaurar el tipo original del valor de ordenamiento
+        tipo = columnas[ordenar_por].type.python_type
+        if tipo is datetime:
+            valor = datetime.fromisoformat(valor) if valor is not None else None
+        elif not isinstance(valor, tipo):
+            return None
+    except (ValueError, TypeError):
+        return None
+    
+    return {
+        'ordenar_por': ordenar_por,
+        'orden': orden,
+        'direccion': direccion,
+        'valor': valor,
+        'id': fila_id
+    }
+
+def leer_paginacion():
+    """
+    Lee y valida los parámetros 'pagina' y 'limite' de la URL
+    
+    Si no son números válidos o están fuera de rango se usan los valores
+    por defecto (página 1, 10 resultados, máximo 100).
+    
+    Retorna:
+    - tupla (pagina, limite, offset)
+    """
+    try:
+        pagina = int(request.args.get('pagina', '1').strip())
+        limite = int(request.args.get('limite', '10').strip())
+    except ValueError:
+        return 1, 10, 0
+    
+    # Validar valores mínimos y máximos
+    if pagina < 1:
+        pagina = 1
+    if limite < 1 or limite > 100:
+        limite = 10
+    
+    return pagina, limite, (pagina - 1) * limite
+
+def preparar_paginacion(columnas, ordenar_por, orden, ordenar_por_defecto, orden_defecto, usar_cursor=True):
+    """
+    Lee la paginación de la URL (pagina, limite y cursor) y normaliza el ordenamiento
+    
+    La comparten los listados paginados (GET /tareas y GET /usuarios). Si
+    viene un cursor, este define el ordenamiento y la posición de la página.
+    
+    Parámetros:
+    - columnas: columnas de ordenamiento del listado (nombre -> columna)
+    - ordenar_por, orden: valores pedidos en la URL
+    - ordenar_por_defecto, orden_defecto: valores si los pedidos no son válidos
+    - usar_cursor: False para ignorar el parámetro 'cursor'
+    
+    Retorna:
+    - tupla (paginacion, error). paginacion es un diccionario con
+      ordenar_por, orden, columna, pagina, limite, offset, datos_cursor,
+      hacia_atras y ascendente; error es el mensaje si el cursor no es válido
+    """
+    pagina, limite, offset = leer_paginacion()
+    cursor = request.args.get('cursor', '').strip()
+    
+    datos_cursor = None
+    if cursor and usar_cursor:
+        datos_cursor = decodificar_cursor(cursor, columnas)
+        if not datos_cursor:
+            return None, "El cursor de paginación no es válido"
+        ordenar_por = datos_cursor['ordenar_por']
+        orden = datos_cursor['orden']
+    
+    if ordenar_por not in columnas:
+        ordenar_por = ordenar_por_defecto
+    orden = orden.lower()
+    if orden not in ('asc', 'desc'):
+        orden = orden_defecto
+    
+    # Al retroceder con un cursor se recorre el índice en sentido inverso
+    hacia_atras = datos_cursor is not None and datos_cursor['direccion'] == 'anterior'
+    
+    return {
+        'ordenar_por': ordenar_por,
+        'orden': orden,
+        'columna': columnas[ordenar_por],
+        'pagina': pagina,
+        'limite': limite,
+        'offset': offset,
+        'datos_cursor': datos_cursor,
+        'hacia_atras': hacia_atras,
+        'ascendente': (orden == 'asc') != hacia_atras
+    }, None
+
+def ordenar_consulta(query, paginacion, columna_id):
+    """
+    Ordena por la columna de la paginación (el id desempata para que el orden sea estable)
+    """
+    columna = paginacion['columna']
+    if paginacion['ascendente']:
+        return query.order_by(columna.asc(), columna_id.asc())
+    return query.order_by(columna.desc(), columna_id.desc())
+
+def paginar_consulta(query, paginacion, columna_id, contar):
+    """
+    Limita una consulta ya ordenada a la página pedida
+    
+    Siempre se pide una fila extra para saber si hay más en esa dirección.
+    
+    Parámetros:
+    - query: consulta ordenada
+    - paginacion: resultado de preparar_paginacion
+    - columna_id: columna que desempata el ordenamiento (id de la tabla)
+    - contar: True si hay que informar el total de filas filtradas
+    
+    Retorna:
+    - tupla (query, contar). contar es 'ventana' si cada fila trae el total
+      en la columna 'total_ventana' (count() OVER ()), 'consulta' si hay
+      que contar las filas filtradas aparte, o None si no hay que contar
+    """
+    limite = paginacion['limite']
+    datos_cursor = paginacion['datos_cursor']
+    
+    if datos_cursor:
+        # Paginación por cursor: continuar justo después (o antes) de la
+        # última fila vista, sin recorrer las filas de páginas anteriores
+        columna = paginacion['columna']
+        clave = db.tuple_(columna, columna_id)
+        valor = db.tuple_(
+            db.literal(datos_cursor['valor'], columna.type),
+            db.literal(datos_cursor['id'])
+        )
+        query = query.filter(clave > valor if paginacion['ascendente'] else clave < valor)
+        
+        # El conteo por ventana solo vería las filas posteriores al cursor,
+        # así que el total requiere su propia consulta
+        return query.limit(limite + 1), 'consulta' if contar else None
+    
+    if contar:
+        # Página y total en una sola consulta: count() OVER () cuenta todas
+        # las filas filtradas antes de aplicar OFFSET y LIMIT
+        query = query.add_columns(db.func.count().over().label('total_ventana'))
+        return query.offset(paginacion['offset']).limit(limite + 1), 'ventana'
+    
+    return query.offset(paginacion['offset']).limit(limite + 1), None
+
+def separar_total_ventana(paginacion, filas):
+    """
+    Separa las filas del total en una consulta con contar='ventana'
+    
+    Retorna:
+    - tupla (filas, total). total es None si la página está fuera de
+      rango: no hay filas que traigan el total y hay que contar aparte
+    """
+    # La columna del total queda al final de cada fila: los serializadores la ignoran
+    if filas:
+        return filas, filas[0].total_ventana
+    if paginacion['offset'] == 0:
+        return filas, 0
+    return filas, None
+
+def metadatos_paginacion(paginacion, filas, total, columnas, con_cursores=True):
+    """
+    Recorta la fila extra y calcula los metadatos de paginación
+    
+    Parámetros:
+    - paginacion: resultado de preparar_paginacion
+    - filas: filas leídas con paginar_consulta (incluida la extra)
+    - total: total de filas filtradas, o None si no se contó
+    - columnas: columnas de ordenamiento del listado (para los cursores)
+    - con_cursores: False si el ordenamiento no admite cursores
+    
+    Retorna:
+    - tupla (filas de la página en orden, diccionario de metadatos)
+    """
+    limite = paginacion['limite']
+    datos_cursor = paginacion['datos_cursor']
+    
+    hay_mas = len(filas) > limite
+    filas = filas[:limite]
+    
+    if paginacion['hacia_atras']:
+        filas.reverse()
+        tiene_siguiente = True
+        tiene_anterior = hay_mas
+    elif datos_cursor:
+        tiene_siguiente = hay_mas
+        tiene_anterior = True
+    else:
+        tiene_siguiente = hay_mas
+        tiene_anterior = paginacion['pagina'] > 1
+    
+    # Cursores para navegar desde esta página (sirven en ambos modos)
+    siguiente_cursor = None
+    anterior_cursor = None
+    if filas and con_cursores:
+        ordenar_por, orden = paginacion['ordenar_por'], paginacion['orden']
+        if tiene_siguiente:
+            siguiente_cursor = codificar_cursor(filas[-1], ordenar_por, orden, 'siguiente', columnas)
+        if tiene_anterior:
+            anterior_cursor = codificar_cursor(filas[0], ordenar_por, orden, 'anterior', columnas)
+    
+    return filas, {
+        # Con cursor no se conoce el número de página
+        "pagina_actual": None if datos_cursor else paginacion['pagina'],
+        "limite": limite,
+        "total_paginas": None if total is None else (total + limite - 1) // limite,
+        "tiene_siguiente": tiene_siguiente,
+        "tiene_anterior": tiene_anterior,
+        "siguiente_cursor": siguiente_cursor,
+        "anterior_cursor": anterior_cursor
+    }
+
+# ===========================================
+# MÉTRICAS DE PETICIONES
+# ===========================================
+# Se registran antes que el resto de los hooks: la medición empieza antes
+# de validar el JSON y termina después de comprimir la respuesta (o al
+# terminar de enviarla, si se envía por partes).
+
+@api.before_app_request
+def iniciar_metricas():
+    """
+    Marca el inicio de la petición para medir su duración y sus consultas SQL
+    """
+    metricas_peticiones = current_app.extensions.get('metricas_peticiones')
+    if metricas_peticiones is not None:
+        metricas_peticiones.iniciar_peticion()
+
+@api.after_app_request
+def registrar_metricas(respuesta):
+    """
+    Registra la ruta, el código de estado, la duración y las consultas SQL
+    """
+    metricas_peticiones = current_app.extensions.get('metricas_peticiones')
+    if metricas_peticiones is not None:
+        metricas_peticiones.terminar_peticion(respuesta)
+    return respuesta
+
+# ===========================================
+# COMPRESIÓN DE RESPUESTAS
+# ===========================================
+
+@api.after_app_request
+def comprimir(respuesta):
+    """
+    Comprime las respuestas grandes si el cliente acepta gzip o deflate
+    
+    Se aplica después de generar la respuesta, así la cache de respuestas
+    guarda el JSON sin comprimir y sirve para cualquier Accept-Encoding.
+    """
+    if not current_app.config['COMPRESION']:
+        return respuesta
+    return comprimir_respuesta(
+        respuesta,
+        request.accept_encodings,
+        current_app.config['COMPRESION_MINIMO'],
+        current_app.config['COMPRESION_NIVEL']
+    )
+
 # ===========================================
 # VALIDACIÓN DE FORMATO JSON
 # ===========================================
 
-@app.before_request
+@api.before_app_request
 def validate_json():
     """
     Valida que las peticiones POST y PUT contengan JSON válido
@@ -235,7 +1043,7 @@ def missing_token_callback(error):
         "codigo": "token_faltante"
     }), 401
 
-@app.route('/registro', methods=['POST'])
+@api.route('/registro', methods=['POST'])
 def registro():
     """
     Registrar un nuevo usuario
@@ -245,32 +1053,71 @@ def registro():
     if not es_valido:
         return jsonify({"error": mensaje}), 400
     
-    # Verificar si el usuario ya existe
-    if Usuario.query.filter_by(username=request.json['username']).first():
-        return jsonify({"error": "El username ya está en uso"}), 400
-    
-    if Usuario.query.filter_by(email=request.json['email']).first():
-        return jsonify({"error": "El email ya está registrado"}), 400
-    
     # Crear nuevo usuario
     nuevo_usuario = Usuario(
         username=request.json['username'],
         email=request.json['email']
     )
-    nuevo_usuario.set_password(request.json['password'])
+    pool_hash.ejecutar(nuevo_usuario.set_password, request.json['password'], current_app.config['HASH_METODO'])
     
-    # Guardar en la base de datos
-    db.session.add(nuevo_usuario)
-    db.session.commit()
+    # Guardar en la base de datos junto con su contador de tareas.
+    # Si el username o el email ya existen, lo detectan las restricciones
+    # UNIQUE de la tabla (sin consultas previas)
+    try:
+        db.session.add(nuevo_usuario)
+        db.session.flush()
+        db.session.add(ContadorTareas(usuario_id=nuevo_usuario.id))
+        usuario_creado = nuevo_usuario.to_dict()
+        db.session.commit()
+    except IntegrityError as error:
+        db.session.rollback()
+        if 'username' in str(error.orig):
+            return jsonify({"error": "El username ya está en uso"}), 400
+        return jsonify({"error": "El email ya está registrado"}), 400
+    
+    filtro_usuarios.agregar(usuario_creado['id'], usuario_creado['username'], usuario_creado['email'])
     
     return jsonify({
         "mensaje": "Usuario registrado exitosamente",
-        "usuario": nuevo_usuario.to_dict()
+        "usuario": usuario_creado
     }), 201
     
     
         
-@app.route('/login', methods=['POST'])
+@api.route('/usuarios/disponible', methods=['GET'])
+def usuario_disponible():
+    """
+    Verificar si un username y/o un email están disponibles para registrarse
+    
+    Parámetros de la URL: 'username' y/o 'email'. Consulta primero el
+    filtro de usuarios en memoria: si el valor no está en el filtro, está
+    disponible sin consultar la base de datos. Solo si el filtro dice que
+    podría estar registrado se confirma con una consulta.
+    """
+    username = request.args.get('username', '').strip()
+    email = request.args.get('email', '').strip()
+    
+    if not username and not email:
+        return jsonify({"error": "Indica 'username' y/o 'email'"}), 400
+    
+    filtro_usuarios.actualizar_si_corresponde(db.session, Usuario)
+    
+    respuesta = {}
+    if username:
+        disponible = username not in filtro_usuarios.usernames or not db.session.query(
+            Usuario.query.filter_by(username=username).exists()
+        ).scalar()
+        respuesta['username'] = {"valor": username, "disponible": disponible}
+    
+    if email:
+        disponible = email not in filtro_usuarios.emails or not db.session.query(
+            Usuario.query.filter_by(email=email).exists()
+        ).scalar()
+        respuesta['email'] = {"valor": email, "disponible": disponible}
+    
+    return jsonify(respuesta), 200
+
+@api.route('/login', methods=['POST'])
 def login():
     """
     Iniciar sesión de usuario
@@ -287,9 +1134,18 @@ def login():
     # Buscar usuario por username
     usuario = Usuario.query.filter_by(username=username).first()
     
-    if not usuario or not usuario.check_password(password):
+    if not usuario or not pool_hash.ejecutar(usuario.check_password, password):
         return jsonify({"error": "Username o password incorrectos"}), 401
     
+    # Si cambió la configuración del hash, recalcularlo ahora que se conoce
+    # la contraseña (si el pool está saturado se hará en otro login)
+    if hash_desactualizado(usuario.password_hash, current_app.config['HASH_METODO']):
+        try:
+            pool_hash.ejecutar(usuario.set_password, password, current_app.config['HASH_METODO'])
+            db.session.commit()
+        except ServicioSaturado:
+            db.session.rollback()
+    
     # Crear token de acceso
     access_token = create_access_token(identity=str(usuario.id))
     
@@ -301,11 +1157,100 @@ def login():
 
 
 
-@app.route('/tareas', methods=['GET'])
-@jwt_required()
-def obtener_tareas():
+# ===========================================
+# LISTADO DE TAREAS
+# ===========================================
+# GET /tareas se arma en dos pasos que no ejecutan consultas:
+# preparar_listado_tareas (parámetros y consultas) y armar_listado_tareas
+# (respuesta con las tareas leídas). Así la ruta de Flask y la versión
+# asíncrona de asgi.py comparten todo salvo la forma de ejecutar.
+
+# Campos que se pueden pedir con 'campos' (mismas claves que Tarea.to_dict)
+CAMPOS_TAREA = ('id', 'titulo', 'descripcion', 'completada', 'fecha_creacion', 'usuario_id')
+
+def leer_campos():
     """
-    Obtener tareas del usuario autenticado con búsqueda, filtros, ordenamiento y paginación
+    Lee el parámetro 'campos' (por ejemplo campos=id,titulo,completada)
+    
+    Retorna:
+    - tupla (campos, error). campos es la tupla de campos pedidos, sin
+      repetir y en el orden pedido (CAMPOS_TAREA si no se indicó 'campos')
+    """
+    texto = request.args.get('campos', '').strip()
+    if not texto:
+        return CAMPOS_TAREA, None
+    
+    campos = []
+    for campo in texto.split(','):
+        campo = campo.strip()
+        if campo and campo not in campos:
+            campos.append(campo)
+    
+    desconocidos = [campo for campo in campos if campo not in CAMPOS_TAREA]
+    if desconocidos or not campos:
+        return None, f"Campos no válidos: {', '.join(desconocidos)}. Disponibles: {', '.join(CAMPOS_TAREA)}"
+    return tuple(campos), None
+
+def columnas_campos(campos, *extra):
+    """
+    Columnas de Tarea para los campos pedidos y los nombres de 'extra'
+    (que la consulta necesita aunque no se devuelvan, como los del cursor)
+    """
+    nombres = list(campos) + [nombre for nombre in extra if nombre not in campos]
+    return [getattr(Tarea, nombre) for nombre in nombres]
+
+@lru_cache(maxsize=64)
+def serializador_tareas(campos):
+    """
+    Función que convierte una fila de tareas en un diccionario
+    
+    Las lecturas de tareas no crean objetos Tarea: piden solo las columnas
+    de 'campos' y reciben filas (tuplas). El serializador se arma una vez
+    por combinación de campos, con las claves y la posición de la fecha ya
+    resueltas; por cada fila solo queda armar el diccionario. Las columnas
+    extra al final de la fila (las del cursor o el conteo por ventana) se
+    ignoran.
+    
+    Parámetros:
+    - campos: tupla de campos, en el orden de las columnas de la fila
+    
+    Retorna:
+    - función fila -> diccionario con las mismas claves y valores que Tarea.to_dict
+    """
+    if 'fecha_creacion' not in campos:
+        def serializar(fila):
+            return dict(zip(campos, fila))
+        return serializar
+    
+    posicion_fecha = campos.index('fecha_creacion')
+    
+    def serializar(fila):
+        tarea = dict(zip(campos, fila))
+        fecha = fila[posicion_fecha]
+        if fecha is not None:
+            tarea['fecha_creacion'] = fecha.isoformat()
+        return tarea
+    return serializar
+
+def preparar_listado_tareas(usuario_id):
+    """
+    Interpreta los parámetros de GET /tareas y arma sus consultas
+    
+    Parámetros:
+    - usuario_id: id del usuario autenticado
+    
+    Retorna:
+    - tupla (listado, error). listado es un diccionario con los parámetros
+      normalizados y estas claves:
+      - 'consulta': página pedida, con una tarea extra para saber si hay más
+      - 'filtrada': tareas filtradas sin ordenar ni paginar (para contarlas)
+      - 'contar': 'ventana' si 'consulta' trae el total en cada fila
+        (count() OVER ()), 'consulta' si hay que contar 'filtrada' aparte,
+        o None si no hay que contar
+      - 'total_de_contadores': el total sale de los contadores del usuario
+      - 'campos': campos pedidos con 'campos' (todos si no se indicó). La
+        consulta lee solo esas columnas y devuelve filas, no objetos Tarea
+      error es el mensaje si los parámetros no son válidos
     """
     # Obtener parámetros de búsqueda y filtros de la URL
     busqueda = request.args.get('busqueda', '').strip()
@@ -315,118 +1260,157 @@ def obtener_tareas():
     ordenar_por = request.args.get('ordenar_por', 'fecha_creacion').strip()
     orden = request.args.get('orden', 'desc').strip()
     
-    # Obtener parámetros de paginación de la URL
-    pagina = request.args.get('pagina', '1').strip()
-    limite = request.args.get('limite', '10').strip()
+    # incluir_total=false: no contar (útil para scroll infinito)
+    incluir_total = request.args.get('incluir_total', 'true').strip().lower() not in ('false', '0', 'no')
+    
+    campos, error = leer_campos()
+    if error:
+        return None, error
+    
+    # Paginación y ordenamiento (por defecto: fecha de creación descendente)
+    paginacion, error = preparar_paginacion(COLUMNAS_ORDENAMIENTO, ordenar_por, orden, 'fecha_creacion', 'desc')
+    if error:
+        return None, error
+    columna = paginacion['columna']
+    
+    # Query base: tareas del usuario con los filtros aplicados una sola vez
+    # (la misma query sirve para la página y para el total)
+    query = filtrar_tareas(usuario_id, busqueda, estado)
+    query_filtrada = query
+    
+    # Ordenar por relevancia solo es posible con búsqueda de texto completo
+    # (no admite cursores: se pagina con 'pagina')
+    consulta_fts = consulta_busqueda(busqueda)
+    por_relevancia = (ordenar_por == 'relevancia' and paginacion['datos_cursor'] is None
+                      and consulta_fts is not None)
+    
+    # Aplicar ordenamiento (el id desempata para que el orden sea estable)
+    if por_relevancia:
+        relevancia = subconsulta_relevancia(consulta_fts)
+        query = query.join(relevancia, relevancia.c.id == Tarea.id)
+        query = query.order_by(relevancia.c.rango.asc(), Tarea.id.asc())
+    else:
+        query = ordenar_consulta(query, paginacion, Tarea.id)
+    
+    # Leer solo las columnas pedidas (más las que usan los cursores)
+    query = query.with_entities(*columnas_campos(campos, 'id', columna.key))
+    
+    # Sin búsqueda, el total sale de los contadores del usuario (sin contar filas)
+    total_de_contadores = incluir_total and not busqueda
+    query, contar = paginar_consulta(query, paginacion, Tarea.id, incluir_total and not total_de_contadores)
+    
+    return {
+        **paginacion,
+        'estado': estado,
+        'por_relevancia': por_relevancia,
+        'consulta': query,
+        'filtrada': query_filtrada,
+        'contar': contar,
+        'total_de_contadores': total_de_contadores,
+        'campos': campos
+    }, None
+
+def armar_listado_tareas(listado, tareas, total_tareas):
+    """
+    Respuesta de GET /tareas con las tareas leídas y los metadatos de paginación
     
-    # Obtener ID del usuario autenticado
-    usuario_id = int(get_jwt_identity())
+    Parámetros:
+    - listado: resultado de preparar_listado_tareas
+    - tareas: filas leídas con listado['consulta'] (incluida la extra)
+    - total_tareas: total de tareas filtradas, o None si no se contó
+    """
+    tareas, paginacion = metadatos_paginacion(
+        listado, tareas, total_tareas, COLUMNAS_ORDENAMIENTO,
+        con_cursores=not listado['por_relevancia']
+    )
+    paginacion['total_tareas'] = total_tareas
     
-    # Query base: tareas del usuario
-    query = Tarea.query.filter_by(usuario_id=usuario_id)
+    return {
+        "tareas": list(map(serializador_tareas(listado['campos']), tareas)),
+        "paginacion": paginacion
+    }
+
+@api.route('/tareas', methods=['GET'])
+@jwt_required()
+def obtener_tareas():
+    """
+    Obtener tareas del usuario autenticado con búsqueda, filtros, ordenamiento y paginación
     
-    # Aplicar filtro de búsqueda si se proporciona
-    if busqueda:
-        query = query.filter(
-            db.or_(
-                Tarea.titulo.ilike(f'%{busqueda}%'),
-                Tarea.descripcion.ilike(f'%{busqueda}%')
-            )
-        )
+    Admite dos modos de paginación:
+    - pagina: paginación clásica por número de página (offset)
+    - cursor: paginación por cursor (keyset), el costo de cada página no
+      depende de su profundidad. Los cursores se devuelven en el bloque
+      'paginacion' como 'siguiente_cursor' y 'anterior_cursor'
+    """
+    # Obtener ID del usuario autenticado
+    usuario_id = int(get_jwt_identity())
     
-    # Aplicar filtro de estado si se proporciona
-    if estado:
-        if estado.lower() == 'completada':
-            query = query.filter(Tarea.completada == True)
-        elif estado.lower() == 'pendiente':
-            query = query.filter(Tarea.completada == False)
+    # Si el cliente ya tiene esta versión, responder 304 sin leer las tareas
+    etag = etag_tareas(usuario_id)
+    respuesta_304 = no_modificado(etag)
+    if respuesta_304:
+        return respuesta_304
+    
+    # El ETag identifica usuario, versión y parámetros: sirve de clave de cache
+    cacheada = cache_respuestas.obtener(usuario_id, etag)
+    if cacheada is not None:
+        respuesta = Response(cacheada, mimetype='application/json')
+        respuesta.headers['X-Cache'] = 'HIT'
+        return respuesta_con_etag(respuesta, etag)
+    
+    listado, error = preparar_listado_tareas(usuario_id)
+    if error:
+        return jsonify({"error": error}), 400
+    
+    total_tareas = None
+    if listado['total_de_contadores']:
+        total_tareas = total_desde_contadores(usuario_id, listado['estado'])
+    
+    if listado['contar'] == 'ventana':
+        tareas, total_tareas = separar_total_ventana(listado, listado['consulta'].all())
+        if total_tareas is None:
+            # Página fuera de rango: no hay filas que traigan el total
+            total_tareas = listado['filtrada'].count()
+    else:
+        tareas = listado['consulta'].all()
+        if listado['contar'] == 'consulta':
+            total_tareas = listado['filtrada'].count()
+    
+    respuesta = jsonify(armar_listado_tareas(listado, tareas, total_tareas))
+    cache_respuestas.guardar(usuario_id, etag, respuesta.get_data())
+    respuesta.headers['X-Cache'] = 'MISS'
+    return respuesta_con_etag(respuesta, etag)
+
+@api.route('/tareas/<int:tarea_id>', methods=['GET'])
+@jwt_required()
+def obtener_tarea(tarea_id):
+    """
+    Obtener una tarea del usuario autenticado
     
-    # Aplicar ordenamiento
-    if ordenar_por == 'titulo':
-        if orden.lower() == 'asc':
-            query = query.order_by(Tarea.titulo.asc())
-        else:
-            query = query.order_by(Tarea.titulo.desc())
-    elif ordenar_por == 'fecha_creacion':
-        if orden.lower() == 'asc':
-            query = query.order_by(Tarea.fecha_creacion.asc())
-        else:
-            query = query.order_by(Tarea.fecha_creacion.desc())
-    elif ordenar_por == 'estado':
-        if orden.lower() == 'asc':
-            query = query.order_by(Tarea.completada.asc())
-        else:
-            query = query.order_by(Tarea.completada.desc())
+    Usa el mismo ETag por versión que GET /tareas: si el cliente ya tiene
+    la versión actual se responde 304 sin leer la tarea.
+    """
+    # Obtener ID del usuario autenticado
+    usuario_id = int(get_jwt_identity())
     
-    # Validar y convertir parámetros de paginación
-    try:
-        pagina = int(pagina)
-        limite = int(limite)
-        
-        # Validar valores mínimos y máximos
-        if pagina < 1:
-            pagina = 1
-        if limite < 1 or limite > 100:
-            limite = 10
-            
-        # Calcular offset
-        offset = (pagina - 1) * limite
-        
-    except ValueError:
-        # Si los parámetros no son números válidos, usar valores por defecto
-        pagina = 1
-        limite = 10
-        offset = 0
+    campos, error = leer_campos()
+    if error:
+        return jsonify({"error": error}), 400
     
-    # Crear una copia de la query para contar el total
-    total_query = Tarea.query.filter_by(usuario_id=usuario_id)
+    etag = etag_tareas(usuario_id)
+    respuesta_304 = no_modificado(etag)
+    if respuesta_304:
+        return respuesta_304
     
-    # Aplicar los mismos filtros a la query de conteo
-    if busqueda:
-        total_query = total_query.filter(
-            db.or_(
-                Tarea.titulo.ilike(f'%{busqueda}%'),
-                Tarea.descripcion.ilike(f'%{busqueda}%')
-            )
-        )
+    # Buscar la tarea del usuario específico (solo las columnas pedidas)
+    tarea = Tarea.query.filter_by(id=tarea_id, usuario_id=usuario_id).with_entities(*columnas_campos(campos)).first()
     
-    if estado:
-        if estado.lower() == 'completada':
-            total_query = total_query.filter(Tarea.completada == True)
-        elif estado.lower() == 'pendiente':
-            total_query = total_query.filter(Tarea.completada == False)
-    
-    # Contar total de tareas (sin paginación)
-    total_tareas = total_query.count()
-    
-    # Aplicar paginación a la query principal
-    query = query.offset(offset).limit(limite)
-    
-    # Ejecutar la consulta paginada
-    tareas = query.all()
-    
-    # Calcular metadatos de paginación
-    total_paginas = (total_tareas + limite - 1) // limite
-    tiene_siguiente = pagina < total_paginas
-    tiene_anterior = pagina > 1
-    
-    # Preparar respuesta con metadatos
-    respuesta = {
-        "tareas": [tarea.to_dict() for tarea in tareas],
-        "paginacion": {
-            "pagina_actual": pagina,
-            "limite": limite,
-            "total_tareas": total_tareas,
-            "total_paginas": total_paginas,
-            "tiene_siguiente": tiene_siguiente,
-            "tiene_anterior": tiene_anterior
-        }
-    }
+    if not tarea:
+        return jsonify({"error": "Tarea no encontrada"}), 404
     
-    return jsonify(respuesta)
-
+    return respuesta_con_etag(jsonify({"tarea": serializador_tareas(campos)(tarea)}), etag)
 
-@app.route('/tareas', methods=['POST'])
+@api.route('/tareas', methods=['POST'])
 @jwt_required()
 def agregar_tarea():
     """
@@ -448,8 +1432,10 @@ def agregar_tarea():
         usuario_id=usuario_id
     )
     
-    # Guardar en la base de datos
+    # Guardar en la base de datos y actualizar los contadores
     db.session.add(nueva_tarea)
+    completadas, pendientes = estado_contador(nueva_tarea.completada)
+    actualizar_contadores(usuario_id, total=1, completadas=completadas, pendientes=pendientes)
     db.session.commit()
     
     return jsonify({
@@ -457,7 +1443,252 @@ def agregar_tarea():
         "tarea": nueva_tarea.to_dict()
     }), 201
 
-@app.route('/tareas/<int:tarea_id>', methods=['PUT'])
+@api.route('/tareas/lote', methods=['POST'])
+@jwt_required()
+def agregar_tareas_lote():
+    """
+    Crear varias tareas para el usuario autenticado en una sola petición
+    
+    Recibe una lista de tareas con el mismo formato que POST /tareas.
+    Cada tarea se valida por separado; las válidas se insertan con una
+    sola sentencia dentro de una única transacción y las inválidas se
+    informan en los resultados sin impedir que se creen las demás.
+    
+    Retorna:
+    - 201 si se crearon todas las tareas
+    - 207 si algunas tareas tenían errores
+    - 400 si ninguna tarea era válida
+    """
+    datos = request.json
+    lote_maximo = current_app.config['LOTE_MAXIMO']
+    
+    if not isinstance(datos, list) or not datos:
+        return jsonify({"error": "Se debe enviar una lista de tareas"}), 400
+    
+    if len(datos) > lote_maximo:
+        return jsonify({
+            "error": f"No se pueden crear más de {lote_maximo} tareas por lote"
+        }), 400
+    
+    # Obtener ID del usuario autenticado
+    usuario_id = int(get_jwt_identity())
+    
+    # Validar cada tarea y separar las válidas
+    resultados = []
+    filas = []
+    for indice, tarea in enumerate(datos):
+        if isinstance(tarea, dict):
+            es_valido, mensaje = validar_tarea(tarea)
+        else:
+            es_valido, mensaje = False, "Cada tarea debe ser un objeto JSON"
+        
+        if not es_valido:
+            resultados.append({"indice": indice, "error": mensaje})
+            continue
+        
+        resultados.append({"indice": indice})
+        filas.append({
+            'titulo': tarea['titulo'],
+            'descripcion': tarea['descripcion'],
+            'completada': tarea.get('completada', False),
+            'usuario_id': usuario_id
+        })
+    
+    if not filas:
+        return jsonify({
+            "error": "Ninguna tarea del lote es válida",
+            "resultados": resultados
+        }), 400
+    
+    # Insertar todas las tareas válidas con una sola sentencia.
+    # RETURNING no garantiza el orden de las filas, pero los ids se asignan
+    # en el orden de los VALUES, así que ordenar por id recupera ese orden
+    tareas = db.session.scalars(db.insert(Tarea).returning(Tarea), filas).all()
+    tareas.sort(key=lambda tarea: tarea.id)
+    creadas = [tarea.to_dict() for tarea in tareas]
+    
+    # Actualizar los contadores una sola vez para todo el lote
+    completadas = sum(1 for fila in filas if fila['completada'])
+    actualizar_contadores(
+        usuario_id,
+        total=len(filas),
+        completadas=completadas,
+        pendientes=len(filas) - completadas
+    )
+    db.session.commit()
+    
+    # Completar los resultados en el mismo orden en que llegaron
+    tareas_creadas = iter(creadas)
+    for resultado in resultados:
+        if 'error' not in resultado:
+            resultado['tarea'] = next(tareas_creadas)
+    
+    errores = len(resultados) - len(creadas)
+    return jsonify({
+        "mensaje": "Lote procesado",
+        "creadas": len(creadas),
+        "errores": errores,
+        "resultados": resultados
+    }), 201 if not errores else 207
+
+@api.route('/tareas/lote', methods=['PATCH'])
+@jwt_required()
+def actualizar_tareas_lote():
+    """
+    Marcar varias tareas del usuario autenticado como completadas o pendientes
+    
+    Body: {"completada": true|false} más los filtros 'ids', 'busqueda' y/o
+    'estado' (ver leer_filtros_lote). Se ejecuta como un único UPDATE en
+    la base de datos, sin cargar las tareas.
+    """
+    datos = request.json
+    if not isinstance(datos, dict):
+        return jsonify({"error": "No se enviaron datos"}), 400
+    
+    completada = datos.get('completada')
+    if not isinstance(completada, bool):
+        return jsonify({"error": "El campo 'completada' debe ser true o false"}), 400
+    
+    filtros, mensaje = leer_filtros_lote(datos)
+    if not filtros:
+        return jsonify({"error": mensaje}), 400
+    
+    # Obtener ID del usuario autenticado
+    usuario_id = int(get_jwt_identity())
+    
+    # Solo se actualizan las tareas que están en el estado contrario, así
+    # la cantidad de filas afectadas es exactamente el cambio en los contadores
+    actualizadas = filtrar_tareas(usuario_id, **filtros).filter(
+        Tarea.completada == (not completada)
+    ).update({Tarea.completada: completada}, synchronize_session=False)
+    
+    if actualizadas:
+        cambio = actualizadas if completada else -actualizadas
+        actualizar_contadores(usuario_id, completadas=cambio, pendientes=-cambio)
+    db.session.commit()
+    
+    return jsonify({
+        "mensaje": "Tareas actualizadas",
+        "actualizadas": actualizadas
+    }), 200
+
+# Columnas de cada tarea exportada (mismas claves que Tarea.to_dict)
+COLUMNAS_EXPORTACION = ['id', 'titulo', 'descripcion', 'completada', 'fecha_creacion', 'usuario_id']
+
+def exportar_ndjson(filas):
+    """
+    Convierte un bloque de filas en líneas NDJSON (un objeto JSON por línea)
+    """
+    lineas = []
+    for fila in filas:
+        tarea = dict(zip(COLUMNAS_EXPORTACION, fila))
+        if tarea['fecha_creacion']:
+            tarea['fecha_creacion'] = tarea['fecha_creacion'].isoformat()
+        lineas.append(json.dumps(tarea, ensure_ascii=False) + '\n')
+    return ''.join(lineas)
+
+def exportar_csv(filas, incluir_encabezado=False):
+    """
+    Convierte un bloque de filas en texto CSV
+    """
+    salida = io.StringIO()
+    escritor = csv.writer(salida)
+    if incluir_encabezado:
+        escritor.writerow(COLUMNAS_EXPORTACION)
+    for tarea_id, titulo, descripcion, completada, fecha_creacion, usuario_id in filas:
+        escritor.writerow([
+            tarea_id,
+            titulo,
+            descripcion,
+            'true' if completada else 'false',
+            fecha_creacion.isoformat() if fecha_creacion else '',
+            usuario_id
+        ])
+    return salida.getvalue()
+
+@api.route('/tareas/exportar', methods=['GET'])
+@jwt_required()
+def exportar_tareas():
+    """
+    Exportar todas las tareas del usuario autenticado como NDJSON o CSV
+    
+    Acepta los mismos filtros y ordenamiento que GET /tareas (sin
+    paginación) y el parámetro 'formato' ('ndjson' o 'csv'). Las filas se
+    leen de la base de datos por bloques y se envían a medida que se
+    leen, así la memoria usada no depende de la cantidad de tareas.
+    """
+    busqueda = request.args.get('busqueda', '').strip()
+    estado = request.args.get('estado', '').strip()
+    ordenar_por = request.args.get('ordenar_por', 'fecha_creacion').strip()
+    orden = request.args.get('orden', 'desc').strip()
+    formato = request.args.get('formato', 'ndjson').strip().lower()
+    
+    if formato not in ('ndjson', 'csv'):
+        return jsonify({"error": "El formato debe ser 'ndjson' o 'csv'"}), 400
+    
+    # Obtener ID del usuario autenticado
+    usuario_id = int(get_jwt_identity())
+    
+    # Normalizar ordenamiento (por defecto: fecha de creación descendente)
+    columna = COLUMNAS_ORDENAMIENTO.get(ordenar_por, Tarea.fecha_creacion)
+    if orden.lower() == 'asc':
+        ordenamiento = (columna.asc(), Tarea.id.asc())
+    else:
+        ordenamiento = (columna.desc(), Tarea.id.desc())
+    
+    # Solo columnas (sin objetos del ORM), leídas de a bloques del cursor
+    tamano_bloque = current_app.config['EXPORTACION_TAMANO_BLOQUE']
+    query = filtrar_tareas(usuario_id, busqueda, estado).with_entities(
+        *[getattr(Tarea, nombre) for nombre in COLUMNAS_EXPORTACION]
+    ).order_by(*ordenamiento).yield_per(tamano_bloque)
+    
+    def generar():
+        filas = []
+        primer_bloque = True
+        for fila in query:
+            filas.append(fila)
+            if len(filas) < tamano_bloque:
+                continue
+            yield exportar_ndjson(filas) if formato == 'ndjson' else exportar_csv(filas, primer_bloque)
+            filas = []
+            primer_bloque = False
+        
+        # Último bloque (o solo el encabezado si no hay tareas)
+        if filas or (formato == 'csv' and primer_bloque):
+            yield exportar_ndjson(filas) if formato == 'ndjson' else exportar_csv(filas, primer_bloque)
+    
+    if formato == 'csv':
+        tipo = 'text/csv; charset=utf-8'
+    else:
+        tipo = 'application/x-ndjson; charset=utf-8'
+    
+    return Response(
+        stream_with_context(generar()),
+        mimetype=tipo,
+        headers={"Content-Disposition": f"attachment; filename=tareas.{formato}"}
+    )
+
+@api.route('/tareas/estadisticas', methods=['GET'])
+@jwt_required()
+def obtener_estadisticas():
+    """
+    Obtener los totales de tareas del usuario autenticado
+    
+    Lee el contador del usuario por clave primaria, sin recorrer sus tareas
+    """
+    usuario_id = int(get_jwt_identity())
+    
+    etag = etag_tareas(usuario_id)
+    respuesta_304 = no_modificado(etag)
+    if respuesta_304:
+        return respuesta_304
+    
+    contador = obtener_contador(usuario_id)
+    return respuesta_con_etag(jsonify({
+        "estadisticas": contador.to_dict()
+    }), etag)
+
+@api.route('/tareas/<int:tarea_id>', methods=['PUT'])
 @jwt_required()
 def actualizar_tarea(tarea_id):
     """
@@ -477,11 +1708,23 @@ def actualizar_tarea(tarea_id):
     if not tarea:
         return jsonify({"error": "Tarea no encontrada"}), 404
     
+    # Estado anterior para ajustar los contadores
+    completadas_antes, pendientes_antes = estado_contador(tarea.completada)
+    
     # Actualizar campos
     tarea.titulo = request.json['titulo']
     tarea.descripcion = request.json['descripcion']
     tarea.completada = request.json.get('completada', tarea.completada)
     
+    # Si cambió el estado, mover la tarea de un contador al otro
+    # (siempre se llama para que aumente la versión de las tareas)
+    completadas_despues, pendientes_despues = estado_contador(tarea.completada)
+    actualizar_contadores(
+        usuario_id,
+        completadas=completadas_despues - completadas_antes,
+        pendientes=pendientes_despues - pendientes_antes
+    )
+    
     # Guardar cambios
     db.session.commit()
     
@@ -490,7 +1733,7 @@ def actualizar_tarea(tarea_id):
         "tarea": tarea.to_dict()
     }), 200
 
-@app.route('/tareas/<int:tarea_id>', methods=['DELETE'])
+@api.route('/tareas/<int:tarea_id>', methods=['DELETE'])
 @jwt_required()
 def eliminar_tarea(tarea_id):
     """
@@ -508,8 +1751,10 @@ def eliminar_tarea(tarea_id):
     # Guardar copia antes de eliminar
     tarea_eliminada = tarea.to_dict()
     
-    # Eliminar tarea
+    # Eliminar tarea y descontarla de los contadores
+    completadas, pendientes = estado_contador(tarea.completada)
     db.session.delete(tarea)
+    actualizar_contadores(usuario_id, total=-1, completadas=-completadas, pendientes=-pendientes)
     db.session.commit()
     
     return jsonify({
@@ -517,28 +1762,175 @@ def eliminar_tarea(tarea_id):
         "tarea": tarea_eliminada
     }), 200
     
-@app.route('/usuarios', methods=['GET'])
+@api.route('/tareas', methods=['DELETE'])
+@jwt_required()
+def eliminar_tareas():
+    """
+    Eliminar varias tareas del usuario autenticado
+    
+    Acepta en la URL los filtros 'ids', 'busqueda' y/o 'estado' (ver
+    leer_filtros_lote). Se ejecuta como DELETE en la base de datos, sin
+    cargar las tareas: uno por cada estado, para saber cuántas tareas
+    completadas y pendientes descontar de los contadores.
+    """
+    filtros, mensaje = leer_filtros_lote(request.args)
+    if not filtros:
+        return jsonify({"error": mensaje}), 400
+    
+    # Obtener ID del usuario autenticado
+    usuario_id = int(get_jwt_identity())
+    
+    # Estados a eliminar (si se filtra por estado, basta con un DELETE)
+    estado = filtros['estado'].lower()
+    estados = [estado == 'completada'] if estado else [True, False]
+    
+    eliminadas = {True: 0, False: 0}
+    for completada in estados:
+        eliminadas[completada] = filtrar_tareas(usuario_id, **filtros).filter(
+            Tarea.completada == completada
+        ).delete(synchronize_session=False)
+    
+    total = eliminadas[True] + eliminadas[False]
+    if total:
+        actualizar_contadores(
+            usuario_id,
+            total=-total,
+            completadas=-eliminadas[True],
+            pendientes=-eliminadas[False]
+        )
+    db.session.commit()
+    
+    return jsonify({
+        "mensaje": "Tareas eliminadas",
+        "eliminadas": total
+    }), 200
+
+# Columnas públicas de los usuarios (nunca se lee password_hash)
+COLUMNAS_USUARIO = ['id', 'username', 'email', 'fecha_registro']
+
+def usuario_publico(fila, incluir_conteos=False):
+    """
+    Convierte una fila con las columnas de COLUMNAS_USUARIO en un diccionario
+    
+    Las columnas extra que traiga la fila (por ejemplo el conteo por
+    ventana) se ignoran, salvo los conteos de tareas si se pidieron.
+    
+    Parámetros:
+    - fila: fila de la consulta de usuarios
+    - incluir_conteos: agregar 'tareas' con los totales leídos por columnas_conteos()
+    """
+    usuario = dict(zip(COLUMNAS_USUARIO, fila))
+    if usuario['fecha_registro']:
+        usuario['fecha_registro'] = usuario['fecha_registro'].isoformat()
+    if incluir_conteos:
+        usuario['tareas'] = {
+            'total_tareas': fila.total_tareas,
+            'completadas': fila.completadas,
+            'pendientes': fila.pendientes
+        }
+    return usuario
+
+def columnas_conteos():
+    """
+    Columnas con los totales de tareas de cada usuario
+    
+    Salen de la tabla contadores_tareas, que ya guarda las tareas agrupadas
+    por usuario; los usuarios sin fila en esa tabla tienen 0 tareas. Se
+    usan con un LEFT JOIN en la misma consulta que lee la página de
+    usuarios, sin una consulta por usuario.
+    """
+    return [
+        db.func.coalesce(ContadorTareas.total, 0).label('total_tareas'),
+        db.func.coalesce(ContadorTareas.completadas, 0).label('completadas'),
+        db.func.coalesce(ContadorTareas.pendientes, 0).label('pendientes')
+    ]
+
+@api.route('/usuarios', methods=['GET'])
 def obtener_usuarios():
     """
-    Obtenemos usuarios registrados
+    Obtenemos usuarios registrados con búsqueda, ordenamiento y paginación
+    
+    Acepta los mismos parámetros de paginación que GET /tareas (pagina,
+    limite, cursor e incluir_total), 'busqueda' sobre username y email, y
+    'ordenar_por' ('username', 'email' o 'fecha_registro'). Con
+    formato=ndjson se envían todos los usuarios que coinciden, un objeto
+    JSON por línea, leídos por bloques en lugar de armar la lista en memoria.
+    Con incluir_conteos=true cada usuario incluye el total de sus tareas,
+    las completadas y las pendientes.
     """
+    busqueda = request.args.get('busqueda', '').strip()
+    ordenar_por = request.args.get('ordenar_por', 'fecha_registro').strip()
+    orden = request.args.get('orden', 'asc').strip()
+    incluir_total = request.args.get('incluir_total', 'true').strip().lower() not in ('false', '0', 'no')
+    formato = request.args.get('formato', 'json').strip().lower()
+    incluir_conteos = request.args.get('incluir_conteos', 'false').strip().lower() in ('true', '1')
+    
+    if formato not in ('json', 'ndjson'):
+        return jsonify({"error": "El formato debe ser 'json' o 'ndjson'"}), 400
+    
+    # Paginación y ordenamiento (por defecto: orden de registro). Con
+    # formato=ndjson se envían todos los usuarios: el cursor no se usa
+    paginacion, error = preparar_paginacion(
+        COLUMNAS_ORDENAMIENTO_USUARIOS, ordenar_por, orden, 'fecha_registro', 'asc',
+        usar_cursor=formato == 'json'
+    )
+    if error:
+        return jsonify({"error": error}), 400
+    
     try:
-        usuarios = Usuario.query.all()
+        # Solo las columnas públicas, sin objetos del ORM
+        query = db.session.query(*[getattr(Usuario, nombre) for nombre in COLUMNAS_USUARIO])
+        if busqueda:
+            query = query.filter(db.or_(
+                Usuario.username.ilike(f'%{busqueda}%'),
+                Usuario.email.ilike(f'%{busqueda}%')
+            ))
+        query_filtrada = query
+        
+        # Los conteos se leen en la misma consulta que la página
+        if incluir_conteos:
+            query = query.outerjoin(
+                ContadorTareas, ContadorTareas.usuario_id == Usuario.id
+            ).add_columns(*columnas_conteos())
+        
+        query = ordenar_consulta(query, paginacion, Usuario.id)
+        
+        if formato == 'ndjson':
+            tamano_bloque = current_app.config['EXPORTACION_TAMANO_BLOQUE']
+            filas_stream = query.yield_per(tamano_bloque)
+            
+            def generar():
+                lineas = []
+                for fila in filas_stream:
+                    lineas.append(json.dumps(usuario_publico(fila, incluir_conteos), ensure_ascii=False) + '\n')
+                    if len(lineas) >= tamano_bloque:
+                        yield ''.join(lineas)
+                        lineas = []
+                if lineas:
+                    yield ''.join(lineas)
+            
+            return Response(
+                stream_with_context(generar()),
+                mimetype='application/x-ndjson; charset=utf-8'
+            )
+        
+        # Página (y total) con la misma paginación que GET /tareas
+        query, contar = paginar_consulta(query, paginacion, Usuario.id, incluir_total)
+        filas = query.all()
+        total_usuarios = None
+        if contar == 'ventana':
+            filas, total_usuarios = separar_total_ventana(paginacion, filas)
+        if contar == 'consulta' or (contar == 'ventana' and total_usuarios is None):
+            total_usuarios = query_filtrada.count()
+        
+        filas, metadatos = metadatos_paginacion(paginacion, filas, total_usuarios, COLUMNAS_ORDENAMIENTO_USUARIOS)
         
-        lista_usuarios = []
-        for usuario in usuarios:
-            lista_usuarios.append({
-                'id': usuario.id,
-                'username': usuario.username,
-                'email': usuario.email,
-                'fecha_registro': usuario.fecha_registro.isoformat() if usuario.fecha_registro else None
-                
-            })
         # Devolver respuesta exitosa
         return jsonify({
             "mensaje": "Usuarios obtenidos exitosamente",
-            "total_usuarios": len(lista_usuarios),
-            "usuarios": lista_usuarios
+            "total_usuarios": total_usuarios,
+            "usuarios": [usuario_publico(fila, incluir_conteos) for fila in filas],
+            "paginacion": metadatos
         }), 200
         
     except Exception as e:
@@ -549,11 +1941,144 @@ def obtener_usuarios():
         }), 500
         
 
+# ===========================================
+# MÉTRICAS
+# ===========================================
+
+def metricas_servicios(app):
+    """
+    Métricas de los servicios de la aplicación, para texto_prometheus
+    
+    Solo se incluyen los servicios que ya se crearon en este proceso: pedir
+    las métricas no crea el pool de hashing ni las caches.
+    """
+    familias = []
+    
+    tiempos = app.extensions['tiempos_inicio']
+    familias.append(('api_inicio_milisegundos', 'gauge', 'Duración de cada etapa del inicio del proceso', [
+        ('', {'etapa': etapa}, milisegundos) for etapa, milisegundos in tiempos.items()
+    ]))
+    
+    pools = app.extensions['metricas_pools']
+    for dato, tipo, ayuda in (
+        ('conexiones_abiertas', 'counter', 'Conexiones abiertas por el pool de cada engine'),
+        ('prestamos', 'counter', 'Conexiones prestadas por el pool de cada engine'),
+        ('tamano', 'gauge', 'Tamaño del pool de conexiones de cada engine'),
+        ('en_uso', 'gauge', 'Conexiones del pool en uso'),
+        ('libres', 'gauge', 'Conexiones del pool libres'),
+        ('desborde', 'gauge', 'Conexiones abiertas por encima del tamaño del pool')
+    ):
+        muestras = []
+        for engine, metricas_pool in pools.items():
+            estadisticas = metricas_pool.estadisticas()
+            if dato in estadisticas:
+                muestras.append(('', {'engine': engine}, estadisticas[dato]))
+        nombre = f'api_pool_{dato}_total' if tipo == 'counter' else f'api_pool_{dato}'
+        familias.append((nombre, tipo, ayuda, muestras))
+    
+    cache = app.extensions.get('cache_respuestas')
+    if cache is not None:
+        estadisticas = cache.estadisticas()
+        etiquetas = {'tipo': estadisticas['tipo']}
+        familias.append(('api_cache_respuestas_aciertos_total', 'counter', 'Respuestas de GET /tareas servidas desde la cache', [('', etiquetas, estadisticas['aciertos'])]))
+        familias.append(('api_cache_respuestas_fallos_total', 'counter', 'Respuestas de GET /tareas que no estaban en la cache', [('', etiquetas, estadisticas['fallos'])]))
+    
+    tokens = app.extensions.get('cache_tokens')
+    if tokens is not None:
+        estadisticas = tokens.estadisticas()
+        familias.append(('api_cache_tokens_aciertos_total', 'counter', 'Tokens JWT que no hubo que verificar de nuevo', [('', {}, estadisticas['aciertos'])]))
+        familias.append(('api_cache_tokens_fallos_total', 'counter', 'Tokens JWT verificados por no estar en la cache', [('', {}, estadisticas['fallos'])]))
+        familias.append(('api_cache_tokens_entradas', 'gauge', 'Tokens JWT guardados en la cache', [('', {}, estadisticas['entradas'])]))
+    
+    hash_ = app.extensions.get('pool_hash')
+    if hash_ is not None:
+        estadisticas = hash_.estadisticas()
+        familias.append(('api_hash_operaciones_total', 'counter', 'Hashes de contraseñas calculados', [('', {}, estadisticas['operaciones'])]))
+        familias.append(('api_hash_rechazadas_total', 'counter', 'Hashes rechazados con 503 por la cola llena', [('', {}, estadisticas['rechazadas'])]))
+        familias.append(('api_hash_en_curso', 'gauge', 'Hashes en curso o esperando turno', [('', {}, estadisticas['en_curso'])]))
+        familias.append(('api_hash_en_cola', 'gauge', 'Hashes esperando un hilo libre', [('', {}, estadisticas['en_cola'])]))
+        familias.append(('api_hash_cola_maxima', 'gauge', 'Hashes que pueden esperar turno antes de responder 503', [('', {}, estadisticas['cola_maxima'])]))
+        # Sumas y cantidades (no promedios): se pueden agregar entre workers
+        familias.append(('api_hash_duracion_segundos', 'summary', 'Duración del cálculo de cada hash', [
+            ('_sum', {}, estadisticas['latencia_total']),
+            ('_count', {}, estadisticas['operaciones'])
+        ]))
+        familias.append(('api_hash_espera_segundos', 'summary', 'Espera en la cola antes de calcular cada hash', [
+            ('_sum', {}, estadisticas['espera_total']),
+            ('_count', {}, estadisticas['operaciones'])
+        ]))
+        familias.append(('api_hash_duracion_maxima_segundos', 'gauge', 'Duración del hash más lento de este proceso', [('', {}, estadisticas['latencia_maxima'])]))
+    
+    return familias
+
+@api.route('/metricas', methods=['GET'])
+def obtener_metricas():
+    """
+    Métricas de este proceso en formato de texto de Prometheus
+    
+    Con varios workers cada uno tiene sus propias métricas y responde con
+    las suyas: Prometheus suma las series de todas las lecturas.
+    """
+    # Sin METRICAS_TOKEN no se publican: las métricas muestran las rutas,
+    # los tiempos y el uso de la base de datos de la API
+    metricas_peticiones = current_app.extensions.get('metricas_peticiones')
+    token = current_app.config['METRICAS_TOKEN']
+    if metricas_peticiones is None or not token:
+        abort(404)
+    
+    if not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return jsonify({"error": "Token de métricas inválido"}), 401
+    
+    familias = metricas_peticiones.familias() + metricas_servicios(current_app)
+    return Response(texto_prometheus(familias), content_type=TIPO_PROMETHEUS)
+
+# ===========================================
+# FRONTEND
+# ===========================================
+# Solo se registra con FRONTEND=1. Los archivos se leen una vez, en la
+# primera visita, y se sirven desde memoria (ya comprimidos).
+
+@frontend.route('/', methods=['GET'])
+def frontend_index():
+    """
+    index.html con las referencias a los archivos con hash
+    
+    Se revalida en cada visita: si no cambió, la respuesta es un 304 sin
+    cuerpo y el resto de los archivos sale de la cache del navegador.
+    """
+    return responder_archivo(frontend_estatico.index, CACHE_REVALIDAR)
+
+@frontend.route(PREFIJO_RECURSOS + '<nombre>', methods=['GET'])
+def frontend_recurso(nombre):
+    """
+    Archivo del frontend por su nombre con hash (cacheable para siempre)
+    """
+    archivo = frontend_estatico.recursos.get(nombre)
+    if archivo is None:
+        abort(404)
+    return responder_archivo(archivo, CACHE_INMUTABLE)
+
 # ===========================================
 # MANEJO DE ERRORES
 # ===========================================
 
-@app.errorhandler(404)
+@api.app_errorhandler(ServicioSaturado)
+def servicio_saturado(error):
+    """
+    Maneja la saturación del pool de hashing - 503 Servicio no disponible
+    
+    El header Retry-After indica en cuántos segundos conviene reintentar.
+    """
+    respuesta = jsonify({
+        "error": "Servicio saturado",
+        "mensaje": "Hay demasiados inicios de sesión en curso. Inténtalo de nuevo en unos segundos.",
+        "tipo": "error_saturacion"
+    })
+    respuesta.status_code = 503
+    respuesta.headers['Retry-After'] = str(error.reintentar_en)
+    return respuesta
+
+@api.app_errorhandler(404)
 def not_found(error):
     """
     Maneja errores 404 - Recurso no encontrado
@@ -563,7 +2088,7 @@ def not_found(error):
         "mensaje": "La URL que buscas no existe"
     }), 404
 
-@app.errorhandler(405)
+@api.app_errorhandler(405)
 def method_not_allowed(error):
     """
     Maneja errores 405 - Método no permitido
@@ -573,7 +2098,7 @@ def method_not_allowed(error):
         "mensaje": "El método HTTP que usaste no está permitido para esta URL"
     }), 405
 
-@app.errorhandler(500)
+@api.app_errorhandler(500)
 def internal_error(error):
     """
     Maneja errores 500 - Error interno del servidor
@@ -587,7 +2112,7 @@ def internal_error(error):
 # MANEJO DE ERRORES DE BASE DE DATOS
 # ===========================================
 
-@app.errorhandler(Exception)
+@api.app_errorhandler(Exception)
 def handle_exception(e):
     """
     Maneja errores generales no capturados, especialmente errores de base de datos
@@ -619,21 +2144,238 @@ def handle_exception(e):
         "tipo": "error_interno"
     }), 500
 
-# Crear las tablas de la base de datos
-def crear_tablas():
+# ===========================================
+# MIGRACIONES
+# ===========================================
+
+def migrar_columnas():
     """
-    Crear todas las tablas definidas en los modelos
+    Agrega a tablas existentes las columnas declaradas en los modelos
+    
+    Igual que con los índices, db.create_all() no agrega columnas nuevas a
+    tablas que ya existen. Las columnas nuevas deben tener server_default
+    (o aceptar NULL) para que ALTER TABLE pueda completar las filas viejas.
+    
+    Retorna:
+    - lista con los nombres de las columnas agregadas ('tabla.columna')
+    """
+    inspector = db.inspect(db.engine)
+    dialecto = db.engine.dialect
+    agregadas = []
+    
+    for tabla in db.metadata.sorted_tables:
+        if not inspector.has_table(tabla.name):
+            continue
+        
+        existentes = {columna['name'] for columna in inspector.get_columns(tabla.name)}
+        for columna in tabla.columns:
+            if columna.name in existentes:
+                continue
+            
+            definicion = CreateColumn(columna).compile(dialect=dialecto)
+            with db.engine.begin() as conexion:
+                conexion.exec_driver_sql(f'ALTER TABLE {tabla.name} ADD COLUMN {definicion}')
+            agregadas.append(f'{tabla.name}.{columna.name}')
+    
+    return agregadas
+
+def migrar_indices():
+    """
+    Crea en bases de datos existentes los índices declarados en los modelos
+    
+    db.create_all() solo crea tablas nuevas: nunca modifica las que ya
+    existen, así que un archivo tareas.db creado con una versión anterior
+    se quedaría sin los índices nuevos. Esta función compara los índices
+    declarados con los que hay en la base de datos y crea los que faltan.
+    
+    Retorna:
+    - lista con los nombres de los índices creados
+    """
+    inspector = db.inspect(db.engine)
+    creados = []
+    
+    for tabla in db.metadata.sorted_tables:
+        if not inspector.has_table(tabla.name):
+            continue
+        
+        existentes = {indice['name'] for indice in inspector.get_indexes(tabla.name)}
+        for indice in tabla.indexes:
+            if indice.name not in existentes:
+                indice.create(bind=db.engine)
+                creados.append(indice.name)
+    
+    # Actualizar las estadísticas para que SQLite aproveche los índices nuevos
+    if creados and db.engine.dialect.name == 'sqlite':
+        with db.engine.begin() as conexion:
+            conexion.exec_driver_sql('ANALYZE')
+    
+    return creados
+
+def migrar_contadores():
+    """
+    Crea los contadores de tareas de los usuarios que todavía no tienen uno
+    
+    Los calcula todos con una sola consulta agrupada (INSERT ... SELECT),
+    así una base de datos anterior a los contadores queda lista al iniciar.
+    
+    Retorna:
+    - cantidad de contadores creados
+    """
+    sin_contador = ~db.exists().where(ContadorTareas.usuario_id == Usuario.id)
+    conteos = db.select(
+        Usuario.id,
+        db.func.count(Tarea.id),
+        db.func.count(db.case((Tarea.completada == True, 1))),
+        db.func.count(db.case((Tarea.completada == False, 1)))
+    ).outerjoin(Tarea, Tarea.usuario_id == Usuario.id).where(sin_contador).group_by(Usuario.id)
+    
+    resultado = db.session.execute(
+        db.insert(ContadorTareas).from_select(
+            ['usuario_id', 'total', 'completadas', 'pendientes'], conteos
+        )
+    )
+    db.session.commit()
+    return resultado.rowcount
+
+def migrar_estados_nulos():
+    """
+    Convierte en pendientes las tareas con completada = NULL
+    
+    Versiones anteriores aceptaban 'completada': null al crear o editar.
+    Las operaciones en lote y los contadores trabajan con dos estados
+    (completada o pendiente), así que esas tareas pasan a ser pendientes
+    y se suman a los contadores de pendientes de su usuario.
+    
+    Retorna:
+    - cantidad de tareas corregidas
+    """
+    nulas = db.session.execute(
+        db.select(Tarea.usuario_id, db.func.count(Tarea.id))
+        .where(Tarea.completada.is_(None))
+        .group_by(Tarea.usuario_id)
+    ).all()
+    
+    if not nulas:
+        return 0
+    
+    Tarea.query.filter(Tarea.completada.is_(None)).update(
+        {Tarea.completada: False}, synchronize_session=False
+    )
+    for usuario_id, cantidad in nulas:
+        ContadorTareas.query.filter_by(usuario_id=usuario_id).update({
+            ContadorTareas.pendientes: ContadorTareas.pendientes + cantidad,
+            ContadorTareas.version: ContadorTareas.version + 1
+        }, synchronize_session=False)
+    db.session.commit()
+    return sum(cantidad for _, cantidad in nulas)
+
+# Versión de las migraciones de datos: aumentarla al agregar o cambiar una
+# (los cambios de tablas, columnas e índices se detectan solos)
+VERSION_MIGRACIONES = 1
+
+def huella_esquema():
+    """
+    Hash del esquema declarado en los modelos, el índice de búsqueda y
+    las migraciones
+    
+    Se calcula sin consultar la base de datos, compilando las sentencias
+    CREATE de cada tabla e índice. Cambia cuando cambia cualquier modelo.
     """
+    dialecto = db.engine.dialect
+    sentencias = [f'migraciones:{VERSION_MIGRACIONES}', SQL_CREAR_INDICE, *SQL_TRIGGERS]
+    for tabla in db.metadata.sorted_tables:
+        sentencias.append(str(CreateTable(tabla).compile(dialect=dialecto)))
+        for indice in sorted(tabla.indexes, key=lambda indice: indice.name):
+            sentencias.append(str(CreateIndex(indice).compile(dialect=dialecto)))
+    return hashlib.sha256('\n'.join(sentencias).encode('utf-8')).hexdigest()
+
+def leer_huella_esquema(conexion):
+    """
+    Huella guardada en la base de datos (None si nunca se guardó)
+    """
+    try:
+        return conexion.execute(
+            db.select(VersionEsquema.huella).where(VersionEsquema.id == 1)
+        ).scalar()
+    except DBAPIError:
+        # Base de datos nueva o anterior a la tabla version_esquema
+        conexion.rollback()
+        return None
+
+def migrar_esquema(app):
+    """
+    Crea las tablas, aplica las migraciones y el índice de búsqueda, y
+    guarda la huella del esquema
+    """
+    db.create_all()
+    for columna in migrar_columnas():
+        print(f"🔧 Columna agregada: {columna}")
+    for indice in migrar_indices():
+        print(f"🔧 Índice creado: {indice}")
+    corregidas = migrar_estados_nulos()
+    if corregidas:
+        print(f"🔧 Tareas sin estado marcadas como pendientes: {corregidas}")
+    creados = migrar_contadores()
+    if creados:
+        print(f"🔧 Contadores de tareas creados: {creados}")
+    
+    # Índice de texto completo para 'busqueda' (si SQLite tiene FTS5)
+    if app.config['BUSQUEDA_FTS']:
+        app.extensions['busqueda_fts'] = crear_indice_busqueda(db.engine)
+        if not app.extensions['busqueda_fts']:
+            print("⚠️ FTS5 no disponible: la búsqueda usará coincidencia por subcadena")
+    
+    db.session.merge(VersionEsquema(id=1, huella=huella_esquema(), fecha_actualizacion=datetime.utcnow()))
+    db.session.commit()
+
+def preparar_base_de_datos(app):
+    """
+    Crear todas las tablas definidas en los modelos y aplicar las migraciones
+    
+    Se ejecuta una sola vez por despliegue, antes de iniciar los workers
+    (ver gunicorn.conf.py) o al levantar el servidor de desarrollo. Si la
+    huella del esquema guardada en la base de datos coincide con la de los
+    modelos, no revisa nada más (salvo con VERIFICAR_ESQUEMA=1). Al
+    terminar cierra las conexiones abiertas, para que ningún proceso hijo
+    herede conexiones del proceso que preparó la base de datos.
+    
+    Parámetros:
+    - app: aplicación creada con create_app
+    """
+    tiempos = app.extensions['tiempos_inicio']
+    
     with app.app_context():
-        db.create_all()
+        inicio = time.perf_counter()
+        with db.engine.connect() as conexion:
+            tiempos['conexion'] = (time.perf_counter() - inicio) * 1000
+            
+            inicio = time.perf_counter()
+            guardada = leer_huella_esquema(conexion)
+        
+        actualizado = guardada == huella_esquema() and not app.config['VERIFICAR_ESQUEMA']
+        if not actualizado:
+            migrar_esquema(app)
+        tiempos['esquema'] = (time.perf_counter() - inicio) * 1000
+        
+        db.session.remove()
+        db.engine.dispose()
+    
+    if actualizado:
+        print("✅ Base de datos al día (esquema sin cambios)")
+    else:
         print("✅ Base de datos creada/verificada correctamente")
+    print(reporte_inicio(app))
 
-# Crear las tablas de la base de datos al iniciar
-with app.app_context():
-    db.create_all()
-    print("✅ Base de datos creada/verificada correctamente")
+
+# Fin de la importación del módulo (para el reporte de tiempos de inicio)
+FIN_IMPORTACION = time.perf_counter()
+PROCESO_IMPORTACION = os.getpid()
 
 
 if __name__ == '__main__':
+    # Servidor de desarrollo (un solo proceso). En producción se usa
+    # gunicorn con gunicorn.conf.py
+    app = create_app()
+    preparar_base_de_datos(app)
     port = int(os.environ.get('PORT', 5000))
-    app.run(host='0.0.0.0', port=port, debug=False)
\ No newline at end of file
+    app.run(host='0.0.0.0', port=port, debug=False)
@@ -0,0 +1,325 @@
+# asgi.py
+import asyncio
+import os
+from asgiref.wsgi import WsgiToAsgi
+from flask import jsonify, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from werkzeug.exceptions import HTTPException
+from werkzeug.test import EnvironBuilder
+from app import (
+    create_app, preparar_base_de_datos, busqueda_fts_activa, cache_respuestas,
+    etag_tareas, no_modificado, respuesta_con_etag, total_en_contador,
+    preparar_listado_tareas, separar_total_ventana, armar_listado_tareas,
+    leer_campos, columnas_campos, serializador_tareas
+)
+from lectura_escritura import BIND_LECTURA, METODOS_LECTURA, MetricasPool
+from models import db, Tarea, ContadorTareas
+from perfil_sqlite import aplicar_perfil_sqlite
+
+# Servidor ASGI de la API: python asgi.py, uvicorn --factory asgi:crear_app_asgi
+# o gunicorn con SERVIDOR_MODO=asgi
+#
+# GET /tareas y GET /tareas/<id> se atienden con un engine asíncrono
+# (aiosqlite): mientras una lectura espera a la base de datos, el mismo
+# proceso sigue atendiendo otras peticiones. Todas las demás rutas pasan
+# sin cambios a la aplicación Flask (WSGI). Las dos versiones de las
+# lecturas comparten parámetros, consultas, JWT, ETag, cache y respuestas:
+# solo cambia la forma de ejecutar las consultas.
+
+
+def crear_motor_asincrono(app):
+    """
+    Crea el engine asíncrono para las lecturas de tareas
+
+    Usa BD_ASINCRONA_URL o, si no se indica, la base de datos del engine
+    de lectura (o la principal) con el driver aiosqlite. Sus conexiones
+    solo leen, así que reciben el perfil de SQLite de solo lectura.
+
+    Parámetros:
+    - app: aplicación Flask ya configurada
+
+    Retorna:
+    - AsyncEngine de SQLAlchemy
+    """
+    url = app.config['BD_ASINCRONA_URL']
+    if not url:
+        with app.app_context():
+            engine = db.engines.get(BIND_LECTURA) or db.engine
+        if engine.dialect.name != 'sqlite':
+            raise ValueError("Indica BD_ASINCRONA_URL: solo SQLite tiene un driver asíncrono por defecto")
+        url = engine.url.set(drivername='sqlite+aiosqlite')
+
+    motor = create_async_engine(
+        make_url(url),
+        pool_size=app.config['BD_ASINCRONA_POOL'],
+        max_overflow=0
+    )
+    aplicar_perfil_sqlite(motor.sync_engine, app.config, solo_lectura=True)
+    return motor
+
+
+def entorno_wsgi(scope):
+    """
+    Entorno WSGI de una petición ASGI sin cuerpo (GET o HEAD)
+
+    Con él se abre un contexto de petición de Flask normal, así request,
+    los ETag y la validación del JWT funcionan igual que en la aplicación WSGI.
+    """
+    servidor = scope.get('server') or ('localhost', None)
+    host = f'{servidor[0]}:{servidor[1]}' if servidor[1] else servidor[0]
+    cliente = scope.get('client') or ('', 0)
+    constructor = EnvironBuilder(
+        path=scope['path'],
+        base_url=f"{scope.get('scheme', 'http')}://{host}",
+        query_string=scope['query_string'].decode('latin-1'),
+        method=scope['method'],
+        headers=[(nombre.decode('latin-1'), valor.decode('latin-1')) for nombre, valor in scope['headers']],
+        environ_base={'REMOTE_ADDR': cliente[0]}
+    )
+    return constructor.get_environ()
+
+
+def cerrar_al_terminar(aplicacion_wsgi):
+    """
+    Envuelve una aplicación WSGI para que se llame a close() de su respuesta
+
+    WsgiToAsgi recorre la respuesta pero no la cierra, como pide PEP 3333:
+    sin esto no se ejecutan los call_on_close de Flask (con los que se
+    registran las métricas de las respuestas enviadas por partes).
+    """
+    def aplicacion(environ, start_response):
+        respuesta = aplicacion_wsgi(environ, start_response)
+        try:
+            yield from respuesta
+        finally:
+            if hasattr(respuesta, 'close'):
+                respuesta.close()
+    return aplicacion
+
+
+async def enviar_respuesta(respuesta, scope, send):
+    """
+    Envía una respuesta de Flask por ASGI (sin cuerpo si la petición es HEAD)
+    """
+    cuerpo = respuesta.get_data()
+    encabezados = respuesta.get_wsgi_headers(request.environ)
+    await send({
+        'type': 'http.response.start',
+        'status': respuesta.status_code,
+        'headers': [(nombre.lower().encode('latin-1'), valor.encode('latin-1')) for nombre, valor in encabezados.items()]
+    })
+    await send({
+        'type': 'http.response.body',
+        'body': b'' if scope['method'] == 'HEAD' else cuerpo
+    })
+
+
+class AplicacionAsgi:
+    """
+    Aplicación ASGI: lecturas de tareas asíncronas y el resto con Flask
+
+    Las vistas asíncronas reciben el id del usuario autenticado y devuelven
+    lo mismo que una vista de Flask, o None si la petición debe atenderla
+    la aplicación WSGI (por ejemplo, si el usuario todavía no tiene
+    contador de tareas: crearlo es una escritura).
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.wsgi = WsgiToAsgi(cerrar_al_terminar(app))
+        self.motor = crear_motor_asincrono(app)
+        self.sesiones = async_sessionmaker(self.motor, expire_on_commit=False)
+        app.extensions['metricas_pools']['asincrono'] = MetricasPool(self.motor.sync_engine)
+        if 'metricas_peticiones' in app.extensions:
+            app.extensions['metricas_peticiones'].observar_engine(self.motor.sync_engine)
+
+        # Endpoints de Flask que tienen versión asíncrona
+        self.vistas = {
+            'api.obtener_tareas': self.listar_tareas,
+            'api.obtener_tarea': self.leer_tarea
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.ciclo_de_vida(receive, send)
+            return
+
+        ruta = self.ruta_asincrona(scope)
+        if ruta is None or not await self.atender(ruta, scope, send):
+            await self.wsgi(scope, receive, send)
+
+    def ruta_asincrona(self, scope):
+        """
+        Vista asíncrona y argumentos de la URL para la petición, o None si
+        la atiende la aplicación Flask
+        """
+        if scope['type'] != 'http' or scope['method'] not in METODOS_LECTURA:
+            return None
+        try:
+            endpoint, argumentos = self.app.url_map.bind('').match(scope['path'], method=scope['method'])
+        except HTTPException:
+            return None
+        vista = self.vistas.get(endpoint)
+        if vista is None:
+            return None
+        return vista, argumentos
+
+    async def atender(self, ruta, scope, send):
+        """
+        Atiende la petición con su vista asíncrona
+
+        Sigue los pasos de Flask: before_request, la vista (que exige un
+        JWT válido), los manejadores de errores y after_request (CORS).
+
+        Retorna:
+        - True si se envió la respuesta
+        - False si la vista pidió que la atienda la aplicación Flask
+        """
+        vista, argumentos = ruta
+        with self.app.request_context(entorno_wsgi(scope)):
+            try:
+                respuesta = self.app.preprocess_request()
+                if respuesta is None:
+                    verify_jwt_in_request()
+                    respuesta = await vista(int(get_jwt_identity()), **argumentos)
+                    if respuesta is None:
+                        return False
+            except Exception as error:
+                respuesta = self.app.handle_user_exception(error)
+
+            respuesta = self.app.process_response(self.app.make_response(respuesta))
+            await enviar_respuesta(respuesta, scope, send)
+        return True
+
+    async def ciclo_de_vida(self, receive, send):
+        """
+        Inicio y cierre del servidor: al cerrar se liberan las conexiones
+        """
+        while True:
+            mensaje = await receive()
+            if mensaje['type'] == 'lifespan.startup':
+                # La comprobación del índice FTS5 es síncrona: se hace antes
+                # de la primera búsqueda y fuera del bucle de eventos
+                await asyncio.to_thread(self.comprobar_busqueda)
+                await send({'type': 'lifespan.startup.complete'})
+            elif mensaje['type'] == 'lifespan.shutdown':
+                await self.motor.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    def comprobar_busqueda(self):
+        with self.app.app_context():
+            busqueda_fts_activa()
+
+    async def contar(self, sesion, query):
+        """
+        Cuenta las filas de una query de Flask-SQLAlchemy con la sesión asíncrona
+        """
+        consulta = select(func.count()).select_from(query.statement.subquery())
+        return await sesion.scalar(consulta)
+
+    async def listar_tareas(self, usuario_id):
+        """
+        Versión asíncrona de GET /tareas (ver obtener_tareas en app.py)
+        """
+        async with self.sesiones() as sesion:
+            contador = await sesion.get(ContadorTareas, usuario_id)
+            if contador is None:
+                return None
+
+            # Si el cliente ya tiene esta versión, responder 304 sin leer las tareas
+            etag = etag_tareas(usuario_id, contador.version)
+            respuesta_304 = no_modificado(etag)
+            if respuesta_304:
+                return respuesta_304
+
+            cacheada = await self.usar_cache('obtener', usuario_id, etag)
+            if cacheada is not None:
+                respuesta = self.app.response_class(cacheada, mimetype='application/json')
+                respuesta.headers['X-Cache'] = 'HIT'
+                return respuesta_con_etag(respuesta, etag)
+
+            listado, error = preparar_listado_tareas(usuario_id)
+            if error:
+                return jsonify({"error": error}), 400
+
+            total_tareas = None
+            if listado['total_de_contadores']:
+                total_tareas = total_en_contador(contador, listado['estado'])
+
+            resultado = await sesion.execute(listado['consulta'].statement)
+            if listado['contar'] == 'ventana':
+                tareas, total_tareas = separar_total_ventana(listado, resultado.all())
+                if total_tareas is None:
+                    # Página fuera de rango: no hay filas que traigan el total
+                    total_tareas = await self.contar(sesion, listado['filtrada'])
+            else:
+                tareas = resultado.all()
+                if listado['contar'] == 'consulta':
+                    total_tareas = await self.contar(sesion, listado['filtrada'])
+
+        respuesta = jsonify(armar_listado_tareas(listado, tareas, total_tareas))
+        await self.usar_cache('guardar', usuario_id, etag, respuesta.get_data())
+        respuesta.headers['X-Cache'] = 'MISS'
+        return respuesta_con_etag(respuesta, etag)
+
+    async def usar_cache(self, operacion, *argumentos):
+        """
+        Llama a obtener o guardar de la cache de respuestas
+
+        La cache en memoria responde al instante; la de SQLite lee y escribe
+        un archivo (y puede esperar su lock), así que se usa desde un hilo
+        para no detener el bucle de eventos.
+        """
+        cache = cache_respuestas._get_current_object()
+        metodo = getattr(cache, operacion)
+        if cache.bloqueante:
+            return await asyncio.to_thread(metodo, *argumentos)
+        return metodo(*argumentos)
+
+    async def leer_tarea(self, usuario_id, tarea_id):
+        """
+        Versión asíncrona de GET /tareas/<id> (ver obtener_tarea en app.py)
+        """
+        campos, error = leer_campos()
+        if error:
+            return jsonify({"error": error}), 400
+
+        async with self.sesiones() as sesion:
+            contador = await sesion.get(ContadorTareas, usuario_id)
+            if contador is None:
+                return None
+
+            etag = etag_tareas(usuario_id, contador.version)
+            respuesta_304 = no_modificado(etag)
+            if respuesta_304:
+                return respuesta_304
+
+            resultado = await sesion.execute(
+                select(*columnas_campos(campos)).where(Tarea.id == tarea_id, Tarea.usuario_id == usuario_id)
+            )
+            tarea = resultado.first()
+
+        if not tarea:
+            return jsonify({"error": "Tarea no encontrada"}), 404
+
+        return respuesta_con_etag(jsonify({"tarea": serializador_tareas(campos)(tarea)}), etag)
+
+
+def crear_app_asgi(config=None):
+    """
+    Crea la aplicación ASGI (ver create_app para 'config')
+    """
+    return AplicacionAsgi(create_app(config))
+
+
+if __name__ == '__main__':
+    # Servidor ASGI de desarrollo (un solo proceso)
+    import uvicorn
+    app = create_app()
+    preparar_base_de_datos(app)
+    port = int(os.environ.get('PORT', 5000))
+    uvicorn.run(AplicacionAsgi(app), host='0.0.0.0', port=port)
@@ -0,0 +1,86 @@
+# benchmark_serializacion.py
+import os
+import sys
+import tempfile
+import time
+
+# Uso: python benchmark_serializacion.py [tareas_por_pagina] [repeticiones]
+# Compara las formas de leer y serializar una página de GET /tareas:
+# - to_dict: objetos Tarea del ORM, to_dict() y el JSON de Flask (como antes)
+# - filas: filas (tuplas) con serializador_tareas y el JSON de Flask
+# - filas + orjson: lo mismo con ProveedorOrjson (si orjson está instalado)
+
+def preparar(ruta, cantidad):
+    """Crea la base de datos con un usuario y 'cantidad' tareas"""
+    from app import create_app, preparar_base_de_datos
+    from models import db, Usuario, Tarea, ContadorTareas
+
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{ruta}'})
+    preparar_base_de_datos(app)
+    with app.app_context():
+        usuario = Usuario(username="bench", email="bench@ejemplo.com")
+        usuario.password_hash = "sin-login"
+        db.session.add(usuario)
+        db.session.flush()
+        db.session.add(ContadorTareas(usuario_id=usuario.id, total=cantidad, pendientes=cantidad))
+        db.session.add_all([
+            Tarea(titulo=f"Tarea {numero}", descripcion="Descripción de prueba " * 5, usuario_id=usuario.id)
+            for numero in range(cantidad)
+        ])
+        db.session.commit()
+        usuario_id = usuario.id
+        db.engine.dispose()
+    return usuario_id
+
+def medir(nombre, funcion, repeticiones):
+    """Ejecuta 'funcion' varias veces y muestra el tiempo por página"""
+    funcion()
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        tamano = len(funcion())
+    milisegundos = (time.perf_counter() - inicio) / repeticiones * 1000
+    print(f"📊 {nombre}: {milisegundos:.2f} ms por página ({tamano} bytes)")
+    return milisegundos
+
+def comparar(ruta, usuario_id, limite, repeticiones):
+    from flask.json.provider import DefaultJSONProvider
+    from app import create_app, CAMPOS_TAREA, columnas_campos, serializador_tareas
+    from models import Tarea
+    from proveedor_json import ProveedorOrjson, orjson
+
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{ruta}'})
+    json_flask = DefaultJSONProvider(app)
+
+    def consulta():
+        return Tarea.query.filter_by(usuario_id=usuario_id).order_by(Tarea.fecha_creacion.desc(), Tarea.id.desc()).limit(limite)
+
+    def con_to_dict():
+        tareas = consulta().all()
+        return json_flask.response({"tareas": [tarea.to_dict() for tarea in tareas]}).get_data()
+
+    def con_filas(proveedor):
+        def leer():
+            filas = consulta().with_entities(*columnas_campos(CAMPOS_TAREA)).all()
+            return proveedor.response({"tareas": list(map(serializador_tareas(CAMPOS_TAREA), filas))}).get_data()
+        return leer
+
+    with app.app_context():
+        base = medir("to_dict", con_to_dict, repeticiones)
+        filas = medir("filas", con_filas(json_flask), repeticiones)
+        print(f"   {base / filas:.1f}x más rápido que to_dict")
+        if orjson is not None:
+            rapido = medir("filas + orjson", con_filas(ProveedorOrjson(app)), repeticiones)
+            print(f"   {base / rapido:.1f}x más rápido que to_dict")
+        else:
+            print("⚠️ orjson no está instalado: se omite 'filas + orjson'")
+
+if __name__ == "__main__":
+    limite = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    repeticiones = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    print(f"🚀 Benchmark de serialización: páginas de {limite} tareas x {repeticiones} repeticiones")
+    print("=" * 50)
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "benchmark.db")
+        usuario_id = preparar(ruta, limite)
+        comparar(ruta, usuario_id, limite, repeticiones)
@@ -0,0 +1,110 @@
+# benchmark_sqlite.py
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+# Uso: python benchmark_sqlite.py [procesos] [operaciones_por_proceso]
+# Compara la API con el perfil de SQLite activado y desactivado: varios
+# procesos (como los workers de gunicorn) leen y escriben tareas a la vez
+# sobre el mismo archivo. Cada quinta operación es una escritura.
+
+def trabajador(ruta, perfil, usuario_id, operaciones, resultados):
+    """Ejecuta operaciones contra la API y devuelve sus latencias"""
+    from flask_jwt_extended import create_access_token
+    from app import create_app
+
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{ruta}',
+        'SQLITE_PERFIL': perfil,
+        'CACHE_TIPO': 'ninguno'
+    })
+    with app.app_context():
+        token = create_access_token(identity=str(usuario_id))
+    headers = {"Authorization": f"Bearer {token}"}
+    cliente = app.test_client()
+
+    latencias = []
+    errores = 0
+    for numero in range(operaciones):
+        inicio = time.perf_counter()
+        if numero % 5 == 0:
+            respuesta = cliente.post("/tareas", headers=headers, json={
+                "titulo": f"Tarea {numero}",
+                "descripcion": "Creada por el benchmark"
+            })
+        else:
+            respuesta = cliente.get("/tareas?limite=20", headers=headers)
+        latencias.append(time.perf_counter() - inicio)
+        if respuesta.status_code >= 500:
+            errores += 1
+
+    resultados.put((latencias, errores))
+
+def preparar(ruta, procesos, perfil):
+    """
+    Crea la base de datos con un usuario por proceso
+
+    Se crea con el mismo perfil que se va a medir: journal_mode=WAL queda
+    guardado en el archivo, y una base creada con el perfil seguiría en WAL
+    aunque después se abra sin él.
+    """
+    from app import create_app, preparar_base_de_datos
+    from models import db, Usuario, ContadorTareas
+
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{ruta}', 'SQLITE_PERFIL': perfil})
+    preparar_base_de_datos(app)
+    with app.app_context():
+        ids = []
+        for numero in range(procesos):
+            usuario = Usuario(username=f"bench{numero}", email=f"bench{numero}@ejemplo.com")
+            usuario.password_hash = "sin-login"
+            db.session.add(usuario)
+            db.session.flush()
+            db.session.add(ContadorTareas(usuario_id=usuario.id))
+            ids.append(usuario.id)
+        db.session.commit()
+        db.engine.dispose()
+    return ids
+
+def medir(perfil, procesos, operaciones):
+    """Corre el benchmark en un archivo nuevo y muestra los resultados"""
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "benchmark.db")
+        ids = preparar(ruta, procesos, perfil)
+
+        resultados = multiprocessing.Queue()
+        trabajadores = [
+            multiprocessing.Process(
+                target=trabajador,
+                args=(ruta, perfil, usuario_id, operaciones, resultados)
+            )
+            for usuario_id in ids
+        ]
+
+        inicio = time.perf_counter()
+        for proceso in trabajadores:
+            proceso.start()
+        medidas = [resultados.get() for _ in trabajadores]
+        for proceso in trabajadores:
+            proceso.join()
+        duracion = time.perf_counter() - inicio
+
+    latencias = sorted(latencia for lista, _ in medidas for latencia in lista)
+    errores = sum(errores for _, errores in medidas)
+    p50 = latencias[len(latencias) // 2] * 1000
+    p95 = latencias[int(len(latencias) * 0.95)] * 1000
+
+    nombre = "con perfil" if perfil else "sin perfil"
+    print(f"📊 {nombre}: {len(latencias) / duracion:.0f} ops/s, "
+          f"p50 {p50:.1f} ms, p95 {p95:.1f} ms, errores {errores}")
+
+if __name__ == "__main__":
+    procesos = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    operaciones = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    print(f"🚀 Benchmark de SQLite: {procesos} procesos x {operaciones} operaciones")
+    print("=" * 50)
+    medir(False, procesos, operaciones)
+    medir(True, procesos, operaciones)
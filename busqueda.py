@@ -0,0 +1,151 @@
+# busqueda.py
+import re
+from sqlalchemy import column, literal_column, or_, select, table
+from sqlalchemy.exc import OperationalError
+from models import Tarea
+
+# Tabla virtual FTS5 con el índice de texto completo de las tareas
+# (no se declara en los modelos porque db.create_all() no sabe crear
+# tablas virtuales; se crea en crear_indice_busqueda)
+tareas_fts = table('tareas_fts', column('rowid'), column('rank'))
+
+# Índice de "contenido externo": guarda solo los tokens y lee el texto de
+# la tabla tareas. unicode61 + remove_diacritics hace que la búsqueda no
+# distinga mayúsculas ni tildes ("cancion" encuentra "Canción")
+SQL_CREAR_INDICE = """
+CREATE VIRTUAL TABLE tareas_fts USING fts5(
+    titulo, descripcion,
+    content='tareas', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+)
+"""
+
+# Triggers que mantienen el índice sincronizado dentro de la misma
+# transacción que modifica la tabla tareas
+SQL_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS tareas_fts_insertar AFTER INSERT ON tareas BEGIN
+        INSERT INTO tareas_fts(rowid, titulo, descripcion)
+        VALUES (new.id, new.titulo, new.descripcion);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tareas_fts_eliminar AFTER DELETE ON tareas BEGIN
+        INSERT INTO tareas_fts(tareas_fts, rowid, titulo, descripcion)
+        VALUES ('delete', old.id, old.titulo, old.descripcion);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tareas_fts_actualizar AFTER UPDATE OF titulo, descripcion ON tareas BEGIN
+        INSERT INTO tareas_fts(tareas_fts, rowid, titulo, descripcion)
+        VALUES ('delete', old.id, old.titulo, old.descripcion);
+        INSERT INTO tareas_fts(rowid, titulo, descripcion)
+        VALUES (new.id, new.titulo, new.descripcion);
+    END
+    """
+]
+
+def crear_indice_busqueda(engine):
+    """
+    Crea (si no existe) el índice FTS5 de tareas y sus triggers
+
+    Si el índice se crea sobre una base de datos que ya tenía tareas,
+    se reconstruye a partir de la tabla tareas.
+
+    Parámetros:
+    - engine: engine de SQLAlchemy de la aplicación
+
+    Retorna:
+    - True si la búsqueda de texto completo quedó disponible
+    - False si la base de datos no es SQLite o no tiene FTS5
+    """
+    if engine.dialect.name != 'sqlite':
+        return False
+
+    try:
+        with engine.begin() as conexion:
+            existe = conexion.exec_driver_sql(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tareas_fts'"
+            ).first()
+
+            if not existe:
+                conexion.exec_driver_sql(SQL_CREAR_INDICE)
+                # Indexar las tareas que ya existían
+                conexion.exec_driver_sql("INSERT INTO tareas_fts(tareas_fts) VALUES ('rebuild')")
+
+            for sql in SQL_TRIGGERS:
+                conexion.exec_driver_sql(sql)
+    except OperationalError:
+        # SQLite compilado sin FTS5 ("no such module: fts5")
+        return False
+
+    return True
+
+def existe_indice_busqueda(engine):
+    """
+    True si la base de datos tiene el índice FTS5 de tareas
+    
+    Parámetros:
+    - engine: engine de SQLAlchemy de la aplicación
+    """
+    if engine.dialect.name != 'sqlite':
+        return False
+    
+    with engine.connect() as conexion:
+        return conexion.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tareas_fts'"
+        ).first() is not None
+
+def construir_consulta_fts(busqueda):
+    """
+    Convierte el texto de búsqueda del usuario en una consulta FTS5
+
+    Cada palabra se busca como prefijo ("pyth" encuentra "Python") y
+    todas las palabras deben aparecer. Las palabras se escriben entre
+    comillas para que la sintaxis de FTS5 (AND, OR, NEAR, *, etc.) que
+    escriba el usuario se trate como texto normal.
+
+    Retorna:
+    - texto de la consulta MATCH
+    - None si la búsqueda no contiene ninguna palabra
+    """
+    palabras = re.findall(r'\w+', busqueda)
+    if not palabras:
+        return None
+    return ' '.join(f'"{palabra}"*' for palabra in palabras)
+
+def filtro_busqueda(busqueda, consulta_fts):
+    """
+    Condición de búsqueda sobre título y descripción
+
+    Usa el índice FTS5 cuando hay una consulta de texto completo y, si no,
+    la búsqueda por subcadena con ILIKE.
+
+    Parámetros:
+    - busqueda: texto tal como lo envió el usuario
+    - consulta_fts: resultado de construir_consulta_fts, o None
+    """
+    if consulta_fts:
+        coincidencias = select(tareas_fts.c.rowid).where(
+            literal_column('tareas_fts').op('MATCH')(consulta_fts)
+        )
+        return Tarea.id.in_(coincidencias)
+
+    return or_(
+        Tarea.titulo.ilike(f'%{busqueda}%'),
+        Tarea.descripcion.ilike(f'%{busqueda}%')
+    )
+
+def subconsulta_relevancia(consulta_fts):
+    """
+    Subconsulta con el id de cada tarea que coincide y su relevancia
+
+    La columna 'rank' de FTS5 es el puntaje bm25: cuanto menor, más
+    relevante es la tarea.
+    """
+    return select(
+        tareas_fts.c.rowid.label('id'),
+        tareas_fts.c.rank.label('rango')
+    ).where(
+        literal_column('tareas_fts').op('MATCH')(consulta_fts)
+    ).subquery('relevancia')
@@ -0,0 +1,284 @@
+# cache_respuestas.py
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+# Lecturas de CacheSQLite cuyo uso se anota en memoria antes de escribirlo
+# en el archivo (también se escribe con cada guardar)
+USOS_PENDIENTES_MAXIMO = 256
+
+
+class CacheRespuestas(ABC):
+    """
+    Interfaz común de los almacenes de respuestas cacheadas
+
+    Cada entrada pertenece a un usuario, así todas las respuestas de un
+    usuario se pueden invalidar juntas cuando cambian sus tareas. Las
+    entradas vencen después de 'ttl' segundos y, si se supera 'maximo'
+    entradas, se descartan las usadas hace más tiempo (LRU).
+    """
+
+    # True si obtener y guardar esperan E/S (los servidores asíncronos los
+    # llaman desde un hilo para no bloquear el bucle de eventos)
+    bloqueante = False
+
+    def __init__(self, maximo=1000, ttl=60):
+        self.maximo = maximo
+        self.ttl = ttl
+        self.aciertos = 0
+        self.fallos = 0
+        # Protege los contadores (y los datos en memoria de cada almacén)
+        self._bloqueo = threading.Lock()
+
+    def obtener(self, usuario_id, clave):
+        """
+        Devuelve la respuesta guardada (bytes) o None si no está o venció
+        """
+        valor = self._leer(usuario_id, clave)
+        with self._bloqueo:
+            if valor is None:
+                self.fallos += 1
+            else:
+                self.aciertos += 1
+        return valor
+
+    @abstractmethod
+    def guardar(self, usuario_id, clave, valor):
+        """
+        Guarda una respuesta (bytes) para el usuario
+        """
+
+    @abstractmethod
+    def invalidar(self, usuario_id):
+        """
+        Descarta todas las respuestas guardadas del usuario
+        """
+
+    def estadisticas(self):
+        """
+        Contadores de aciertos y fallos de este proceso
+        """
+        with self._bloqueo:
+            aciertos, fallos = self.aciertos, self.fallos
+        consultas = aciertos + fallos
+        return {
+            'tipo': self.tipo,
+            'aciertos': aciertos,
+            'fallos': fallos,
+            'tasa_aciertos': round(aciertos / consultas, 4) if consultas else 0.0
+        }
+
+    @abstractmethod
+    def _leer(self, usuario_id, clave):
+        """
+        Devuelve la respuesta guardada (bytes) o None, sin contar aciertos ni fallos
+        """
+
+
+class CacheMemoria(CacheRespuestas):
+    """
+    Cache en la memoria del proceso (cada worker tiene la suya)
+    """
+
+    tipo = 'memoria'
+
+    def __init__(self, maximo=1000, ttl=60):
+        super().__init__(maximo, ttl)
+        self._entradas = OrderedDict()
+        self._claves_por_usuario = {}
+
+    def _leer(self, usuario_id, clave):
+        with self._bloqueo:
+            entrada = self._entradas.get((usuario_id, clave))
+            if entrada is None:
+                return None
+
+            expira, valor = entrada
+            if expira < time.monotonic():
+                self._quitar((usuario_id, clave))
+                return None
+
+            # Marcar como usada recientemente
+            self._entradas.move_to_end((usuario_id, clave))
+            return valor
+
+    def guardar(self, usuario_id, clave, valor):
+        with self._bloqueo:
+            self._entradas[(usuario_id, clave)] = (time.monotonic() + self.ttl, valor)
+            self._entradas.move_to_end((usuario_id, clave))
+            self._claves_por_usuario.setdefault(usuario_id, set()).add(clave)
+
+            # Descartar las entradas usadas hace más tiempo
+            while len(self._entradas) > self.maximo:
+                mas_antigua = next(iter(self._entradas))
+                self._quitar(mas_antigua)
+
+    def invalidar(self, usuario_id):
+        with self._bloqueo:
+            for clave in self._claves_por_usuario.pop(usuario_id, ()):
+                self._entradas.pop((usuario_id, clave), None)
+
+    def _quitar(self, llave):
+        usuario_id, clave = llave
+        self._entradas.pop(llave, None)
+        claves = self._claves_por_usuario.get(usuario_id)
+        if claves is not None:
+            claves.discard(clave)
+            if not claves:
+                del self._claves_por_usuario[usuario_id]
+
+
+class CacheSQLite(CacheRespuestas):
+    """
+    Cache en un archivo SQLite local, compartida por todos los workers
+    de la misma máquina
+
+    Una lectura no escribe en el archivo: el momento de uso de cada entrada
+    (para descartar las usadas hace más tiempo) se anota en memoria y se
+    escribe junto con el próximo guardar, o cuando se juntan
+    USOS_PENDIENTES_MAXIMO lecturas. Así los aciertos no esperan el lock de
+    escritura de SQLite.
+    """
+
+    tipo = 'sqlite'
+    bloqueante = True
+
+    def __init__(self, ruta, maximo=1000, ttl=60):
+        super().__init__(maximo, ttl)
+        self.ruta = ruta
+        self._local = threading.local()
+        # (usuario_id, clave) -> momento de la última lectura no escrita
+        self._usos_pendientes = {}
+
+        directorio = os.path.dirname(ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+
+        conexion = self._conexion()
+        conexion.execute(
+            'CREATE TABLE IF NOT EXISTS respuestas ('
+            ' usuario_id INTEGER NOT NULL,'
+            ' clave TEXT NOT NULL,'
+            ' valor BLOB NOT NULL,'
+            ' expira REAL NOT NULL,'
+            ' usado REAL NOT NULL,'
+            ' PRIMARY KEY (usuario_id, clave))'
+        )
+        conexion.execute('CREATE INDEX IF NOT EXISTS ix_respuestas_usado ON respuestas (usado)')
+
+    def _conexion(self):
+        # sqlite3 no permite compartir una conexión entre hilos
+        conexion = getattr(self._local, 'conexion', None)
+        if conexion is None:
+            conexion = sqlite3.connect(self.ruta, timeout=5, isolation_level=None)
+            conexion.execute('PRAGMA journal_mode=WAL')
+            conexion.execute('PRAGMA synchronous=NORMAL')
+            self._local.conexion = conexion
+        return conexion
+
+    def _leer(self, usuario_id, clave):
+        conexion = self._conexion()
+        fila = conexion.execute(
+            'SELECT valor, expira FROM respuestas WHERE usuario_id = ? AND clave = ?',
+            (usuario_id, clave)
+        ).fetchone()
+        if fila is None:
+            return None
+
+        valor, expira = fila
+        ahora = time.time()
+        if expira < ahora:
+            conexion.execute(
+                'DELETE FROM respuestas WHERE usuario_id = ? AND clave = ?',
+                (usuario_id, clave)
+            )
+            return None
+
+        # Marcar como usada recientemente (se escribe más tarde)
+        with self._bloqueo:
+            self._usos_pendientes[(usuario_id, clave)] = ahora
+            escribir = len(self._usos_pendientes) >= USOS_PENDIENTES_MAXIMO
+        if escribir:
+            with conexion:
+                conexion.execute('BEGIN')
+                self._escribir_usos(conexion)
+        return valor
+
+    def _escribir_usos(self, conexion):
+        with self._bloqueo:
+            usos, self._usos_pendientes = self._usos_pendientes, {}
+        conexion.executemany(
+            'UPDATE respuestas SET usado = ? WHERE usuario_id = ? AND clave = ?',
+            [(usado, usuario_id, clave) for (usuario_id, clave), usado in usos.items()]
+        )
+
+    def guardar(self, usuario_id, clave, valor):
+        conexion = self._conexion()
+        ahora = time.time()
+        # Una sola transacción (si algo falla, 'with' la deshace)
+        with conexion:
+            conexion.execute('BEGIN')
+            # Antes de descartar, registrar qué entradas se leyeron
+            self._escribir_usos(conexion)
+            conexion.execute(
+                'INSERT OR REPLACE INTO respuestas (usuario_id, clave, valor, expira, usado)'
+                ' VALUES (?, ?, ?, ?, ?)',
+                (usuario_id, clave, valor, ahora + self.ttl, ahora)
+            )
+            # Descartar las entradas usadas hace más tiempo
+            conexion.execute(
+                'DELETE FROM respuestas WHERE rowid IN ('
+                ' SELECT rowid FROM respuestas ORDER BY usado DESC LIMIT -1 OFFSET ?)',
+                (self.maximo,)
+            )
+
+    def invalidar(self, usuario_id):
+        self._conexion().execute('DELETE FROM respuestas WHERE usuario_id = ?', (usuario_id,))
+
+
+class SinCache(CacheRespuestas):
+    """
+    Cache desactivada: nunca guarda nada
+    """
+
+    tipo = 'ninguno'
+
+    def _leer(self, usuario_id, clave):
+        return None
+
+    def guardar(self, usuario_id, clave, valor):
+        pass
+
+    def invalidar(self, usuario_id):
+        pass
+
+
+def crear_cache(config, directorio_instancia):
+    """
+    Crea el almacén de respuestas indicado en la configuración
+
+    Parámetros:
+    - config: configuración de la aplicación (CACHE_TIPO, CACHE_MAXIMO_ENTRADAS,
+      CACHE_TTL y CACHE_RUTA)
+    - directorio_instancia: carpeta donde crear el archivo de la cache SQLite
+      si CACHE_RUTA no indica otro
+
+    Retorna:
+    - instancia de CacheMemoria, CacheSQLite o SinCache
+    """
+    tipo = config['CACHE_TIPO']
+    maximo = config['CACHE_MAXIMO_ENTRADAS']
+    ttl = config['CACHE_TTL']
+
+    if tipo == 'memoria':
+        return CacheMemoria(maximo, ttl)
+    if tipo == 'sqlite':
+        ruta = config['CACHE_RUTA'] or os.path.join(directorio_instancia, 'cache_respuestas.db')
+        return CacheSQLite(ruta, maximo, ttl)
+    if tipo == 'ninguno':
+        return SinCache()
+
+    raise ValueError(f"CACHE_TIPO desconocido: {tipo}")
@@ -0,0 +1,109 @@
+# compresion.py
+import gzip
+import os
+import zlib
+
+# Codificaciones que sabe generar la API, en orden de preferencia
+CODIFICACIONES = ('gzip', 'deflate')
+
+# Tipos de contenido que vale la pena comprimir (las imágenes ya vienen comprimidas)
+TIPOS_COMPRIMIBLES = (
+    'application/json',
+    'application/x-ndjson',
+    'application/javascript',
+    'text/javascript',
+    'text/html',
+    'text/css',
+    'text/csv',
+    'text/plain',
+    'image/svg+xml'
+)
+
+# Extensión de los archivos precomprimidos de cada codificación
+EXTENSIONES = {'gzip': '.gz'}
+
+
+def comprimir(datos, codificacion, nivel=6):
+    """
+    Comprime bytes con gzip o deflate
+
+    Parámetros:
+    - datos: bytes a comprimir
+    - codificacion: 'gzip' o 'deflate' (formato zlib, el que usa HTTP)
+    - nivel: de 1 (más rápido) a 9 (más chico)
+    """
+    if codificacion == 'gzip':
+        # mtime=0: el mismo contenido siempre da los mismos bytes
+        return gzip.compress(datos, compresslevel=nivel, mtime=0)
+    if codificacion == 'deflate':
+        return zlib.compress(datos, nivel)
+    raise ValueError(f"Codificación desconocida: {codificacion}")
+
+
+def comprimir_respuesta(respuesta, codificaciones_aceptadas, minimo=1024, nivel=6):
+    """
+    Comprime el cuerpo de una respuesta si el cliente lo acepta y vale la pena
+
+    No se comprimen las respuestas sin cuerpo (como 304), las que se envían
+    por partes (streaming), las que ya vienen comprimidas ni las más chicas
+    que 'minimo': en esas la compresión cuesta más de lo que ahorra.
+
+    Parámetros:
+    - respuesta: respuesta de Flask
+    - codificaciones_aceptadas: header Accept-Encoding (request.accept_encodings)
+    - minimo: tamaño en bytes a partir del cual se comprime
+    - nivel: nivel de compresión, de 1 a 9
+
+    Retorna:
+    - la misma respuesta, comprimida o no
+    """
+    if (respuesta.mimetype not in TIPOS_COMPRIMIBLES
+            or respuesta.direct_passthrough
+            or respuesta.is_streamed
+            or 'Content-Encoding' in respuesta.headers):
+        return respuesta
+
+    # La respuesta depende de Accept-Encoding aunque esta vez no se comprima
+    respuesta.vary.add('Accept-Encoding')
+
+    if respuesta.status_code < 200 or respuesta.status_code in (204, 206, 304):
+        return respuesta
+
+    codificacion = codificaciones_aceptadas.best_match(CODIFICACIONES)
+    if codificacion is None:
+        return respuesta
+
+    datos = respuesta.get_data()
+    if len(datos) < minimo:
+        return respuesta
+
+    comprimidos = comprimir(datos, codificacion, nivel)
+    if len(comprimidos) >= len(datos):
+        return respuesta
+
+    respuesta.set_data(comprimidos)
+    respuesta.headers['Content-Encoding'] = codificacion
+    return respuesta
+
+
+def precomprimir_archivo(ruta, codificacion='gzip', nivel=9):
+    """
+    Guarda junto al archivo su versión comprimida (por ejemplo styles.css.gz)
+
+    Como se hace una sola vez, usa el nivel más alto por defecto.
+
+    Retorna:
+    - tupla (ruta del archivo comprimido, bytes originales, bytes comprimidos)
+    """
+    with open(ruta, 'rb') as archivo:
+        datos = archivo.read()
+
+    comprimidos = comprimir(datos, codificacion, nivel)
+    ruta_comprimida = ruta + EXTENSIONES[codificacion]
+    with open(ruta_comprimida, 'wb') as archivo:
+        archivo.write(comprimidos)
+
+    # Misma fecha que el original: así se detecta si quedó desactualizado
+    estado = os.stat(ruta)
+    os.utime(ruta_comprimida, ns=(estado.st_atime_ns, estado.st_mtime_ns))
+    return ruta_comprimida, len(datos), len(comprimidos)
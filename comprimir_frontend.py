@@ -0,0 +1,31 @@
+# comprimir_frontend.py
+import os
+import sys
+from compresion import precomprimir_archivo
+
+# Uso: python comprimir_frontend.py [carpeta]
+# Paso de build: guarda la versión gzip de cada archivo del frontend
+# (index.html.gz, script.js.gz, styles.css.gz) para que el servidor los
+# envíe ya comprimidos en vez de comprimirlos en cada petición.
+
+ARCHIVOS_FRONTEND = ['index.html', 'script.js', 'styles.css']
+
+def comprimir_frontend(carpeta):
+    """Precomprime los archivos del frontend y muestra cuánto se ahorró"""
+    for nombre in ARCHIVOS_FRONTEND:
+        ruta = os.path.join(carpeta, nombre)
+        if not os.path.exists(ruta):
+            print(f"⚠️ {nombre} no existe, se omite")
+            continue
+
+        ruta_comprimida, original, comprimido = precomprimir_archivo(ruta)
+        print(f"📦 {os.path.basename(ruta_comprimida)}: {original} → {comprimido} bytes "
+              f"({100 - comprimido * 100 // original}% menos)")
+
+if __name__ == "__main__":
+    carpeta = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)), 'frontend')
+
+    print(f"🚀 Comprimiendo el frontend en {carpeta}")
+    print("=" * 50)
+    comprimir_frontend(carpeta)
+    print("✅ Frontend comprimido")
@@ -0,0 +1,123 @@
+# contrasenas.py
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from werkzeug.security import generate_password_hash
+
+
+class ServicioSaturado(Exception):
+    """
+    Se lanza cuando el pool de hashing no admite más trabajos en espera
+
+    La aplicación la convierte en una respuesta 503 con Retry-After.
+    """
+
+    def __init__(self, reintentar_en):
+        super().__init__("El servicio de contraseñas está saturado")
+        self.reintentar_en = reintentar_en
+
+
+class PoolHash:
+    """
+    Pool de hilos dedicado a calcular y verificar hashes de contraseñas
+
+    El hash de contraseñas es lento a propósito. Limitar cuántos se calculan
+    a la vez evita que una ola de logins ocupe toda la CPU. Limitar la cola
+    evita que las peticiones se acumulen esperando: si está llena se
+    rechazan enseguida y el cliente puede reintentar más tarde.
+    hashlib libera el GIL mientras calcula, así que los hilos del pool
+    trabajan en paralelo de verdad.
+    """
+
+    def __init__(self, hilos=2, cola_maxima=16, reintentar_en=1):
+        self.hilos = hilos
+        self.cola_maxima = cola_maxima
+        self.reintentar_en = reintentar_en
+        self._ejecutor = ThreadPoolExecutor(max_workers=hilos, thread_name_prefix='hash')
+        self._cupos = threading.BoundedSemaphore(hilos + cola_maxima)
+        self._bloqueo = threading.Lock()
+
+        # Métricas
+        self.en_curso = 0
+        self.operaciones = 0
+        self.rechazadas = 0
+        self.latencia_total = 0.0
+        self.latencia_maxima = 0.0
+        self.espera_total = 0.0
+
+    def ejecutar(self, funcion, *args):
+        """
+        Ejecuta funcion(*args) en el pool y espera su resultado
+
+        Lanza ServicioSaturado si ya hay 'hilos + cola_maxima' trabajos.
+        """
+        if not self._cupos.acquire(blocking=False):
+            with self._bloqueo:
+                self.rechazadas += 1
+            raise ServicioSaturado(self.reintentar_en)
+
+        with self._bloqueo:
+            self.en_curso += 1
+        encolado = time.perf_counter()
+
+        def tarea():
+            inicio = time.perf_counter()
+            try:
+                return funcion(*args)
+            finally:
+                fin = time.perf_counter()
+                with self._bloqueo:
+                    self.operaciones += 1
+                    self.latencia_total += fin - inicio
+                    self.latencia_maxima = max(self.latencia_maxima, fin - inicio)
+                    self.espera_total += inicio - encolado
+
+        try:
+            return self._ejecutor.submit(tarea).result()
+        finally:
+            with self._bloqueo:
+                self.en_curso -= 1
+            self._cupos.release()
+
+    def estadisticas(self):
+        """
+        Métricas del pool: trabajos en curso y en cola, latencia del hash
+        y espera en la cola (en segundos)
+
+        Además de los promedios incluye las sumas (latencia_total y
+        espera_total), que se pueden sumar entre procesos.
+        """
+        with self._bloqueo:
+            return {
+                'hilos': self.hilos,
+                'en_curso': self.en_curso,
+                'en_cola': max(0, self.en_curso - self.hilos),
+                'cola_maxima': self.cola_maxima,
+                'operaciones': self.operaciones,
+                'rechazadas': self.rechazadas,
+                'latencia_total': self.latencia_total,
+                'latencia_promedio': self.latencia_total / self.operaciones if self.operaciones else 0.0,
+                'latencia_maxima': self.latencia_maxima,
+                'espera_total': self.espera_total,
+                'espera_promedio': self.espera_total / self.operaciones if self.operaciones else 0.0
+            }
+
+
+@lru_cache(maxsize=8)
+def metodo_completo(metodo):
+    """
+    Parámetros completos de un método de hash de werkzeug
+
+    'scrypt' se guarda como 'scrypt:32768:8:1' y 'pbkdf2' como
+    'pbkdf2:sha256:<iteraciones>'; para comparar con un hash guardado hay
+    que conocer los valores por defecto de la versión instalada.
+    """
+    return generate_password_hash('', method=metodo).split('$', 1)[0]
+
+
+def hash_desactualizado(password_hash, metodo):
+    """
+    True si el hash guardado se calculó con otros parámetros que 'metodo'
+    """
+    return password_hash.split('$', 1)[0] != metodo_completo(metodo)
@@ -0,0 +1,159 @@
+# disponibilidad.py
+import hashlib
+import math
+import threading
+import time
+
+
+class FiltroBloom:
+    """
+    Filtro de Bloom: conjunto aproximado que ocupa pocos bytes
+
+    Si dice que un valor NO está, seguro que no está. Si dice que está,
+    puede equivocarse con probabilidad 'error' (falso positivo) mientras
+    no se superen 'capacidad' valores.
+    """
+
+    def __init__(self, capacidad=100000, error=0.01):
+        self.capacidad = max(capacidad, 1)
+        self.error = error
+        self.cantidad = 0
+
+        # Tamaño óptimo en bits y cantidad de funciones de hash
+        self.bits = max(8, int(-self.capacidad * math.log(error) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.bits / self.capacidad * math.log(2)))
+        self._datos = bytearray((self.bits + 7) // 8)
+
+    def _posiciones(self, valor):
+        # Doble hashing: k posiciones a partir de dos hashes de 64 bits
+        resumen = hashlib.blake2b(valor.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(resumen[:8], 'little')
+        h2 = int.from_bytes(resumen[8:], 'little') | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def agregar(self, valor):
+        for posicion in self._posiciones(valor):
+            self._datos[posicion >> 3] |= 1 << (posicion & 7)
+        self.cantidad += 1
+
+    def __contains__(self, valor):
+        return all(
+            self._datos[posicion >> 3] & (1 << (posicion & 7))
+            for posicion in self._posiciones(valor)
+        )
+
+
+class FiltroUsuarios:
+    """
+    Filtros de Bloom con los usernames y emails registrados
+
+    Se cargan al iniciar desde la tabla usuarios y se actualizan con cada
+    registro. Si el filtro dice que un valor no está, está disponible sin
+    consultar la base de datos; si dice que está, hay que confirmarlo.
+
+    Cada proceso tiene sus propios filtros: para enterarse de los registros
+    hechos por otros workers, cada 'refresco' segundos se leen solo los
+    usuarios con id mayor al último conocido. Mientras tanto la respuesta
+    puede estar desactualizada, pero /registro igual la valida con las
+    restricciones UNIQUE de la base de datos.
+
+    Las consultas (username in filtro.usernames) no toman el lock: cuando
+    hay que rehacer los filtros, los nuevos se llenan aparte y reemplazan a
+    los anteriores de una sola vez, así nunca se consulta un filtro a medio
+    cargar.
+    """
+
+    def __init__(self, capacidad=100000, error=0.01, refresco=5):
+        self.capacidad = capacidad
+        self.error = error
+        self.refresco = refresco
+        self.ultimo_id = 0
+        self.cargado = False
+        self._ultima_lectura = 0.0
+        self._bloqueo = threading.Lock()
+        # ids agregados por este proceso que todavía no se leyeron de la
+        # base de datos: al leerlos no se vuelven a contar
+        self._agregados = set()
+        # (usernames, emails) en una sola tupla para reemplazarlos juntos
+        self._filtros = self._nuevos_filtros(capacidad)
+
+    def _nuevos_filtros(self, capacidad):
+        return FiltroBloom(capacidad, self.error), FiltroBloom(capacidad, self.error)
+
+    @property
+    def usernames(self):
+        return self._filtros[0]
+
+    @property
+    def emails(self):
+        return self._filtros[1]
+
+    def _leer_usuarios(self, session, modelo, filtros, desde_id):
+        """
+        Agrega a 'filtros' los usuarios con id mayor a 'desde_id'
+
+        Retorna:
+        - el id más alto leído (o 'desde_id' si no hay usuarios nuevos)
+        """
+        usernames, emails = filtros
+        filas = session.query(modelo.id, modelo.username, modelo.email).filter(
+            modelo.id > desde_id
+        ).order_by(modelo.id).yield_per(1000)
+
+        ultimo_id = desde_id
+        for usuario_id, username, email in filas:
+            if usuario_id in self._agregados:
+                self._agregados.discard(usuario_id)
+            else:
+                usernames.agregar(username)
+                emails.agregar(email)
+            ultimo_id = usuario_id
+        return ultimo_id
+
+    def cargar(self, session, modelo):
+        """
+        Lee de la base de datos los usuarios que el filtro todavía no conoce
+
+        Parámetros:
+        - session: sesión de SQLAlchemy
+        - modelo: modelo Usuario (con id, username y email)
+        """
+        with self._bloqueo:
+            # Si se superó la capacidad, rehacer los filtros más grandes
+            # para que no aumenten los falsos positivos. Los nuevos se llenan
+            # aparte: mientras tanto se siguen consultando los anteriores
+            if self.usernames.cantidad >= self.capacidad:
+                self.capacidad *= 2
+                filtros = self._nuevos_filtros(self.capacidad)
+                self._agregados.clear()
+                self.ultimo_id = self._leer_usuarios(session, modelo, filtros, 0)
+                self._filtros = filtros
+            else:
+                self.ultimo_id = self._leer_usuarios(session, modelo, self._filtros, self.ultimo_id)
+
+            self.cargado = True
+            self._ultima_lectura = time.monotonic()
+
+    def actualizar_si_corresponde(self, session, modelo):
+        """
+        Carga los usuarios nuevos si pasaron 'refresco' segundos
+        """
+        if not self.cargado or time.monotonic() - self._ultima_lectura >= self.refresco:
+            self.cargar(session, modelo)
+
+    def agregar(self, usuario_id, username, email):
+        """
+        Registra un usuario recién creado en este proceso
+
+        Su id se recuerda para no contarlo otra vez cuando se lea de la
+        base de datos (no se puede avanzar ultimo_id: puede haber usuarios
+        de otros workers con ids menores que todavía no se leyeron).
+        """
+        with self._bloqueo:
+            if usuario_id <= self.ultimo_id:
+                # Ya se leyó de la base de datos en un refresco
+                return
+            usernames, emails = self._filtros
+            usernames.agregar(username)
+            emails.agregar(email)
+            self._agregados.add(usuario_id)
@@ -0,0 +1,114 @@
+# frontend_estatico.py
+import hashlib
+import mimetypes
+import os
+import re
+from flask import Response, request
+from compresion import comprimir, EXTENSIONES
+
+# Referencias de index.html a archivos de la misma carpeta
+# (href="styles.css", src="script.js"); las URLs externas no se tocan
+PATRON_REFERENCIA = re.compile(r'\b(href|src)="([^":/?#]+)"')
+
+# Prefijo de las URLs de los archivos con hash
+PREFIJO_RECURSOS = '/assets/'
+
+# Los archivos con hash nunca cambian: se pueden guardar un año sin revalidar
+CACHE_INMUTABLE = 'public, max-age=31536000, immutable'
+
+# index.html se revalida siempre (con su ETag, la respuesta suele ser un 304)
+CACHE_REVALIDAR = 'no-cache'
+
+
+class ArchivoFrontend:
+    """
+    Contenido de un archivo del frontend listo para enviar
+
+    Guarda el contenido, su versión gzip (leída del .gz generado por
+    comprimir_frontend.py si está al día, o comprimida una vez al cargar)
+    y su ETag (SHA-256 del contenido).
+    """
+
+    def __init__(self, datos, tipo, comprimidos=None):
+        self.datos = datos
+        self.tipo = tipo
+        self.etag = hashlib.sha256(datos).hexdigest()
+        self.comprimidos = comprimidos if comprimidos is not None else comprimir(datos, 'gzip', 9)
+
+
+class FrontendEstatico:
+    """
+    Archivos de la carpeta del frontend, cargados en memoria al crearse
+
+    Cada archivo (salvo index.html) se publica con el hash de su contenido
+    en el nombre, por ejemplo /assets/styles.1a2b3c4d5e6f.css, y en
+    index.html se reescriben las referencias a esos nombres. Si un archivo
+    cambia, cambia su nombre: el navegador puede guardarlo para siempre y
+    solo necesita revalidar index.html.
+
+    Parámetros:
+    - carpeta: carpeta del frontend (index.html, script.js, styles.css, ...)
+    """
+
+    def __init__(self, carpeta):
+        self.carpeta = carpeta
+        self.recursos = {}
+        self.nombres = {}
+
+        for nombre in sorted(os.listdir(carpeta)):
+            ruta = os.path.join(carpeta, nombre)
+            if nombre == 'index.html' or nombre.endswith(tuple(EXTENSIONES.values())) or not os.path.isfile(ruta):
+                continue
+
+            archivo = self._cargar(ruta)
+            base, extension = os.path.splitext(nombre)
+            nombre_hash = f'{base}.{archivo.etag[:12]}{extension}'
+            self.recursos[nombre_hash] = archivo
+            self.nombres[nombre] = nombre_hash
+
+        with open(os.path.join(carpeta, 'index.html'), encoding='utf-8') as archivo:
+            html = PATRON_REFERENCIA.sub(self._reemplazar_referencia, archivo.read())
+        self.index = ArchivoFrontend(html.encode('utf-8'), 'text/html')
+
+    def _cargar(self, ruta):
+        with open(ruta, 'rb') as archivo:
+            datos = archivo.read()
+
+        # Usar el .gz del build solo si es del mismo momento que el original
+        comprimidos = None
+        ruta_gz = ruta + EXTENSIONES['gzip']
+        if os.path.exists(ruta_gz) and os.stat(ruta_gz).st_mtime_ns == os.stat(ruta).st_mtime_ns:
+            with open(ruta_gz, 'rb') as archivo:
+                comprimidos = archivo.read()
+
+        tipo = mimetypes.guess_type(ruta)[0] or 'application/octet-stream'
+        return ArchivoFrontend(datos, tipo, comprimidos)
+
+    def _reemplazar_referencia(self, coincidencia):
+        atributo, nombre = coincidencia.groups()
+        nombre_hash = self.nombres.get(nombre)
+        if nombre_hash is None:
+            return coincidencia.group(0)
+        return f'{atributo}="{PREFIJO_RECURSOS}{nombre_hash}"'
+
+
+def responder_archivo(archivo, cache_control):
+    """
+    Respuesta para un archivo del frontend
+
+    Responde 304 si el cliente ya tiene la versión actual (If-None-Match) y
+    envía la versión gzip ya comprimida si el cliente la acepta.
+    """
+    if request.if_none_match.contains_weak(archivo.etag):
+        respuesta = Response(status=304)
+    elif request.accept_encodings.best_match(['gzip']):
+        respuesta = Response(archivo.comprimidos, mimetype=archivo.tipo)
+        respuesta.headers['Content-Encoding'] = 'gzip'
+    else:
+        respuesta = Response(archivo.datos, mimetype=archivo.tipo)
+
+    # El ETag es débil porque el mismo archivo se envía comprimido o sin comprimir
+    respuesta.set_etag(archivo.etag, weak=True)
+    respuesta.vary.add('Accept-Encoding')
+    respuesta.headers['Cache-Control'] = cache_control
+    return respuesta
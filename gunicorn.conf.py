@@ -0,0 +1,50 @@
+# gunicorn.conf.py
+# Configuración del servidor de producción: gunicorn -c gunicorn.conf.py
+import multiprocessing
+import os
+
+# Dirección y puerto (Render y Heroku indican el puerto en PORT)
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+# SERVIDOR_PROCESOS: procesos worker (por defecto WEB_CONCURRENCY o uno por núcleo)
+workers = int(os.environ.get('SERVIDOR_PROCESOS', os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count())))
+
+# SERVIDOR_MODO: 'wsgi' (Flask con hilos) o 'asgi' (uvicorn: las lecturas
+# de tareas usan un engine asíncrono, ver asgi.py)
+modo = os.environ.get('SERVIDOR_MODO', 'wsgi')
+
+# SERVIDOR_HILOS: hilos por worker en modo wsgi. Las peticiones pasan buena
+# parte del tiempo esperando a la base de datos, así cada proceso atiende
+# varias a la vez
+threads = int(os.environ.get('SERVIDOR_HILOS', 4))
+worker_class = 'uvicorn_worker.UvicornWorker' if modo == 'asgi' else 'gthread'
+
+# SERVIDOR_TIMEOUT: segundos antes de reiniciar un worker que no responde
+timeout = int(os.environ.get('SERVIDOR_TIMEOUT', 30))
+
+# Cada worker crea su propia aplicación después del fork (y con ella su
+# engine y su pool de conexiones): no se comparten conexiones entre procesos
+wsgi_app = 'asgi:crear_app_asgi()' if modo == 'asgi' else 'app:create_app()'
+preload_app = False
+
+accesslog = '-'
+
+
+def on_starting(server):
+    """
+    Prepara la base de datos una sola vez, en el proceso principal, antes
+    de crear los workers
+    """
+    from app import create_app, preparar_base_de_datos
+    preparar_base_de_datos(create_app())
+
+
+def post_worker_init(worker):
+    """
+    Registra cuánto tardó cada worker en crear su aplicación
+    """
+    from app import reporte_inicio
+    aplicacion = worker.wsgi
+    if modo == 'asgi':
+        aplicacion = aplicacion.app
+    worker.log.info(reporte_inicio(aplicacion))
@@ -0,0 +1,120 @@
+# lectura_escritura.py
+import threading
+from flask import has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+
+# Clave del engine de lectura en SQLALCHEMY_BINDS
+BIND_LECTURA = 'lectura'
+
+# Métodos HTTP que solo leen
+METODOS_LECTURA = ('GET', 'HEAD')
+
+
+class SesionEnrutada(Session):
+    """
+    Sesión que envía las lecturas de las peticiones GET al engine de lectura
+
+    Si la aplicación tiene el engine BIND_LECTURA, las consultas hechas
+    mientras se atiende un GET usan ese engine y todo lo demás (peticiones
+    que modifican datos, migraciones, flush y sentencias INSERT, UPDATE o
+    DELETE) usa el engine principal. Así una escritura ocasional dentro de
+    un GET, como crear un contador que faltaba, sigue funcionando.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._es_lectura(clause):
+            lectura = self._db.engines.get(BIND_LECTURA)
+            if lectura is not None:
+                return lectura
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _es_lectura(self, clause):
+        if self._flushing or getattr(clause, 'is_dml', False):
+            return False
+        return has_request_context() and request.method in METODOS_LECTURA
+
+
+def configurar_engines(config):
+    """
+    Agrega a la configuración el engine de lectura y el tamaño de los pools
+
+    Con SQLite, si no se indica BD_LECTURA_URL, el engine de lectura abre
+    el mismo archivo en modo solo lectura (mode=ro): con WAL sus consultas
+    no esperan a las escrituras. Una base de datos en memoria o de otro
+    motor sin BD_LECTURA_URL no tiene engine de lectura.
+
+    Parámetros:
+    - config: configuración de la aplicación (BD_LECTURA, BD_LECTURA_URL,
+      BD_LECTURA_POOL, BD_ESCRITURA_POOL y SQLALCHEMY_DATABASE_URI)
+
+    Retorna:
+    - True si se configuró el engine de lectura
+    """
+    if not config['BD_LECTURA']:
+        return False
+
+    url_lectura = config['BD_LECTURA_URL']
+    if not url_lectura:
+        url = make_url(config['SQLALCHEMY_DATABASE_URI'])
+        if url.get_backend_name() != 'sqlite' or url.database in (None, '', ':memory:'):
+            return False
+        url_lectura = f'sqlite:///file:{url.database}?mode=ro&uri=true'
+
+    # Pocos escritores a la vez: SQLite admite uno solo y el resto esperaría el lock
+    config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        **config.get('SQLALCHEMY_ENGINE_OPTIONS', {}),
+        'pool_size': config['BD_ESCRITURA_POOL'],
+        'max_overflow': 0
+    }
+    config['SQLALCHEMY_BINDS'] = {
+        **config.get('SQLALCHEMY_BINDS', {}),
+        BIND_LECTURA: {'url': url_lectura, 'pool_size': config['BD_LECTURA_POOL']}
+    }
+    return True
+
+
+class MetricasPool:
+    """
+    Métricas del pool de conexiones de un engine
+
+    Cuenta las conexiones abiertas y los préstamos de conexiones (uno por
+    transacción) con los eventos del pool, y lee del pool cuántas están
+    en uso y libres en este momento.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.conexiones_abiertas = 0
+        self.prestamos = 0
+        self._bloqueo = threading.Lock()
+        event.listen(engine, 'connect', self._conexion_abierta)
+        event.listen(engine, 'checkout', self._prestamo)
+
+    def _conexion_abierta(self, conexion_dbapi, registro_conexion):
+        with self._bloqueo:
+            self.conexiones_abiertas += 1
+
+    def _prestamo(self, conexion_dbapi, registro_conexion, proxy_conexion):
+        with self._bloqueo:
+            self.prestamos += 1
+
+    def estadisticas(self):
+        """
+        Conexiones abiertas, préstamos y estado actual del pool
+        """
+        pool = self.engine.pool
+        datos = {
+            'conexiones_abiertas': self.conexiones_abiertas,
+            'prestamos': self.prestamos
+        }
+        if isinstance(pool, QueuePool):
+            datos.update({
+                'tamano': pool.size(),
+                'en_uso': pool.checkedout(),
+                'libres': pool.checkedin(),
+                'desborde': max(0, pool.overflow())
+            })
+        return datos
@@ -25,24 +25,13 @@ def limpiar_tareas():
     
     headers = {"Authorization": f"Bearer {token}"}
     
-    # Obtener todas las tareas
-    response = requests.get(f"{BASE_URL}/tareas", headers=headers)
+    # Eliminar todas las tareas con una sola petición
+    response = requests.delete(f"{BASE_URL}/tareas?todas=true", headers=headers)
     if response.status_code == 200:
-        tareas = response.json()
-        print(f"�� Encontradas {len(tareas)} tareas")
-        
-        # Eliminar cada tarea
-        for tarea in tareas:
-            tarea_id = tarea['id']
-            delete_response = requests.delete(f"{BASE_URL}/tareas/{tarea_id}", headers=headers)
-            if delete_response.status_code == 200:
-                print(f"🗑️ Eliminada tarea: {tarea['titulo']}")
-            else:
-                print(f"❌ Error eliminando tarea {tarea_id}")
-        
+        print(f"🗑️ Eliminadas {response.json()['eliminadas']} tareas")
         print("✅ Limpieza completada")
     else:
-        print("❌ Error obteniendo tareas")
+        print("❌ Error eliminando tareas")
 
 if __name__ == "__main__":
     limpiar_tareas()
\ No newline at end of file
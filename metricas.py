@@ -0,0 +1,180 @@
+# metricas.py
+import threading
+import time
+from bisect import bisect_left
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+# Límites (en segundos) de los buckets del histograma de latencia
+BUCKETS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Etiqueta de las peticiones que no coinciden con ninguna ruta: una sola
+# serie para todas, así las URLs inventadas no crean series nuevas
+RUTA_DESCONOCIDA = 'desconocida'
+
+# Tipo de contenido del formato de texto de Prometheus
+TIPO_PROMETHEUS = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class MetricasPeticiones:
+    """
+    Métricas de las peticiones atendidas por este proceso
+
+    Por cada ruta (la regla de Flask, como /tareas/<int:tarea_id>) y método
+    cuenta las peticiones por código de estado, arma un histograma de
+    latencia y suma las sentencias SQL y el tiempo en la base de datos.
+    Cada petición solo agrega unas sumas bajo un lock, así que se puede
+    dejar activado en producción.
+
+    Las respuestas enviadas por partes (exportaciones, NDJSON) ejecutan sus
+    consultas después de after_request: esas se registran al cerrarse la
+    respuesta (call_on_close), con la duración y las sentencias SQL de
+    todo el envío.
+    """
+
+    def __init__(self, buckets=BUCKETS_LATENCIA):
+        self.buckets = buckets
+        self._bloqueo = threading.Lock()
+        # (ruta, metodo, codigo) -> peticiones
+        self._peticiones = {}
+        # (ruta, metodo) -> [peticiones por bucket (sin acumular)..., suma de segundos]
+        self._latencias = {}
+        # (ruta, metodo) -> [sentencias SQL, segundos en la base de datos]
+        self._sql = {}
+
+    def observar_engine(self, engine):
+        """
+        Mide las sentencias SQL de un engine (las de cada petición se suman a su ruta)
+        """
+        event.listen(engine, 'before_cursor_execute', self._antes_sql)
+        event.listen(engine, 'after_cursor_execute', self._despues_sql)
+        event.listen(engine, 'handle_error', self._error_sql)
+
+    def _antes_sql(self, conexion, cursor, sentencia, parametros, contexto, varias):
+        conexion.info.setdefault('metricas_inicio_sql', []).append(time.perf_counter())
+
+    def _despues_sql(self, conexion, cursor, sentencia, parametros, contexto, varias):
+        inicio = conexion.info['metricas_inicio_sql'].pop()
+        if has_request_context():
+            peticion = g.get('metricas_peticion')
+            if peticion is not None:
+                peticion[1] += 1
+                peticion[2] += time.perf_counter() - inicio
+
+    def _error_sql(self, contexto_error):
+        inicios = contexto_error.connection.info.get('metricas_inicio_sql') if contexto_error.connection else None
+        if inicios:
+            inicios.pop()
+
+    def iniciar_peticion(self):
+        """
+        Marca el inicio de la petición en curso (before_request)
+        """
+        # [inicio, sentencias SQL, segundos en la base de datos]
+        g.metricas_peticion = [time.perf_counter(), 0, 0.0]
+
+    def terminar_peticion(self, respuesta):
+        """
+        Registra la petición en curso con su respuesta (after_request)
+
+        Si la respuesta se envía por partes, se registra cuando termina de
+        enviarse: hasta entonces sus consultas se siguen sumando.
+        """
+        peticion = g.get('metricas_peticion')
+        if peticion is None:
+            return
+
+        ruta = request.url_rule.rule if request.url_rule is not None else RUTA_DESCONOCIDA
+        clave = (ruta, request.method)
+        codigo = respuesta.status_code
+
+        if respuesta.is_streamed:
+            respuesta.call_on_close(lambda: self._registrar(clave, codigo, peticion))
+        else:
+            g.pop('metricas_peticion')
+            self._registrar(clave, codigo, peticion)
+
+    def _registrar(self, clave, codigo, peticion):
+        inicio, sentencias, segundos_sql = peticion
+        duracion = time.perf_counter() - inicio
+        posicion = bisect_left(self.buckets, duracion)
+
+        with self._bloqueo:
+            clave_codigo = clave + (codigo,)
+            self._peticiones[clave_codigo] = self._peticiones.get(clave_codigo, 0) + 1
+
+            latencias = self._latencias.get(clave)
+            if latencias is None:
+                latencias = self._latencias[clave] = [0] * (len(self.buckets) + 1) + [0.0]
+            latencias[posicion] += 1
+            latencias[-1] += duracion
+
+            sql = self._sql.get(clave)
+            if sql is None:
+                sql = self._sql[clave] = [0, 0.0]
+            sql[0] += sentencias
+            sql[1] += segundos_sql
+
+    def familias(self):
+        """
+        Métricas de las peticiones como familias para texto_prometheus
+        """
+        with self._bloqueo:
+            peticiones = sorted(self._peticiones.items())
+            latencias = sorted((clave, list(valores)) for clave, valores in self._latencias.items())
+            sql = sorted((clave, list(valores)) for clave, valores in self._sql.items())
+
+        histograma = []
+        for (ruta, metodo), valores in latencias:
+            etiquetas = {'ruta': ruta, 'metodo': metodo}
+            acumulado = 0
+            for limite, cantidad in zip(self.buckets + ('+Inf',), valores):
+                acumulado += cantidad
+                histograma.append(('_bucket', {**etiquetas, 'le': str(limite)}, acumulado))
+            histograma.append(('_sum', etiquetas, valores[-1]))
+            histograma.append(('_count', etiquetas, acumulado))
+
+        return [
+            ('api_peticiones_total', 'counter', 'Peticiones atendidas por ruta, método y código de estado', [
+                ('', {'ruta': ruta, 'metodo': metodo, 'codigo': str(codigo)}, cantidad)
+                for (ruta, metodo, codigo), cantidad in peticiones
+            ]),
+            ('api_peticion_duracion_segundos', 'histogram', 'Duración de las peticiones por ruta y método', histograma),
+            ('api_sql_sentencias_total', 'counter', 'Sentencias SQL ejecutadas por ruta y método', [
+                ('', {'ruta': ruta, 'metodo': metodo}, sentencias)
+                for (ruta, metodo), (sentencias, _) in sql
+            ]),
+            ('api_sql_duracion_segundos_total', 'counter', 'Tiempo en la base de datos por ruta y método', [
+                ('', {'ruta': ruta, 'metodo': metodo}, segundos)
+                for (ruta, metodo), (_, segundos) in sql
+            ])
+        ]
+
+
+def escapar_etiqueta(valor):
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def texto_prometheus(familias):
+    """
+    Convierte familias de métricas al formato de texto de Prometheus
+
+    Parámetros:
+    - familias: lista de (nombre, tipo, ayuda, muestras). Cada muestra es
+      (sufijo, etiquetas, valor); el sufijo se agrega al nombre (por
+      ejemplo '_bucket' en los histogramas)
+
+    Retorna:
+    - texto listo para enviar con el tipo TIPO_PROMETHEUS
+    """
+    lineas = []
+    for nombre, tipo, ayuda, muestras in familias:
+        lineas.append(f'# HELP {nombre} {ayuda}')
+        lineas.append(f'# TYPE {nombre} {tipo}')
+        for sufijo, etiquetas, valor in muestras:
+            if etiquetas:
+                texto = ','.join(f'{clave}="{escapar_etiqueta(dato)}"' for clave, dato in etiquetas.items())
+                lineas.append(f'{nombre}{sufijo}{{{texto}}} {valor}')
+            else:
+                lineas.append(f'{nombre}{sufijo} {valor}')
+    return '\n'.join(lineas) + '\n'
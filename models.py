@@ -2,9 +2,11 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
+from lectura_escritura import SesionEnrutada
 
-# Creamos una instancia de SQLAlchemy
-db = SQLAlchemy()
+# Creamos una instancia de SQLAlchemy. Su sesión envía las lecturas de
+# las peticiones GET al engine de lectura, si está configurado
+db = SQLAlchemy(session_options={'class_': SesionEnrutada})
 
 class Usuario(db.Model):
     """
@@ -16,6 +18,13 @@ class Usuario(db.Model):
     # Nombre de la tabla en la base de datos
     __tablename__ = 'usuarios'
     
+    # Índice para listar usuarios por fecha de registro (username y email
+    # ya tienen el índice de su restricción UNIQUE). El id al final sigue el
+    # orden de la paginación por cursor
+    __table_args__ = (
+        db.Index('ix_usuarios_fecha_registro', 'fecha_registro', 'id'),
+    )
+    
     # Campo id: clave primaria, se auto-incrementa
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     
@@ -35,11 +44,17 @@ class Usuario(db.Model):
     # backref='usuario': permite acceder al usuario desde una tarea
     tareas = db.relationship('Tarea', backref='usuario', lazy=True, cascade='all, delete-orphan') #Lazy=true carga solo las tareas solo cuando se necesiten, backref deja que acceda a usuario desde tarea 
     
-    def set_password(self, password):
+    def set_password(self, password, metodo=None):
         """
         Encripta la contraseña y la guarda en password_hash
+        
+        metodo: método de hash de werkzeug (por ejemplo 'scrypt' o
+        'pbkdf2:sha256:600000'); si no se indica se usa el de werkzeug
         """
-        self.password_hash = generate_password_hash(password)
+        if metodo:
+            self.password_hash = generate_password_hash(password, method=metodo)
+        else:
+            self.password_hash = generate_password_hash(password)
     
     def check_password(self, password):
         """
@@ -76,6 +91,17 @@ class Tarea(db.Model):
     # Nombre de la tabla en la base de datos
     __tablename__ = 'tareas'
     
+    # Índices compuestos para las consultas que realmente se ejecutan:
+    # todas filtran por usuario_id y luego ordenan o filtran por otra columna.
+    # El id al final permite recorrer el índice en el mismo orden que la
+    # paginación por cursor (columna de ordenamiento + id)
+    __table_args__ = (
+        db.Index('ix_tareas_usuario_fecha', 'usuario_id', 'fecha_creacion', 'id'),
+        db.Index('ix_tareas_usuario_titulo', 'usuario_id', 'titulo', 'id'),
+        db.Index('ix_tareas_usuario_completada', 'usuario_id', 'completada', 'id'),
+        db.Index('ix_tareas_usuario_completada_fecha', 'usuario_id', 'completada', 'fecha_creacion', 'id'),
+    )
+    
     # Campo id: clave primaria, se auto-incrementa
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     
@@ -113,4 +139,75 @@ class Tarea(db.Model):
         """
         Representación en texto del objeto (útil para debugging)
         """
-        return f'<Tarea {self.id}: {self.titulo}>'
\ No newline at end of file
+        return f'<Tarea {self.id}: {self.titulo}>'
+
+class ContadorTareas(db.Model):
+    """
+    Modelo de ContadorTareas - Totales de tareas de cada usuario
+    
+    Se actualiza en la misma transacción que crea, modifica o elimina
+    tareas, así las estadísticas se leen sin recorrer la tabla tareas
+    y se sabe si las tareas cambiaron sin consultarlas
+    """
+    
+    # Nombre de la tabla en la base de datos
+    __tablename__ = 'contadores_tareas'
+    
+    # Campo usuario_id: una fila por usuario (clave primaria y foránea)
+    usuario_id = db.Column(db.Integer, db.ForeignKey('usuarios.id'), primary_key=True)
+    
+    # Campo total: cantidad total de tareas del usuario
+    total = db.Column(db.Integer, nullable=False, default=0)
+    
+    # Campo completadas: tareas con completada = True
+    completadas = db.Column(db.Integer, nullable=False, default=0)
+    
+    # Campo pendientes: tareas con completada = False
+    pendientes = db.Column(db.Integer, nullable=False, default=0)
+    
+    # Campo version: aumenta con cada cambio en las tareas del usuario
+    # (se usa para los ETag de las lecturas)
+    version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    
+    def to_dict(self):
+        """
+        Convierte el contador a un diccionario (para JSON)
+        """
+        return {
+            'total_tareas': self.total,
+            'completadas': self.completadas,
+            'pendientes': self.pendientes
+        }
+    
+    def __repr__(self):
+        """
+        Representación en texto del objeto (útil para debugging)
+        """
+        return f'<ContadorTareas usuario={self.usuario_id}: {self.completadas}/{self.total}>'
+
+class VersionEsquema(db.Model):
+    """
+    Modelo de VersionEsquema - Huella del esquema con el que se preparó la base de datos
+    
+    Tiene una sola fila. Si al iniciar la huella guardada coincide con la
+    de los modelos actuales, no hace falta revisar tablas, columnas ni
+    índices (ver preparar_base_de_datos)
+    """
+    
+    # Nombre de la tabla en la base de datos
+    __tablename__ = 'version_esquema'
+    
+    # Campo id: siempre 1
+    id = db.Column(db.Integer, primary_key=True)
+    
+    # Campo huella: hash del esquema declarado en los modelos y migraciones
+    huella = db.Column(db.String(64), nullable=False)
+    
+    # Campo fecha_actualizacion: última vez que se aplicaron las migraciones
+    fecha_actualizacion = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        """
+        Representación en texto del objeto (útil para debugging)
+        """
+        return f'<VersionEsquema {self.huella[:12]}>'
@@ -0,0 +1,80 @@
+# perfil_sqlite.py
+from sqlalchemy import event
+
+# Valores admitidos por cada PRAGMA que recibe un nombre
+VALORES_SYNCHRONOUS = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+VALORES_TEMP_STORE = ('DEFAULT', 'FILE', 'MEMORY')
+
+
+def pragmas_perfil(config):
+    """
+    Lista de PRAGMA (nombre, valor) que se ejecutan en cada conexión
+
+    - journal_mode=WAL: los lectores no bloquean al escritor ni al revés
+    - synchronous: con WAL, NORMAL es seguro ante caídas del proceso y evita
+      un fsync por cada commit
+    - busy_timeout: milisegundos que se espera un lock antes de fallar con
+      "database is locked"
+    - cache_size: páginas en memoria por conexión (negativo = en KiB)
+    - mmap_size: bytes del archivo leídos con memoria mapeada
+    - temp_store: tablas temporales y ordenamientos en memoria
+
+    Parámetros:
+    - config: configuración de la aplicación (SQLITE_SYNCHRONOUS,
+      SQLITE_BUSY_TIMEOUT, SQLITE_CACHE_KB, SQLITE_MMAP_BYTES y
+      SQLITE_TEMP_STORE)
+    """
+    synchronous = config['SQLITE_SYNCHRONOUS'].upper()
+    if synchronous not in VALORES_SYNCHRONOUS:
+        raise ValueError(f"SQLITE_SYNCHRONOUS desconocido: {synchronous}")
+
+    temp_store = config['SQLITE_TEMP_STORE'].upper()
+    if temp_store not in VALORES_TEMP_STORE:
+        raise ValueError(f"SQLITE_TEMP_STORE desconocido: {temp_store}")
+
+    return [
+        ('journal_mode', 'WAL'),
+        ('synchronous', synchronous),
+        ('busy_timeout', int(config['SQLITE_BUSY_TIMEOUT'])),
+        ('cache_size', -int(config['SQLITE_CACHE_KB'])),
+        ('mmap_size', int(config['SQLITE_MMAP_BYTES'])),
+        ('temp_store', temp_store)
+    ]
+
+
+def aplicar_perfil_sqlite(engine, config, solo_lectura=False):
+    """
+    Ejecuta los PRAGMA del perfil en cada conexión nueva del engine
+
+    Los PRAGMA (salvo journal_mode) valen solo para la conexión en la que
+    se ejecutan, por eso se aplican con el evento 'connect' del pool y no
+    una sola vez al iniciar.
+
+    Parámetros:
+    - engine: engine de SQLAlchemy de la aplicación
+    - config: configuración de la aplicación (SQLITE_PERFIL y los valores
+      que lee pragmas_perfil)
+    - solo_lectura: el engine abre la base de datos en modo solo lectura,
+      que no puede cambiar journal_mode (lo deja en WAL el engine principal)
+
+    Retorna:
+    - True si se aplicó el perfil
+    - False si la base de datos no es SQLite o el perfil está desactivado
+    """
+    if engine.dialect.name != 'sqlite' or not config['SQLITE_PERFIL']:
+        return False
+
+    pragmas = pragmas_perfil(config)
+    if solo_lectura:
+        pragmas = [(nombre, valor) for nombre, valor in pragmas if nombre != 'journal_mode']
+
+    @event.listens_for(engine, 'connect')
+    def configurar_conexion(conexion_dbapi, registro_conexion):
+        cursor = conexion_dbapi.cursor()
+        try:
+            for nombre, valor in pragmas:
+                cursor.execute(f'PRAGMA {nombre}={valor}')
+        finally:
+            cursor.close()
+
+    return True
@@ -97,6 +97,29 @@ def test_busqueda_combinada(token):
     for tarea in response.json():
         print(f"  - {tarea['titulo']}")
 
+def test_busqueda_texto_completo(token):
+    """Probar búsqueda por prefijo, sin tildes y ordenada por relevancia"""
+    print("\n📚 Probando búsqueda de texto completo...")
+    
+    headers = {"Authorization": f"Bearer {token}"}
+    
+    # Prefijo: "pyth" debe encontrar las tareas con "Python"
+    response = requests.get(f"{BASE_URL}/tareas?busqueda=pyth", headers=headers)
+    tareas = response.json()["tareas"]
+    print(f"Búsqueda 'pyth': {len(tareas)} resultados")
+    for tarea in tareas:
+        print(f"  - {tarea['titulo']}")
+    
+    # Sin tildes: "basica" debe encontrar "básica"
+    response = requests.get(f"{BASE_URL}/tareas?busqueda=basica", headers=headers)
+    print(f"Búsqueda 'basica': {len(response.json()['tareas'])} resultados")
+    
+    # Ordenar por relevancia: primero las tareas que más mencionan "Python"
+    response = requests.get(f"{BASE_URL}/tareas?busqueda=Python&ordenar_por=relevancia", headers=headers)
+    print(f"Búsqueda 'Python' por relevancia: {response.status_code}")
+    for tarea in response.json()["tareas"]:
+        print(f"  - {tarea['titulo']}")
+
 if __name__ == "__main__":
     print("🚀 Iniciando pruebas de búsqueda...")
     print("=" * 50)
@@ -114,5 +137,6 @@ if __name__ == "__main__":
     test_busqueda_basica(token)
     test_filtro_estado(token)
     test_busqueda_combinada(token)
+    test_busqueda_texto_completo(token)
     
     print("\n✅ Pruebas de búsqueda completadas!")
\ No newline at end of file
@@ -0,0 +1,146 @@
+# test_estadisticas.py
+import requests
+import json
+
+# URL base de la API
+BASE_URL = "http://localhost:5000"
+
+def login_usuario():
+    """Login para obtener token"""
+    print("🔐 Haciendo login...")
+    
+    datos = {
+        "username": "testuser",
+        "password": "123456"
+    }
+    
+    response = requests.post(f"{BASE_URL}/login", json=datos)
+    if response.status_code == 200:
+        print("✅ Login exitoso")
+        return response.json()["access_token"]
+    else:
+        print("❌ Error en login:", response.json())
+        return None
+
+def recontar_tareas(headers):
+    """Cuenta las tareas una por una con la exportación (sin usar los contadores)"""
+    response = requests.get(f"{BASE_URL}/tareas/exportar?formato=ndjson", headers=headers)
+    tareas = [json.loads(linea) for linea in response.text.splitlines() if linea]
+    completadas = sum(1 for tarea in tareas if tarea["completada"])
+    return {
+        "total_tareas": len(tareas),
+        "completadas": completadas,
+        "pendientes": len(tareas) - completadas
+    }
+
+def verificar_escritura(response, operacion):
+    """Avisa si una escritura falló (las estadísticas no tendrían nada que reflejar)"""
+    if response.status_code not in (200, 201, 207):
+        print(f"❌ Error al {operacion}: {response.status_code}")
+        print(f"Respuesta: {json.dumps(response.json(), indent=2)}")
+
+def verificar_estadisticas(headers, despues_de):
+    """Compara GET /tareas/estadisticas con el recuento de las tareas"""
+    response = requests.get(f"{BASE_URL}/tareas/estadisticas", headers=headers)
+    if response.status_code != 200:
+        print(f"❌ Error obteniendo estadísticas después de {despues_de}: {response.status_code}")
+        return
+    
+    estadisticas = response.json()["estadisticas"]
+    recuento = recontar_tareas(headers)
+    if estadisticas == recuento:
+        print(f"✅ Estadísticas correctas después de {despues_de}: {estadisticas}")
+    else:
+        print(f"❌ Estadísticas distintas al recuento después de {despues_de}")
+        print(f"  Estadísticas: {estadisticas}")
+        print(f"  Recuento: {recuento}")
+
+def test_estadisticas(token):
+    """Probar que los contadores acompañan cada alta, modificación y baja"""
+    print("\n📊 Probando estadísticas de tareas...")
+    
+    headers = {"Authorization": f"Bearer {token}"}
+    
+    verificar_estadisticas(headers, "iniciar")
+    
+    # Alta de una tarea
+    tarea = {"titulo": "Estadística individual", "descripcion": "Creada de a una"}
+    response = requests.post(f"{BASE_URL}/tareas", json=tarea, headers=headers)
+    verificar_escritura(response, "crear una tarea")
+    tarea_id = response.json()["tarea"]["id"]
+    verificar_estadisticas(headers, "crear una tarea")
+    
+    # Alta en lote, con una completada y una inválida
+    response = requests.post(f"{BASE_URL}/tareas/lote", json=[
+        {"titulo": "Estadística lote 1", "descripcion": "Pendiente"},
+        {"titulo": "Estadística lote 2", "descripcion": "Completada", "completada": True},
+        {"titulo": "", "descripcion": "Inválida"}
+    ], headers=headers)
+    verificar_escritura(response, "crear en lote")
+    verificar_estadisticas(headers, "crear en lote")
+    
+    # Cambio de estado de una tarea (y repetirlo no debe contar dos veces)
+    for _ in range(2):
+        response = requests.put(f"{BASE_URL}/tareas/{tarea_id}", json={**tarea, "completada": True}, headers=headers)
+        verificar_escritura(response, "completar una tarea")
+    verificar_estadisticas(headers, "completar una tarea")
+    
+    # Modificación sin cambio de estado
+    tarea["titulo"] = "Estadística renombrada"
+    response = requests.put(f"{BASE_URL}/tareas/{tarea_id}", json=tarea, headers=headers)
+    verificar_escritura(response, "renombrar una tarea")
+    verificar_estadisticas(headers, "renombrar una tarea")
+    
+    # Cambio de estado en lote
+    response = requests.patch(f"{BASE_URL}/tareas/lote", json={"busqueda": "Estadística", "completada": False}, headers=headers)
+    verificar_escritura(response, "marcar pendientes en lote")
+    verificar_estadisticas(headers, "marcar pendientes en lote")
+    
+    response = requests.patch(f"{BASE_URL}/tareas/lote", json={"ids": [tarea_id], "completada": True}, headers=headers)
+    verificar_escritura(response, "completar en lote por ids")
+    verificar_estadisticas(headers, "completar en lote por ids")
+    
+    # Baja de una tarea
+    response = requests.delete(f"{BASE_URL}/tareas/{tarea_id}", headers=headers)
+    verificar_escritura(response, "eliminar una tarea")
+    verificar_estadisticas(headers, "eliminar una tarea")
+    
+    # Baja en lote
+    response = requests.delete(f"{BASE_URL}/tareas?busqueda=Estadística", headers=headers)
+    verificar_escritura(response, "eliminar en lote")
+    verificar_estadisticas(headers, "eliminar en lote")
+
+def test_estadisticas_no_modificadas(token):
+    """Probar el ETag de las estadísticas"""
+    print("\n🔁 Probando ETag de estadísticas...")
+    
+    headers = {"Authorization": f"Bearer {token}"}
+    
+    response = requests.get(f"{BASE_URL}/tareas/estadisticas", headers=headers)
+    etag = response.headers.get("ETag", "")
+    response = requests.get(f"{BASE_URL}/tareas/estadisticas", headers={**headers, "If-None-Match": etag})
+    if response.status_code == 304:
+        print("✅ Sin cambios: 304 Not Modified")
+    else:
+        print(f"❌ Se esperaba 304 y llegó {response.status_code}")
+    
+    response = requests.get(f"{BASE_URL}/tareas/estadisticas")
+    if response.status_code == 401:
+        print("✅ Sin token: 401")
+    else:
+        print(f"❌ Se esperaba 401 y llegó {response.status_code}")
+
+if __name__ == "__main__":
+    print("🚀 Iniciando pruebas de estadísticas...")
+    print("=" * 50)
+    
+    # Login
+    token = login_usuario()
+    if not token:
+        print("❌ Error: No se pudo hacer login")
+        exit(1)
+    
+    test_estadisticas(token)
+    test_estadisticas_no_modificadas(token)
+    
+    print("\n✅ Pruebas de estadísticas completadas!")
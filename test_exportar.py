@@ -0,0 +1,158 @@
+# test_exportar.py
+import csv
+import io
+import json
+import requests
+
+# URL base de la API
+BASE_URL = "http://localhost:5000"
+
+COLUMNAS_CSV = ['id', 'titulo', 'descripcion', 'completada', 'fecha_creacion', 'usuario_id']
+
+def login_usuario():
+    """Login para obtener token"""
+    print("🔐 Haciendo login...")
+    
+    datos = {
+        "username": "testuser",
+        "password": "123456"
+    }
+    
+    response = requests.post(f"{BASE_URL}/login", json=datos)
+    if response.status_code == 200:
+        print("✅ Login exitoso")
+        return response.json()["access_token"]
+    else:
+        print("❌ Error en login:", response.json())
+        return None
+
+def crear_tareas_exportacion(token):
+    """Crear tareas de prueba, una con comas y comillas en el título"""
+    print("\n📝 Creando tareas para exportar...")
+    
+    headers = {"Authorization": f"Bearer {token}"}
+    
+    tareas = [
+        {"titulo": "Exportar 1", "descripcion": "Primera tarea a exportar"},
+        {"titulo": "Exportar 2", "descripcion": "Segunda tarea a exportar", "completada": True},
+        {"titulo": 'Exportar "con comillas", y comas', "descripcion": "Línea uno, línea dos"}
+    ]
+    
+    response = requests.post(f"{BASE_URL}/tareas/lote", json=tareas, headers=headers)
+    if response.status_code == 201:
+        print("✅ 3 tareas creadas")
+    else:
+        print(f"❌ Error creando tareas: {response.status_code}")
+
+def test_exportar_csv(token):
+    """Probar la exportación en CSV"""
+    print("\n📄 Probando exportación CSV...")
+    
+    headers = {"Authorization": f"Bearer {token}"}
+    
+    response = requests.get(f"{BASE_URL}/tareas/exportar?formato=csv&busqueda=Exportar", headers=headers)
+    if response.status_code != 200 or not response.headers["Content-Type"].startswith("text/csv"):
+        print(f"❌ Error exportando CSV: {response.status_code}")
+        return
+    
+    filas = list(csv.reader(io.StringIO(response.text)))
+    if filas and filas[0] == COLUMNAS_CSV:
+        print("✅ Encabezado CSV correcto")
+    else:
+        print(f"❌ Encabezado CSV inesperado: {filas[:1]}")
+    
+    if len(filas) - 1 == 3:
+        print("✅ 3 filas exportadas")
+    else:
+        print(f"❌ Se esperaban 3 filas y llegaron {len(filas) - 1}")
+    
+    titulos = [fila[1] for fila in filas[1:]]
+    if 'Exportar "con comillas", y comas' in titulos:
+        print("✅ Comas y comillas del título escapadas correctamente")
+    else:
+        print(f"❌ El título con comas y comillas no se leyó igual: {titulos}")
+    
+    # Sin tareas que coincidan: solo el encabezado
+    response = requests.get(f"{BASE_URL}/tareas/exportar?formato=csv&busqueda=NoExisteNinguna", headers=headers)
+    filas = list(csv.reader(io.StringIO(response.text)))
+    if response.status_code == 200 and filas == [COLUMNAS_CSV]:
+        print("✅ Exportación vacía: solo el encabezado")
+    else:
+        print(f"❌ Exportación vacía inesperada: {response.status_code} {filas}")
+
+def test_exportar_ndjson(token):
+    """Probar la exportación en NDJSON y los filtros"""
+    print("\n📄 Probando exportación NDJSON...")
+    
+    headers = {"Authorization": f"Bearer {token}"}
+    
+    response = requests.get(f"{BASE_URL}/tareas/exportar?busqueda=Exportar", headers=headers)
+    lineas = [linea for linea in response.text.splitlines() if linea]
+    if response.status_code == 200 and len(lineas) == 3:
+        print("✅ NDJSON por defecto: 3 líneas")
+    else:
+        print(f"❌ Se esperaban 3 líneas y llegaron {len(lineas)} ({response.status_code})")
+        return
+    
+    tareas = [json.loads(linea) for linea in lineas]
+    if all(tarea["titulo"].startswith("Exportar") for tarea in tareas):
+        print("✅ Cada línea es una tarea JSON")
+    else:
+        print("❌ Líneas NDJSON inesperadas")
+    
+    # Filtro por estado
+    response = requests.get(f"{BASE_URL}/tareas/exportar?formato=ndjson&busqueda=Exportar&estado=completada", headers=headers)
+    tareas = [json.loads(linea) for linea in response.text.splitlines() if linea]
+    if len(tareas) == 1 and tareas[0]["completada"]:
+        print("✅ Filtro por estado respetado")
+    else:
+        print(f"❌ Filtro por estado no respetado: {len(tareas)} tareas")
+    
+    # Ordenamiento
+    response = requests.get(f"{BASE_URL}/tareas/exportar?busqueda=Exportar&ordenar_por=titulo&orden=asc", headers=headers)
+    titulos = [json.loads(linea)["titulo"] for linea in response.text.splitlines() if linea]
+    if titulos == sorted(titulos):
+        print("✅ Ordenamiento por título respetado")
+    else:
+        print(f"❌ Ordenamiento no respetado: {titulos}")
+
+def test_exportar_errores(token):
+    """Probar formato desconocido y falta de token"""
+    print("\n🚫 Probando errores de exportación...")
+    
+    headers = {"Authorization": f"Bearer {token}"}
+    
+    response = requests.get(f"{BASE_URL}/tareas/exportar?formato=xml", headers=headers)
+    if response.status_code == 400:
+        print("✅ Formato desconocido rechazado: 400")
+    else:
+        print(f"❌ Se esperaba 400 y llegó {response.status_code}")
+    
+    response = requests.get(f"{BASE_URL}/tareas/exportar")
+    if response.status_code == 401:
+        print("✅ Sin token: 401")
+    else:
+        print(f"❌ Se esperaba 401 y llegó {response.status_code}")
+
+def limpiar_tareas_exportacion(token):
+    """Eliminar las tareas de prueba"""
+    headers = {"Authorization": f"Bearer {token}"}
+    requests.delete(f"{BASE_URL}/tareas?busqueda=Exportar", headers=headers)
+
+if __name__ == "__main__":
+    print("🚀 Iniciando pruebas de exportación...")
+    print("=" * 50)
+    
+    # Login
+    token = login_usuario()
+    if not token:
+        print("❌ Error: No se pudo hacer login")
+        exit(1)
+    
+    crear_tareas_exportacion(token)
+    test_exportar_csv(token)
+    test_exportar_ndjson(token)
+    test_exportar_errores(token)
+    limpiar_tareas_exportacion(token)
+    
+    print("\n✅ Pruebas de exportación completadas!")
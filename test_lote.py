@@ -0,0 +1,145 @@
+# test_lote.py
+import requests
+import json
+
+# URL base de la API
+BASE_URL = "http://localhost:5000"
+
+def login_usuario():
+    """Login para obtener token"""
+    print("🔐 Haciendo login...")
+    
+    datos = {
+        "username": "testuser",
+        "password": "123456"
+    }
+    
+    response = requests.post(f"{BASE_URL}/login", json=datos)
+    if response.status_code == 200:
+        print("✅ Login exitoso")
+        return response.json()["access_token"]
+    else:
+        print("❌ Error en login:", response.json())
+        return None
+
+def test_crear_lote(token):
+    """Probar creación de varias tareas en una sola petición"""
+    print("\n📦 Probando creación en lote...")
+    
+    headers = {"Authorization": f"Bearer {token}"}
+    
+    tareas = [
+        {"titulo": "Lote 1", "descripcion": "Primera tarea del lote"},
+        {"titulo": "Lote 2", "descripcion": "Segunda tarea del lote", "completada": True},
+        {"titulo": "Lote 3", "descripcion": "Tercera tarea del lote"}
+    ]
+    
+    response = requests.post(f"{BASE_URL}/tareas/lote", json=tareas, headers=headers)
+    if response.status_code == 201 and response.json()["creadas"] == 3:
+        print("✅ Lote creado: 3 tareas")
+    else:
+        print(f"❌ Error creando lote: {response.status_code}")
+        print(f"Respuesta: {json.dumps(response.json(), indent=2)}")
+
+def test_lote_con_errores(token):
+    """Probar que las tareas inválidas no impiden crear las válidas"""
+    print("\n⚠️ Probando lote con tareas inválidas...")
+    
+    headers = {"Authorization": f"Bearer {token}"}
+    
+    tareas = [
+        {"titulo": "Lote válido", "descripcion": "Esta tarea es válida"},
+        {"titulo": "", "descripcion": "Título vacío"},
+        {"descripcion": "Sin título"}
+    ]
+    
+    response = requests.post(f"{BASE_URL}/tareas/lote", json=tareas, headers=headers)
+    datos = response.json()
+    if response.status_code == 207 and datos["creadas"] == 1 and datos["errores"] == 2:
+        print("✅ Lote parcial: 1 creada, 2 con errores")
+        for resultado in datos["resultados"]:
+            if "error" in resultado:
+                print(f"  - Tarea {resultado['indice']}: {resultado['error']}")
+    else:
+        print(f"❌ Respuesta inesperada: {response.status_code}")
+        print(f"Respuesta: {json.dumps(datos, indent=2)}")
+
+def test_lote_invalido(token):
+    """Probar que se rechaza un cuerpo que no es una lista"""
+    print("\n🚫 Probando lote inválido...")
+    
+    headers = {"Authorization": f"Bearer {token}"}
+    
+    response = requests.post(f"{BASE_URL}/tareas/lote", json={"titulo": "No es lista"}, headers=headers)
+    if response.status_code == 400:
+        print("✅ Cuerpo que no es lista rechazado correctamente")
+    else:
+        print(f"❌ Cuerpo inválido no fue rechazado: {response.status_code}")
+
+def test_actualizar_lote(token):
+    """Probar marcar varias tareas como completadas con una sola petición"""
+    print("\n✏️ Probando actualización en lote...")
+    
+    headers = {"Authorization": f"Bearer {token}"}
+    
+    datos = {"busqueda": "Lote", "estado": "pendiente", "completada": True}
+    response = requests.patch(f"{BASE_URL}/tareas/lote", json=datos, headers=headers)
+    if response.status_code == 200:
+        print(f"✅ Tareas marcadas como completadas: {response.json()['actualizadas']}")
+    else:
+        print(f"❌ Error actualizando lote: {response.status_code}")
+    
+    # Sin filtros no se debe modificar nada
+    response = requests.patch(f"{BASE_URL}/tareas/lote", json={"completada": False}, headers=headers)
+    if response.status_code == 400:
+        print("✅ Actualización sin filtros rechazada correctamente")
+    else:
+        print(f"❌ Actualización sin filtros no fue rechazada: {response.status_code}")
+
+def test_eliminar_lote(token):
+    """Probar eliminar varias tareas con una sola petición"""
+    print("\n🗑️ Probando eliminación en lote...")
+    
+    headers = {"Authorization": f"Bearer {token}"}
+    
+    # Eliminar por lista de ids
+    response = requests.get(f"{BASE_URL}/tareas?busqueda=Lote&limite=2", headers=headers)
+    ids = ",".join(str(tarea["id"]) for tarea in response.json()["tareas"])
+    response = requests.delete(f"{BASE_URL}/tareas?ids={ids}", headers=headers)
+    if response.status_code == 200:
+        print(f"✅ Eliminadas por ids: {response.json()['eliminadas']}")
+    else:
+        print(f"❌ Error eliminando por ids: {response.status_code}")
+    
+    # Eliminar por búsqueda
+    response = requests.delete(f"{BASE_URL}/tareas?busqueda=Lote", headers=headers)
+    if response.status_code == 200:
+        print(f"✅ Eliminadas por búsqueda: {response.json()['eliminadas']}")
+    else:
+        print(f"❌ Error eliminando por búsqueda: {response.status_code}")
+    
+    # Sin filtros no se debe eliminar nada
+    response = requests.delete(f"{BASE_URL}/tareas", headers=headers)
+    if response.status_code == 400:
+        print("✅ Eliminación sin filtros rechazada correctamente")
+    else:
+        print(f"❌ Eliminación sin filtros no fue rechazada: {response.status_code}")
+
+if __name__ == "__main__":
+    print("🚀 Iniciando pruebas de operaciones en lote...")
+    print("=" * 50)
+    
+    # Login
+    token = login_usuario()
+    if not token:
+        print("❌ Error: No se pudo hacer login")
+        exit(1)
+    
+    # Probar operaciones en lote
+    test_crear_lote(token)
+    test_lote_con_errores(token)
+    test_lote_invalido(token)
+    test_actualizar_lote(token)
+    test_eliminar_lote(token)
+    
+    print("\n✅ Pruebas de operaciones en lote completadas!")
@@ -42,13 +42,13 @@ def crear_tareas_test(token):
         {"titulo": "Proyecto Python", "descripcion": "Proyecto final"}
     ]
     
-    # LÍNEAS 34-39: Crear cada tarea
-    for tarea in tareas:
-        response = requests.post(f"{BASE_URL}/tareas", json=tarea, headers=headers)
-        if response.status_code == 201:
-            print(f"✅ Tarea creada: {tarea['titulo']}")
-        else:
-            print(f"❌ Error creando tarea: {response.json()}")
+    # LÍNEAS 34-39: Crear todas las tareas con una sola petición
+    response = requests.post(f"{BASE_URL}/tareas/lote", json=tareas, headers=headers)
+    if response.status_code == 201:
+        for resultado in response.json()["resultados"]:
+            print(f"✅ Tarea creada: {resultado['tarea']['titulo']}")
+    else:
+        print(f"❌ Error creando tareas: {response.json()}")
 
 # LÍNEAS 41-65: Función para probar ordenamiento por título
 def test_ordenamiento_titulo(token):
@@ -1,4 +1,5 @@
 # test_paginacion.py
+import os
 import requests
 import json
 
@@ -41,12 +42,13 @@ def crear_tareas_test(token):
     
     headers = {"Authorization": f"Bearer {token}"}
     
-    for tarea in tareas_test:
-        response = requests.post(f"{BASE_URL}/tareas", json=tarea, headers=headers)
-        if response.status_code == 201:
-            print(f"✅ Tarea creada: {tarea['titulo']}")
-        else:
-            print(f"❌ Error creando tarea: {response.status_code}")
+    # Crear todas las tareas con una sola petición
+    response = requests.post(f"{BASE_URL}/tareas/lote", json=tareas_test, headers=headers)
+    if response.status_code == 201:
+        for resultado in response.json()["resultados"]:
+            print(f"✅ Tarea creada: {resultado['tarea']['titulo']}")
+    else:
+        print(f"❌ Error creando tareas: {response.status_code}")
 
 def test_paginacion_basica(token):
     """
@@ -140,6 +142,247 @@ def test_parametros_invalidos(token):
     else:
         print(f"❌ Error con límite alto: {response.status_code}")
 
+def test_paginacion_cursor(token):
+    """
+    Test de paginación por cursor (keyset)
+    """
+    print("\n🧪 Probando paginación por cursor...")
+    
+    headers = {"Authorization": f"Bearer {token}"}
+    
+    # Listado completo de referencia ordenado por título
+    response = requests.get(f"{BASE_URL}/tareas?ordenar_por=titulo&orden=asc&limite=100", headers=headers)
+    if response.status_code != 200:
+        print(f"❌ Error obteniendo listado de referencia: {response.status_code}")
+        return
+    ids_esperados = [tarea["id"] for tarea in response.json()["tareas"]]
+    
+    # Recorrer todas las páginas siguiendo 'siguiente_cursor'
+    response = requests.get(f"{BASE_URL}/tareas?ordenar_por=titulo&orden=asc&limite=2", headers=headers)
+    datos = response.json()
+    ids_obtenidos = [tarea["id"] for tarea in datos["tareas"]]
+    
+    while datos["paginacion"]["siguiente_cursor"]:
+        cursor = datos["paginacion"]["siguiente_cursor"]
+        response = requests.get(f"{BASE_URL}/tareas?cursor={cursor}&limite=2", headers=headers)
+        if response.status_code != 200:
+            print(f"❌ Error siguiendo el cursor: {response.status_code}")
+            return
+        datos = response.json()
+        ids_obtenidos += [tarea["id"] for tarea in datos["tareas"]]
+    
+    if ids_obtenidos == ids_esperados[:len(ids_obtenidos)] and len(ids_obtenidos) == len(ids_esperados):
+        print("✅ Recorrido por cursor completo y en orden")
+    else:
+        print("❌ El recorrido por cursor no coincide con el listado completo")
+    
+    # Volver una página hacia atrás con 'anterior_cursor'
+    if datos["paginacion"]["anterior_cursor"]:
+        cursor = datos["paginacion"]["anterior_cursor"]
+        response = requests.get(f"{BASE_URL}/tareas?cursor={cursor}&limite=2", headers=headers)
+        if response.status_code == 200:
+            print("✅ Navegación hacia atrás con cursor funcionando")
+        else:
+            print(f"❌ Error con cursor anterior: {response.status_code}")
+    
+    # Un cursor mal formado debe rechazarse
+    response = requests.get(f"{BASE_URL}/tareas?cursor=no-es-un-cursor", headers=headers)
+    if response.status_code == 400:
+        print("✅ Cursor inválido rechazado correctamente")
+    else:
+        print(f"❌ Cursor inválido no fue rechazado: {response.status_code}")
+
+def test_respuesta_no_modificada(token):
+    """
+    Test de peticiones condicionales con ETag
+    """
+    print("\n🧪 Probando ETag / If-None-Match...")
+    
+    headers = {"Authorization": f"Bearer {token}"}
+    
+    response = requests.get(f"{BASE_URL}/tareas?pagina=1&limite=2", headers=headers)
+    etag = response.headers.get("ETag")
+    if not etag:
+        print("❌ La respuesta no incluye ETag")
+        return
+    
+    # Misma petición con el ETag: no hubo cambios, debe responder 304
+    headers_condicionales = {**headers, "If-None-Match": etag}
+    response = requests.get(f"{BASE_URL}/tareas?pagina=1&limite=2", headers=headers_condicionales)
+    if response.status_code == 304:
+        print("✅ Sin cambios: 304 Not Modified")
+    else:
+        print(f"❌ Se esperaba 304 y llegó {response.status_code}")
+    
+    # Después de crear una tarea el ETag ya no sirve
+    requests.post(f"{BASE_URL}/tareas", json={"titulo": "Tarea ETag", "descripcion": "Cambia la versión"}, headers=headers)
+    response = requests.get(f"{BASE_URL}/tareas?pagina=1&limite=2", headers=headers_condicionales)
+    if response.status_code == 200:
+        print("✅ Con cambios: 200 y un ETag nuevo")
+    else:
+        print(f"❌ Se esperaba 200 y llegó {response.status_code}")
+
+def test_cache_servidor(token):
+    """
+    Test de la cache de respuestas del servidor (header X-Cache)
+    """
+    print("\n🧪 Probando cache del servidor (X-Cache)...")
+    
+    headers = {"Authorization": f"Bearer {token}"}
+    url = f"{BASE_URL}/tareas?pagina=1&limite=3&ordenar_por=titulo"
+    
+    # Una escritura antes, así la primera lectura no puede estar en la cache
+    response = requests.post(f"{BASE_URL}/tareas", json={"titulo": "Tarea cache", "descripcion": "Invalida la cache"}, headers=headers)
+    tarea = response.json()["tarea"]
+    
+    response = requests.get(url, headers=headers)
+    if response.headers.get("X-Cache") == "MISS":
+        print("✅ Primera lectura: MISS")
+    else:
+        print(f"❌ Se esperaba MISS y llegó {response.headers.get('X-Cache')}")
+    
+    response = requests.get(url, headers=headers)
+    if response.headers.get("X-Cache") == "HIT":
+        print("✅ Misma lectura repetida: HIT")
+    else:
+        print(f"❌ Se esperaba HIT y llegó {response.headers.get('X-Cache')}")
+    
+    # Cada escritura descarta las respuestas guardadas del usuario
+    escrituras = [
+        ("modificar", lambda: requests.put(f"{BASE_URL}/tareas/{tarea['id']}", json={
+            "titulo": "Tarea cache modificada", "descripcion": tarea["descripcion"], "completada": True
+        }, headers=headers)),
+        ("eliminar", lambda: requests.delete(f"{BASE_URL}/tareas/{tarea['id']}", headers=headers))
+    ]
+    for nombre, escribir in escrituras:
+        escribir()
+        response = requests.get(url, headers=headers)
+        cache = response.headers.get("X-Cache")
+        titulos = [t["titulo"] for t in response.json()["tareas"]]
+        if cache == "MISS":
+            print(f"✅ Después de {nombre}: MISS")
+        else:
+            print(f"❌ Después de {nombre} se esperaba MISS y llegó {cache}")
+        if nombre == "eliminar" and "Tarea cache modificada" in titulos:
+            print("❌ La respuesta incluye una tarea ya eliminada")
+        requests.get(url, headers=headers)
+
+def test_obtener_tarea(token):
+    """
+    Test de GET /tareas/<id> (igual con python app.py y con python asgi.py)
+    """
+    print("\n🧪 Probando obtener una tarea...")
+    
+    headers = {"Authorization": f"Bearer {token}"}
+    
+    tarea_id = requests.get(f"{BASE_URL}/tareas?limite=1", headers=headers).json()["tareas"][0]["id"]
+    response = requests.get(f"{BASE_URL}/tareas/{tarea_id}", headers=headers)
+    if response.status_code == 200 and response.json()["tarea"]["id"] == tarea_id:
+        print("✅ Tarea obtenida correctamente")
+    else:
+        print(f"❌ Error obteniendo la tarea: {response.status_code}")
+        return
+    
+    headers_condicionales = {**headers, "If-None-Match": response.headers.get("ETag", "")}
+    response = requests.get(f"{BASE_URL}/tareas/{tarea_id}", headers=headers_condicionales)
+    if response.status_code == 304:
+        print("✅ Sin cambios: 304 Not Modified")
+    else:
+        print(f"❌ Se esperaba 304 y llegó {response.status_code}")
+    
+    response = requests.get(f"{BASE_URL}/tareas/999999", headers=headers)
+    if response.status_code == 404:
+        print("✅ Tarea inexistente: 404")
+    else:
+        print(f"❌ Se esperaba 404 y llegó {response.status_code}")
+    
+    response = requests.get(f"{BASE_URL}/tareas/{tarea_id}")
+    if response.status_code == 401:
+        print("✅ Sin token: 401")
+    else:
+        print(f"❌ Se esperaba 401 y llegó {response.status_code}")
+
+def test_campos(token):
+    """
+    Test del parámetro 'campos' (solo las columnas pedidas)
+    """
+    print("\n🧪 Probando campos=...")
+    
+    headers = {"Authorization": f"Bearer {token}"}
+    
+    response = requests.get(f"{BASE_URL}/tareas?limite=3&campos=id,titulo,completada", headers=headers)
+    tareas = response.json().get("tareas", [])
+    if response.status_code == 200 and tareas and all(set(tarea) == {"id", "titulo", "completada"} for tarea in tareas):
+        print("✅ Listado con solo id, titulo y completada")
+    else:
+        print(f"❌ Campos incorrectos en el listado: {response.status_code}")
+        return
+    
+    # El cursor funciona aunque no se pidan las columnas de ordenamiento
+    siguiente = response.json()["paginacion"]["siguiente_cursor"]
+    response = requests.get(f"{BASE_URL}/tareas?limite=3&campos=titulo&cursor={siguiente}", headers=headers)
+    if response.status_code == 200 and all(set(tarea) == {"titulo"} for tarea in response.json()["tareas"]):
+        print("✅ Cursor con campos")
+    else:
+        print(f"❌ Error con cursor y campos: {response.status_code}")
+    
+    response = requests.get(f"{BASE_URL}/tareas/{tareas[0]['id']}?campos=titulo", headers=headers)
+    if response.status_code == 200 and response.json()["tarea"] == {"titulo": tareas[0]["titulo"]}:
+        print("✅ Tarea con solo el título")
+    else:
+        print(f"❌ Campos incorrectos en la tarea: {response.status_code}")
+    
+    response = requests.get(f"{BASE_URL}/tareas?campos=titulo,inexistente", headers=headers)
+    if response.status_code == 400:
+        print("✅ Campo desconocido rechazado")
+    else:
+        print(f"❌ Campo desconocido no fue rechazado: {response.status_code}")
+
+def test_metricas():
+    """
+    Test de GET /metricas: las peticiones anteriores deben aparecer contadas
+    """
+    print("\n🧪 Probando métricas...")
+    
+    # Debe ser el mismo METRICAS_TOKEN con el que se inició el servidor
+    token = os.environ.get("METRICAS_TOKEN")
+    if not token:
+        response = requests.get(f"{BASE_URL}/metricas")
+        if response.status_code == 404:
+            print("✅ Sin METRICAS_TOKEN en el servidor /metricas no se publica")
+        else:
+            print(f"❌ /metricas respondió {response.status_code} sin METRICAS_TOKEN (se esperaba 404)")
+        print("⚠️ Para probar las métricas, iniciar el servidor y el test con METRICAS_TOKEN")
+        return
+    
+    response = requests.get(f"{BASE_URL}/metricas")
+    if response.status_code == 401:
+        print("✅ Métricas sin token: 401")
+    else:
+        print(f"❌ Se esperaba 401 sin token y llegó {response.status_code}")
+    
+    response = requests.get(f"{BASE_URL}/metricas", headers={"Authorization": f"Bearer {token}"})
+    if response.status_code != 200 or not response.headers["Content-Type"].startswith("text/plain"):
+        print(f"❌ Error obteniendo las métricas: {response.status_code}")
+        return
+    
+    lineas = response.text.splitlines()
+    if any(linea.startswith('api_peticiones_total{ruta="/tareas",metodo="GET",codigo="200"}') for linea in lineas):
+        print("✅ Peticiones a GET /tareas contadas")
+    else:
+        print("❌ No aparecen las peticiones a GET /tareas")
+    
+    if any(linea.startswith('api_peticion_duracion_segundos_bucket{ruta="/tareas",metodo="GET",le="+Inf"}') for linea in lineas):
+        print("✅ Histograma de latencia de GET /tareas")
+    else:
+        print("❌ Falta el histograma de latencia de GET /tareas")
+    
+    sentencias = [linea for linea in lineas if linea.startswith('api_sql_sentencias_total{ruta="/tareas",metodo="GET"}')]
+    if sentencias and int(sentencias[0].split()[-1]) > 0:
+        print(f"✅ Sentencias SQL de GET /tareas: {sentencias[0].split()[-1]}")
+    else:
+        print("❌ No se contaron las sentencias SQL de GET /tareas")
+
 if __name__ == "__main__":
     print("�� Iniciando tests de paginación...")
     print("=" * 50)
@@ -159,6 +402,12 @@ if __name__ == "__main__":
     test_paginacion_basica(token)
     test_paginacion_con_busqueda(token)
     test_parametros_invalidos(token)
+    test_paginacion_cursor(token)
+    test_respuesta_no_modificada(token)
+    test_cache_servidor(token)
+    test_obtener_tarea(token)
+    test_campos(token)
+    test_metricas()
     
     print("\n" + "=" * 50)
     print("✅ Tests de paginación completados")
\ No newline at end of file
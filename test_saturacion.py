@@ -0,0 +1,106 @@
+# test_saturacion.py
+import time
+import requests
+from concurrent.futures import ThreadPoolExecutor
+
+# URL base de la API
+BASE_URL = "http://localhost:5000"
+
+# Uso: iniciar el servidor con una cola de hashing mínima para que se sature
+#   HASH_HILOS=1 HASH_COLA_MAXIMA=0 python app.py
+#   python test_saturacion.py
+# Con la cola por defecto (16) las peticiones simultáneas de este test
+# pueden no alcanzar a saturarla.
+
+PETICIONES_SIMULTANEAS = 12
+
+def login(_):
+    """Un login de testuser"""
+    return requests.post(f"{BASE_URL}/login", json={"username": "testuser", "password": "123456"})
+
+def registro(numero, sufijo):
+    """Un registro de un usuario nuevo"""
+    return requests.post(f"{BASE_URL}/registro", json={
+        "username": f"sat{sufijo}_{numero}",
+        "email": f"sat{sufijo}_{numero}@ejemplo.com",
+        "password": "clave123"
+    })
+
+def verificar_respuestas(nombre, respuestas, codigo_exitoso):
+    """
+    Revisa un grupo de respuestas simultáneas
+    
+    Retorna:
+    - lista de las respuestas 503
+    """
+    codigos = [response.status_code for response in respuestas]
+    saturadas = [response for response in respuestas if response.status_code == 503]
+    inesperadas = [codigo for codigo in codigos if codigo not in (codigo_exitoso, 503)]
+    
+    if inesperadas:
+        print(f"❌ {nombre}: códigos inesperados {inesperadas}")
+    else:
+        print(f"✅ {nombre}: {codigos.count(codigo_exitoso)} exitosas, {len(saturadas)} con 503")
+    
+    for response in saturadas:
+        reintentar_en = response.headers.get("Retry-After", "")
+        if not reintentar_en.isdigit() or response.json().get("tipo") != "error_saturacion":
+            print(f"❌ 503 sin Retry-After válido: {reintentar_en!r} {response.json()}")
+            break
+    else:
+        if saturadas:
+            print(f"✅ Cada 503 incluye Retry-After: {saturadas[0].headers['Retry-After']} s")
+    
+    return saturadas
+
+def test_login_simultaneos():
+    """Probar muchos logins a la vez"""
+    print("\n🔐 Probando logins simultáneos...")
+    
+    with ThreadPoolExecutor(max_workers=PETICIONES_SIMULTANEAS) as ejecutor:
+        respuestas = list(ejecutor.map(login, range(PETICIONES_SIMULTANEAS)))
+    
+    saturadas = verificar_respuestas("Logins", respuestas, 200)
+    if not saturadas:
+        print("⚠️ Ningún login recibió 503: iniciar el servidor con HASH_HILOS=1 HASH_COLA_MAXIMA=0")
+        return
+    
+    # Pasado el Retry-After el login vuelve a funcionar
+    time.sleep(int(saturadas[0].headers["Retry-After"]))
+    response = login(0)
+    if response.status_code == 200:
+        print("✅ Login exitoso después de esperar Retry-After")
+    else:
+        print(f"❌ El login después de Retry-After falló: {response.status_code}")
+
+def test_registros_simultaneos():
+    """Probar muchos registros a la vez: los rechazados no deben quedar a medias"""
+    print("\n👥 Probando registros simultáneos...")
+    
+    # Usernames de hasta 20 caracteres, distintos en cada ejecución
+    sufijo = int(time.time()) % 1000000
+    with ThreadPoolExecutor(max_workers=PETICIONES_SIMULTANEAS) as ejecutor:
+        respuestas = list(ejecutor.map(lambda numero: registro(numero, sufijo), range(PETICIONES_SIMULTANEAS)))
+    
+    saturadas = verificar_respuestas("Registros", respuestas, 201)
+    if not saturadas:
+        print("⚠️ Ningún registro recibió 503: iniciar el servidor con HASH_HILOS=1 HASH_COLA_MAXIMA=0")
+        return
+    
+    # Un registro rechazado no crea el usuario: al reintentarlo se registra
+    numero = respuestas.index(saturadas[0])
+    time.sleep(int(saturadas[0].headers["Retry-After"]))
+    response = registro(numero, sufijo)
+    if response.status_code == 201:
+        print("✅ El registro rechazado se completó al reintentarlo")
+    else:
+        print(f"❌ El reintento del registro falló: {response.status_code} {response.json()}")
+
+if __name__ == "__main__":
+    print("🚀 Iniciando pruebas de saturación del hashing de contraseñas...")
+    print("=" * 50)
+    
+    test_login_simultaneos()
+    test_registros_simultaneos()
+    
+    print("\n✅ Pruebas de saturación completadas!")
@@ -0,0 +1,105 @@
+# test_usuarios.py
+import requests
+import json
+
+# URL base de la API
+BASE_URL = "http://localhost:5000"
+
+def test_disponibilidad():
+    """Probar la verificación de username y email disponibles"""
+    print("🔎 Probando disponibilidad de username y email...")
+    
+    # Un usuario que ya existe no está disponible
+    response = requests.get(f"{BASE_URL}/usuarios/disponible?username=testuser")
+    if response.status_code == 200 and not response.json()["username"]["disponible"]:
+        print("✅ 'testuser' figura como no disponible")
+    else:
+        print(f"❌ Respuesta inesperada: {response.status_code} {response.json()}")
+    
+    # Un username y un email nuevos están disponibles
+    response = requests.get(f"{BASE_URL}/usuarios/disponible?username=nadie_usa_esto&email=libre@ejemplo.com")
+    datos = response.json()
+    if response.status_code == 200 and datos["username"]["disponible"] and datos["email"]["disponible"]:
+        print("✅ Username y email nuevos figuran como disponibles")
+    else:
+        print(f"❌ Respuesta inesperada: {response.status_code} {datos}")
+    
+    # Sin parámetros es un error
+    response = requests.get(f"{BASE_URL}/usuarios/disponible")
+    if response.status_code == 400:
+        print("✅ Petición sin parámetros rechazada correctamente")
+    else:
+        print(f"❌ Petición sin parámetros no fue rechazada: {response.status_code}")
+
+def test_registro_duplicado():
+    """Probar que el registro detecta usernames repetidos"""
+    print("\n👥 Probando registro con username repetido...")
+    
+    response = requests.post(f"{BASE_URL}/registro", json={
+        "username": "testuser",
+        "email": "otro_email@ejemplo.com",
+        "password": "clave123"
+    })
+    print(f"Status: {response.status_code}")
+    print(f"Respuesta: {json.dumps(response.json(), indent=2)}")
+
+def test_listado_usuarios():
+    """Probar la paginación por cursor y la búsqueda del listado de usuarios"""
+    print("\n📋 Probando listado paginado de usuarios...")
+    
+    response = requests.get(f"{BASE_URL}/usuarios?limite=2&ordenar_por=username")
+    datos = response.json()
+    if response.status_code != 200:
+        print(f"❌ Error al listar usuarios: {response.status_code}")
+        return
+    
+    if any("password_hash" in usuario for usuario in datos["usuarios"]):
+        print("❌ El listado incluye password_hash")
+    else:
+        print(f"✅ Página 1: {[u['username'] for u in datos['usuarios']]} de {datos['total_usuarios']} usuarios")
+    
+    # Recorrer todas las páginas con el cursor y verificar que no se repitan usuarios
+    vistos = [usuario["id"] for usuario in datos["usuarios"]]
+    cursor = datos["paginacion"]["siguiente_cursor"]
+    while cursor:
+        datos = requests.get(f"{BASE_URL}/usuarios?limite=2&cursor={cursor}").json()
+        vistos.extend(usuario["id"] for usuario in datos["usuarios"])
+        cursor = datos["paginacion"]["siguiente_cursor"]
+    
+    if len(vistos) == len(set(vistos)):
+        print(f"✅ Cursor recorrió {len(vistos)} usuarios sin repetidos")
+    else:
+        print("❌ El cursor devolvió usuarios repetidos")
+    
+    # Búsqueda por username
+    datos = requests.get(f"{BASE_URL}/usuarios?busqueda=testuser").json()
+    if any(usuario["username"] == "testuser" for usuario in datos["usuarios"]):
+        print("✅ Búsqueda encontró a 'testuser'")
+    else:
+        print("❌ Búsqueda no encontró a 'testuser'")
+    
+    # Conteos de tareas de cada usuario
+    datos = requests.get(f"{BASE_URL}/usuarios?incluir_conteos=true").json()
+    if all("tareas" in usuario for usuario in datos["usuarios"]):
+        conteos = {u["username"]: u["tareas"]["total_tareas"] for u in datos["usuarios"]}
+        print(f"✅ Conteos de tareas por usuario: {conteos}")
+    else:
+        print("❌ Faltan los conteos de tareas")
+    
+    # Formato NDJSON: un usuario por línea
+    response = requests.get(f"{BASE_URL}/usuarios?formato=ndjson", stream=True)
+    lineas = [json.loads(linea) for linea in response.iter_lines() if linea]
+    if response.status_code == 200 and len(lineas) == len(vistos):
+        print(f"✅ NDJSON con {len(lineas)} usuarios")
+    else:
+        print(f"❌ NDJSON inesperado: {response.status_code}, {len(lineas)} líneas")
+
+if __name__ == "__main__":
+    print("🚀 Iniciando pruebas de usuarios...")
+    print("=" * 50)
+    
+    test_disponibilidad()
+    test_registro_duplicado()
+    test_listado_usuarios()
+    
+    print("\n✅ Pruebas de usuarios completadas!")
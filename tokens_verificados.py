@@ -0,0 +1,109 @@
+# tokens_verificados.py
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app
+from flask_jwt_extended import JWTManager
+
+
+class CacheTokens:
+    """
+    Tokens JWT ya verificados, en la memoria del proceso
+
+    Un cliente envía el mismo token (válido por días) en cada petición.
+    Guardar el resultado de la verificación evita repetir la firma HMAC y
+    la decodificación del JSON. La clave es el SHA-256 del token, así la
+    cache no guarda tokens utilizables. Cada entrada vence en el 'exp' del
+    token y, si se supera 'maximo' entradas, se descartan las usadas hace
+    más tiempo (LRU).
+    """
+
+    def __init__(self, maximo=10000):
+        self.maximo = maximo
+        self.aciertos = 0
+        self.fallos = 0
+        self._entradas = OrderedDict()
+        self._bloqueo = threading.Lock()
+
+    @staticmethod
+    def huella(token):
+        return hashlib.sha256(token.encode('utf-8')).digest()
+
+    def obtener(self, token):
+        """
+        Datos del token ya verificado, o None si no está o ya expiró
+        """
+        huella = self.huella(token)
+        with self._bloqueo:
+            entrada = self._entradas.get(huella)
+            if entrada is not None:
+                expira, datos = entrada
+                if expira <= time.time():
+                    del self._entradas[huella]
+                    entrada = None
+                else:
+                    self._entradas.move_to_end(huella)
+
+            if entrada is None:
+                self.fallos += 1
+                return None
+            self.aciertos += 1
+
+        # Copia: quien recibe los datos no modifica la entrada guardada
+        return dict(datos)
+
+    def guardar(self, token, datos):
+        """
+        Guarda los datos de un token recién verificado
+        """
+        # Sin 'exp' el token no vence: solo sale de la cache por LRU
+        expira = datos.get('exp', float('inf'))
+        with self._bloqueo:
+            self._entradas[self.huella(token)] = (expira, dict(datos))
+
+            # Descartar las entradas usadas hace más tiempo
+            while len(self._entradas) > self.maximo:
+                self._entradas.popitem(last=False)
+
+    def estadisticas(self):
+        """
+        Contadores de aciertos y fallos de este proceso (se publican en /metricas)
+        """
+        with self._bloqueo:
+            return {
+                'entradas': len(self._entradas),
+                'aciertos': self.aciertos,
+                'fallos': self.fallos
+            }
+
+
+class JWTManagerConCache(JWTManager):
+    """
+    JWTManager que no vuelve a verificar la firma de un token ya verificado
+
+    Solo cambia la decodificación del token: el tipo de token, la lista de
+    bloqueo y los callbacks de flask_jwt_extended se siguen comprobando en
+    cada petición. Los tokens con CSRF (cookies) o leídos aunque hayan
+    expirado siempre se verifican.
+
+    Parámetros:
+    - obtener_cache: función que devuelve la CacheTokens de la aplicación actual
+    """
+
+    def __init__(self, obtener_cache, app=None, add_context_processor=False):
+        self._obtener_cache = obtener_cache
+        super().__init__(app, add_context_processor)
+
+    def _decode_jwt_from_config(self, encoded_token, csrf_value=None, allow_expired=False):
+        verificar = super()._decode_jwt_from_config
+        if csrf_value is not None or allow_expired or not current_app.config['TOKENS_CACHE']:
+            return verificar(encoded_token, csrf_value, allow_expired)
+
+        cache = self._obtener_cache()
+        datos = cache.obtener(encoded_token)
+        if datos is None:
+            # Si el token no es válido se lanza la excepción y no se guarda
+            datos = verificar(encoded_token, csrf_value, allow_expired)
+            cache.guardar(encoded_token, datos)
+        return datos